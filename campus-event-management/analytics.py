@@ -0,0 +1,501 @@
+"""
+Vectorized analytics engine for Campus Event Management Platform
+Loads the registration fact columns once into compact NumPy arrays and
+computes every report aggregate with bincount/ufunc group-bys instead of
+per-report SQL GROUP BYs. The rows produced match the query_* functions in
+generate_reports.py field for field, so either engine can feed the report
+writers.
+
+NumPy is optional: check HAVE_NUMPY and fall back to the SQL queries when it
+is not installed.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# Rows pulled per fetchmany() call while loading facts
+FETCH_CHUNK = 100_000
+
+TOP_STUDENTS_LIMIT = 3
+
+# One row per registration. college_id is the student's college.
+FACTS_SQL = """
+    SELECT r.event_id, r.student_id, s.college_id,
+           COALESCE(a.attended, 0) as attended,
+           COALESCE(f.rating, 0) as rating,
+           CASE WHEN f.comments IS NOT NULL AND f.comments != '' THEN 1 ELSE 0 END as has_comment
+    FROM registrations r
+    JOIN students s ON s.id = r.student_id
+    LEFT JOIN attendance a ON a.registration_id = r.id
+    LEFT JOIN feedback f ON f.registration_id = r.id
+"""
+
+FACT_COLUMNS = [
+    ('event_id', 'int32'),
+    ('student_id', 'int32'),
+    ('college_id', 'int32'),
+    ('attended', 'int8'),
+    ('rating', 'int8'),
+    ('has_comment', 'int8'),
+]
+
+
+def _require_numpy():
+    if not HAVE_NUMPY:
+        raise RuntimeError("NumPy is not installed; use the SQL report queries instead")
+
+
+def load_facts(conn):
+    """Load the registration fact columns into a dict of NumPy arrays"""
+    _require_numpy()
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(FACTS_SQL)
+
+    chunks = []
+    while True:
+        rows = cursor.fetchmany(FETCH_CHUNK)
+        if not rows:
+            break
+        chunks.append(np.array(rows, dtype=np.int32).reshape(len(rows), len(FACT_COLUMNS)))
+
+    table = np.concatenate(chunks) if chunks else np.empty((0, len(FACT_COLUMNS)), dtype=np.int32)
+    return {
+        name: np.ascontiguousarray(table[:, i], dtype=dtype)
+        for i, (name, dtype) in enumerate(FACT_COLUMNS)
+    }
+
+
+def load_dimensions(conn):
+    """Load colleges, students and events as id-indexed lookup arrays"""
+    _require_numpy()
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return _build_dimensions(
+        cursor.execute("SELECT id, name, location FROM colleges ORDER BY id").fetchall(),
+        cursor.execute("SELECT id, name, email, college_id FROM students ORDER BY id").fetchall(),
+        cursor.execute("""
+            SELECT id, name, event_type, event_date, college_id, max_capacity
+            FROM events ORDER BY id
+        """).fetchall(),
+    )
+
+
+def _build_dimensions(colleges, students, events):
+    """Dimension lookups from (id, ...) row tuples ordered by id"""
+    def lookup(rows):
+        ids = np.array([row[0] for row in rows], dtype=np.int64)
+        size = int(ids.max()) + 1 if len(ids) else 1
+        return ids, size
+
+    college_ids, college_size = lookup(colleges)
+    student_ids, student_size = lookup(students)
+    event_ids, event_size = lookup(events)
+
+    college_name = [None] * college_size
+    for college_id, name, _ in colleges:
+        college_name[college_id] = name
+
+    student_college = np.zeros(student_size, dtype=np.int64)
+    student_college[student_ids] = [row[3] for row in students]
+
+    event_college = np.zeros(event_size, dtype=np.int64)
+    event_college[event_ids] = [row[4] for row in events]
+
+    event_types = sorted({row[2] for row in events})
+    type_code = {name: code for code, name in enumerate(event_types)}
+    event_type = np.zeros(event_size, dtype=np.int64)
+    event_type[event_ids] = [type_code[row[2]] for row in events]
+
+    return {
+        'colleges': {row[0]: row for row in colleges},
+        'college_ids': college_ids,
+        'college_size': college_size,
+        'college_name': college_name,
+        'students': {row[0]: row for row in students},
+        'student_ids': student_ids,
+        'student_size': student_size,
+        'student_college': student_college,
+        'events': {row[0]: row for row in events},
+        'event_ids': event_ids,
+        'event_size': event_size,
+        'event_college': event_college,
+        'event_types': event_types,
+        'event_type': event_type,
+    }
+
+
+def _registration_rows(snapshot, registration_ids):
+    """Map registration ids to row positions in the snapshot (-1 if absent)"""
+    ids = snapshot.column('registrations', 'id')
+    size = max(int(ids.max()) + 1 if len(ids) else 1,
+               int(registration_ids.max()) + 1 if len(registration_ids) else 1)
+    position = np.full(size, -1, dtype=np.int64)
+    position[ids] = np.arange(len(ids))
+    return position[registration_ids]
+
+
+def load_snapshot_facts(snapshot):
+    """Registration fact columns computed from a columnar snapshot
+
+    Attendance and feedback are joined to registrations by scattering them
+    through a registration id -> row index array; no SQL is involved.
+    """
+    _require_numpy()
+    student_ids = snapshot.column('students', 'id')
+    student_college = np.full(int(student_ids.max()) + 1 if len(student_ids) else 1, -1,
+                              dtype=np.int64)
+    student_college[student_ids] = snapshot.column('students', 'college_id')
+
+    registered = snapshot.column('registrations', 'student_id')
+    known = registered < len(student_college)
+    known[known] = student_college[registered[known]] >= 0
+    count = snapshot.row_count('registrations')
+
+    attended = np.zeros(count, dtype=np.int8)
+    rows = _registration_rows(snapshot, snapshot.column('attendance', 'registration_id'))
+    present = rows >= 0
+    attended[rows[present]] = snapshot.column('attendance', 'attended')[present]
+
+    rating = np.zeros(count, dtype=np.int8)
+    has_comment = np.zeros(count, dtype=np.int8)
+    rows = _registration_rows(snapshot, snapshot.column('feedback', 'registration_id'))
+    present = rows >= 0
+    rating[rows[present]] = snapshot.column('feedback', 'rating')[present]
+    comments = snapshot.strings('feedback', 'comments')
+    has_comment[rows[present]] = _non_empty(comments)[present]
+
+    return {
+        'event_id': np.ascontiguousarray(snapshot.column('registrations', 'event_id')[known]),
+        'student_id': np.ascontiguousarray(registered[known]),
+        'college_id': student_college[registered[known]].astype(np.int32),
+        'attended': attended[known],
+        'rating': rating[known],
+        'has_comment': has_comment[known],
+    }
+
+
+def _non_empty(strings):
+    """Mask of rows holding a non-empty string"""
+    empty_codes = [code for code, value in enumerate(strings.values()) if value == '']
+    return (strings.codes >= 0) & ~np.isin(strings.codes, empty_codes)
+
+
+def load_snapshot_dimensions(snapshot):
+    """Dimension lookups from a columnar snapshot"""
+    _require_numpy()
+
+    def rows(table, columns):
+        decoded = []
+        for name in columns:
+            column = snapshot.column(table, name)
+            if hasattr(column, 'codes'):
+                values = column.values() + [None]
+                decoded.append([values[code] for code in column.codes.tolist()])
+            else:
+                decoded.append(column.tolist())
+        return list(zip(*decoded))
+
+    events = [
+        (event_id, name, event_type, event_date, college_id, max_capacity or None)
+        for event_id, name, event_type, event_date, college_id, max_capacity in rows(
+            'events', ['id', 'name', 'event_type', 'event_date', 'college_id', 'max_capacity'])
+    ]
+    return _build_dimensions(
+        rows('colleges', ['id', 'name', 'location']),
+        rows('students', ['id', 'name', 'email', 'college_id']),
+        events,
+    )
+
+
+def snapshot_sample_comments(snapshot, per_event, length):
+    """Most recent non-empty comments per event, truncated like the SQL report"""
+    _require_numpy()
+    comments = snapshot.strings('feedback', 'comments')
+    rows = _registration_rows(snapshot, snapshot.column('feedback', 'registration_id'))
+    keep = np.flatnonzero((rows >= 0) & _non_empty(comments))
+
+    event_id = snapshot.column('registrations', 'event_id')[rows[keep]]
+    submitted_at = snapshot.column('feedback', 'submitted_at')[keep]
+    feedback_id = snapshot.column('feedback', 'id')[keep]
+    order = np.lexsort((-feedback_id.astype(np.int64), -submitted_at, event_id))
+
+    event_id = event_id[order]
+    starts = np.flatnonzero(np.r_[True, event_id[1:] != event_id[:-1]])
+    rank = np.arange(len(event_id)) - np.repeat(starts, np.diff(np.r_[starts, len(event_id)]))
+    picked = rank < per_event
+
+    comments_by_event = {}
+    for event, row in zip(event_id[picked].tolist(), keep[order][picked].tolist()):
+        comment = comments[row]
+        if len(comment) > length:
+            comment = comment[:length] + '...'
+        comments_by_event.setdefault(event, []).append(comment)
+    return comments_by_event
+
+
+def _count(keys, size, weights=None):
+    return np.bincount(keys, weights=weights, minlength=size)
+
+
+def _ratings(keys, facts, size):
+    """Per-group (rating count, rating sum) over registrations with feedback"""
+    rated = facts['rating'] > 0
+    return (
+        _count(keys[rated], size),
+        _count(keys[rated], size, facts['rating'][rated].astype(np.float64)),
+    )
+
+
+def _avg(total, count):
+    return round(float(total) / int(count), 2) if count else None
+
+
+def _sql_round(value, digits=2):
+    """Round like SQLite's ROUND(): halves away from zero, on the decimal value"""
+    quantum = Decimal(1).scaleb(-digits)
+    return float(Decimal(repr(float(value))).quantize(quantum, rounding=ROUND_HALF_UP))
+
+
+def _pct(part, whole):
+    """Percentage as computed by ROUND(part * 100.0 / whole, 2) in the SQL reports"""
+    return _sql_round(int(part) * 100.0 / int(whole)) if whole else 0
+
+
+def _order(ids, *keys):
+    """ids sorted by keys descending (first key most significant), then id"""
+    if not len(ids):
+        return ids
+    return ids[np.lexsort((ids,) + tuple(-key[ids] for key in reversed(keys)))]
+
+
+def _group_totals(keys, facts, size):
+    registrations = _count(keys, size)
+    attended = _count(keys, size, facts['attended'].astype(np.float64)).astype(np.int64)
+    rating_count, rating_sum = _ratings(keys, facts, size)
+    return registrations, attended, rating_count, rating_sum
+
+
+def event_popularity(facts, dims):
+    """Rows for the Event Popularity Report"""
+    size = dims['event_size']
+    regs, attended, rating_count, rating_sum = _group_totals(facts['event_id'], facts, size)
+
+    report_data = []
+    for event_id in _order(dims['event_ids'], regs, attended):
+        _, name, event_type, event_date, college_id, max_capacity = dims['events'][event_id]
+        report_data.append({
+            "id": int(event_id),
+            "name": name,
+            "event_type": event_type,
+            "event_date": event_date,
+            "college_name": dims['college_name'][college_id],
+            "total_registrations": int(regs[event_id]),
+            "total_attendance": int(attended[event_id]),
+            "attendance_percentage": _pct(attended[event_id], regs[event_id]),
+            "avg_rating": _avg(rating_sum[event_id], rating_count[event_id]),
+            "max_capacity": max_capacity,
+            "capacity_utilization": _pct(regs[event_id], max_capacity) if max_capacity else None
+        })
+    return report_data
+
+
+def _student_totals(facts, dims):
+    size = dims['student_size']
+    regs, attended, rating_count, rating_sum = _group_totals(facts['student_id'], facts, size)
+    return regs, attended, rating_count, rating_sum
+
+
+def _student_row(dims, student_id, regs, attended, rating_count, rating_sum):
+    _, name, email, college_id = dims['students'][student_id]
+    return {
+        "id": int(student_id),
+        "name": name,
+        "email": email,
+        "college_name": dims['college_name'][college_id],
+        "total_registrations": int(regs[student_id]),
+        "events_attended": int(attended[student_id]),
+        "avg_feedback_rating": _avg(rating_sum[student_id], rating_count[student_id]),
+    }
+
+
+def student_participation(facts, dims):
+    """Rows for the Student Participation Report"""
+    regs, attended, rating_count, rating_sum = _student_totals(facts, dims)
+    active = dims['student_ids'][regs[dims['student_ids']] > 0]
+
+    report_data = []
+    for student_id in _order(active, attended, regs):
+        row_dict = _student_row(dims, student_id, regs, attended, rating_count, rating_sum)
+        row_dict['personal_attendance_rate'] = _pct(attended[student_id], regs[student_id])
+        row_dict['feedback_given_count'] = int(rating_count[student_id])
+        report_data.append(row_dict)
+    return report_data
+
+
+def top_students(facts, dims, limit=TOP_STUDENTS_LIMIT):
+    """Rows for the Top Students Report, ranked"""
+    regs, attended, rating_count, rating_sum = _student_totals(facts, dims)
+    attendees = dims['student_ids'][attended[dims['student_ids']] > 0]
+
+    report_data = []
+    ranked = _order(attendees, attended, regs, rating_count)[:limit]
+    for rank, student_id in enumerate(ranked, 1):
+        row_dict = _student_row(dims, student_id, regs, attended, rating_count, rating_sum)
+        row_dict['feedback_submissions'] = int(rating_count[student_id])
+        row_dict['attendance_rate'] = _pct(attended[student_id], regs[student_id])
+        row_dict['rank'] = rank
+        report_data.append(row_dict)
+    return report_data
+
+
+def event_type_analysis(facts, dims):
+    """Rows for the Event Type Analysis Report"""
+    type_count = len(dims['event_types'])
+    keys = dims['event_type'][facts['event_id']]
+    regs, attended, rating_count, rating_sum = _group_totals(keys, facts, type_count)
+
+    # The SQL report counts joined rows as "events": one per registration,
+    # plus one for each event nobody registered for. Mirror it exactly.
+    event_regs = _count(facts['event_id'], dims['event_size'])[dims['event_ids']]
+    joined_rows = _count(dims['event_type'][dims['event_ids']], type_count,
+                         np.maximum(event_regs, 1).astype(np.float64)).astype(np.int64)
+
+    report_data = []
+    for code in _order(np.arange(type_count), regs):
+        report_data.append({
+            "event_type": dims['event_types'][code],
+            "total_events": int(joined_rows[code]),
+            "total_registrations": int(regs[code]),
+            "total_attendance": int(attended[code]),
+            "avg_rating": _avg(rating_sum[code], rating_count[code]),
+            "attendance_percentage": _pct(attended[code], regs[code]),
+            "avg_registrations_per_event": _sql_round(int(regs[code]) / int(joined_rows[code])),
+            "max_registrations_for_type": int(regs[code])
+        })
+    return report_data
+
+
+def college_statistics(facts, dims):
+    """Rows for the College Statistics Report (before engagement metrics)"""
+    size = dims['college_size']
+    student_college = dims['student_college'][dims['student_ids']]
+    event_college = dims['event_college'][dims['event_ids']]
+    students_per_college = _count(student_college, size)
+    events_per_college = _count(event_college, size)
+
+    by_students = _count(facts['college_id'], size)
+    for_events = _count(dims['event_college'][facts['event_id']], size)
+    attendance = _count(facts['college_id'], size,
+                        facts['attended'].astype(np.float64)).astype(np.int64)
+
+    # The SQL report averages feedback over a students x events cross join, so
+    # each rating is weighted by how many joined rows carry it: once per event
+    # the college hosts, plus once per other student of the college when the
+    # registration is for one of its own events.
+    rated = facts['rating'] > 0
+    rated_college = facts['college_id'][rated]
+    own_event = dims['event_college'][facts['event_id'][rated]] == rated_college
+    weights = (np.maximum(events_per_college[rated_college], 1)
+               + own_event * (students_per_college[rated_college] - 1)).astype(np.float64)
+    weight_sum = _count(rated_college, size, weights)
+    weighted_ratings = _count(rated_college, size, weights * facts['rating'][rated])
+
+    report_data = []
+    for college_id in _order(dims['college_ids'], students_per_college):
+        _, name, location = dims['colleges'][college_id]
+        has_students = students_per_college[college_id] > 0
+        report_data.append({
+            "college_id": int(college_id),
+            "college_name": name,
+            "location": location,
+            "total_students": int(students_per_college[college_id]),
+            "total_events_hosted": int(events_per_college[college_id]),
+            "registrations_by_students": int(by_students[college_id]) if has_students else 0,
+            "registrations_for_events": int(for_events[college_id]),
+            "attendance_by_students": int(attendance[college_id]) if has_students else 0,
+            "avg_feedback_by_students": (
+                round(float(weighted_ratings[college_id] / weight_sum[college_id]), 2)
+                if weight_sum[college_id] else None
+            )
+        })
+    return report_data
+
+
+def feedback_statistics(facts, dims):
+    """Overall feedback statistics and per-event feedback rows"""
+    rated = facts['rating'] > 0
+    stars = _count(facts['rating'][rated], 6)
+    total = int(rated.sum())
+
+    overall_dict = {
+        "total_feedback": total,
+        "avg_rating": round(float(facts['rating'][rated].mean()), 2) if total else None,
+        "five_star": int(stars[5]),
+        "four_star": int(stars[4]),
+        "three_star": int(stars[3]),
+        "two_star": int(stars[2]),
+        "one_star": int(stars[1]),
+        "with_comments": int(facts['has_comment'][rated].sum())
+    }
+
+    rating_count, rating_sum = _ratings(facts['event_id'], facts, dims['event_size'])
+    reviewed = dims['event_ids'][rating_count[dims['event_ids']] > 0]
+    avg_rating = np.zeros(dims['event_size'])
+    avg_rating[reviewed] = rating_sum[reviewed] / rating_count[reviewed]
+
+    event_feedback_list = []
+    for event_id in _order(reviewed, avg_rating, rating_count):
+        _, name, event_type, _, college_id, _ = dims['events'][event_id]
+        event_feedback_list.append({
+            "event_id": int(event_id),
+            "event_name": name,
+            "event_type": event_type,
+            "college_name": dims['college_name'][college_id],
+            "feedback_count": int(rating_count[event_id]),
+            "avg_rating": round(float(avg_rating[event_id]), 2)
+        })
+    return overall_dict, event_feedback_list
+
+
+def summary_metrics(facts, dims):
+    """Platform-wide totals for the Summary Dashboard"""
+    rated = facts['rating'] > 0
+    total_registrations = len(facts['event_id'])
+    total_attendance = int(facts['attended'].sum())
+    return {
+        "total_colleges": len(dims['college_ids']),
+        "total_students": len(dims['student_ids']),
+        "total_events": len(dims['event_ids']),
+        "total_registrations": total_registrations,
+        "total_attendance": total_attendance,
+        "total_feedback": int(rated.sum()),
+        "avg_rating": float(facts['rating'][rated].mean()) if rated.any() else None,
+        "no_shows": total_registrations - total_attendance
+    }
+
+
+def compute_reports(conn, top_n=TOP_STUDENTS_LIMIT):
+    """Load facts once and compute the inputs for every report generator"""
+    return compute_reports_from_facts(load_facts(conn), load_dimensions(conn), top_n)
+
+
+def compute_reports_from_facts(facts, dims, top_n=TOP_STUDENTS_LIMIT):
+    """Compute the inputs for every report generator from loaded facts"""
+    overall_dict, event_feedback_list = feedback_statistics(facts, dims)
+    return {
+        'event_popularity': event_popularity(facts, dims),
+        'student_participation': student_participation(facts, dims),
+        'top_students': top_students(facts, dims, top_n),
+        'event_type_analysis': event_type_analysis(facts, dims),
+        'college_statistics': college_statistics(facts, dims),
+        'feedback_overall': overall_dict,
+        'feedback_by_event': event_feedback_list,
+        'summary_metrics': summary_metrics(facts, dims),
+    }
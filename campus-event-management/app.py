@@ -1,392 +1,1020 @@
-from flask import Flask, request, jsonify
-from datetime import datetime
-import sqlite3
-import os
-
-app = Flask(__name__)
-
-# Database setup
-DATABASE = 'campus_events.db'
-
-def get_db_connection():
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def init_db():
-    conn = get_db_connection()
-    with open('schema.sql', 'r') as f:
-        conn.executescript(f.read())
-    conn.close()
-
-# Initialize database if it doesn't exist
-if not os.path.exists(DATABASE):
-    init_db()
-
-@app.route('/')
-def index():
-    return jsonify({"message": "Campus Event Management API", "status": "running"})
-
-# Event endpoints
-@app.route('/api/events', methods=['POST'])
-def create_event():
-    data = request.get_json()
-    
-    required_fields = ['name', 'event_type', 'college_id', 'event_date']
-    for field in required_fields:
-        if field not in data:
-            return jsonify({"error": f"Missing required field: {field}"}), 400
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        INSERT INTO events (name, description, event_type, college_id, event_date, max_capacity)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (
-        data['name'],
-        data.get('description', ''),
-        data['event_type'],
-        data['college_id'],
-        data['event_date'],
-        data.get('max_capacity', 100)
-    ))
-    
-    event_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    
-    return jsonify({"event_id": event_id, "message": "Event created successfully"}), 201
-
-@app.route('/api/events', methods=['GET'])
-def get_events():
-    event_type = request.args.get('event_type')
-    college_id = request.args.get('college_id')
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    query = """
-        SELECT e.*, c.name as college_name 
-        FROM events e 
-        JOIN colleges c ON e.college_id = c.id
-        WHERE 1=1
-    """
-    params = []
-    
-    if event_type:
-        query += " AND e.event_type = ?"
-        params.append(event_type)
-    
-    if college_id:
-        query += " AND e.college_id = ?"
-        params.append(college_id)
-    
-    query += " ORDER BY e.event_date DESC"
-    
-    events = cursor.execute(query, params).fetchall()
-    conn.close()
-    
-    events_list = [dict(event) for event in events]
-    return jsonify({"events": events_list})
-
-@app.route('/api/events/<int:event_id>', methods=['GET'])
-def get_event(event_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    event = cursor.execute("""
-        SELECT e.*, c.name as college_name 
-        FROM events e 
-        JOIN colleges c ON e.college_id = c.id 
-        WHERE e.id = ?
-    """, (event_id,)).fetchone()
-    
-    if not event:
-        conn.close()
-        return jsonify({"error": "Event not found"}), 404
-    
-    # Get registration count
-    reg_count = cursor.execute(
-        "SELECT COUNT(*) as count FROM registrations WHERE event_id = ?",
-        (event_id,)
-    ).fetchone()['count']
-    
-    conn.close()
-    
-    event_dict = dict(event)
-    event_dict['registration_count'] = reg_count
-    
-    return jsonify({"event": event_dict})
-
-# Registration endpoints
-@app.route('/api/events/<int:event_id>/register', methods=['POST'])
-def register_student(event_id):
-    data = request.get_json()
-    
-    if 'student_id' not in data:
-        return jsonify({"error": "Missing student_id"}), 400
-    
-    student_id = data['student_id']
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Check if event exists
-    event = cursor.execute("SELECT * FROM events WHERE id = ?", (event_id,)).fetchone()
-    if not event:
-        conn.close()
-        return jsonify({"error": "Event not found"}), 404
-    
-    # Check if student exists
-    student = cursor.execute("SELECT * FROM students WHERE id = ?", (student_id,)).fetchone()
-    if not student:
-        conn.close()
-        return jsonify({"error": "Student not found"}), 404
-    
-    # Check current registrations vs capacity
-    current_registrations = cursor.execute(
-        "SELECT COUNT(*) as count FROM registrations WHERE event_id = ?",
-        (event_id,)
-    ).fetchone()['count']
-    
-    if current_registrations >= event['max_capacity']:
-        conn.close()
-        return jsonify({"error": "Event is at full capacity"}), 400
-    
-    try:
-        cursor.execute("""
-            INSERT INTO registrations (student_id, event_id)
-            VALUES (?, ?)
-        """, (student_id, event_id))
-        
-        registration_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return jsonify({
-            "registration_id": registration_id,
-            "message": "Registration successful"
-        }), 201
-        
-    except sqlite3.IntegrityError:
-        conn.close()
-        return jsonify({"error": "Student already registered for this event"}), 400
-
-@app.route('/api/events/<int:event_id>/registrations', methods=['GET'])
-def get_event_registrations(event_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    registrations = cursor.execute("""
-        SELECT r.id, r.registered_at, s.name, s.email, s.college_id,
-               COALESCE(a.attended, 0) as attended,
-               f.rating, f.comments
-        FROM registrations r
-        JOIN students s ON r.student_id = s.id
-        LEFT JOIN attendance a ON r.id = a.registration_id
-        LEFT JOIN feedback f ON r.id = f.registration_id
-        WHERE r.event_id = ?
-        ORDER BY r.registered_at
-    """, (event_id,)).fetchall()
-    
-    conn.close()
-    
-    registrations_list = [dict(reg) for reg in registrations]
-    return jsonify({"registrations": registrations_list})
-
-# Attendance endpoints
-@app.route('/api/registrations/<int:registration_id>/attendance', methods=['POST'])
-def mark_attendance(registration_id):
-    data = request.get_json()
-    attended = data.get('attended', True)
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Check if registration exists
-    registration = cursor.execute(
-        "SELECT * FROM registrations WHERE id = ?",
-        (registration_id,)
-    ).fetchone()
-    
-    if not registration:
-        conn.close()
-        return jsonify({"error": "Registration not found"}), 404
-    
-    try:
-        cursor.execute("""
-            INSERT OR REPLACE INTO attendance (registration_id, attended)
-            VALUES (?, ?)
-        """, (registration_id, attended))
-        
-        conn.commit()
-        conn.close()
-        
-        return jsonify({"message": "Attendance marked successfully"})
-        
-    except Exception as e:
-        conn.close()
-        return jsonify({"error": str(e)}), 500
-
-# Feedback endpoints
-@app.route('/api/registrations/<int:registration_id>/feedback', methods=['POST'])
-def submit_feedback(registration_id):
-    data = request.get_json()
-    
-    if 'rating' not in data:
-        return jsonify({"error": "Missing rating"}), 400
-    
-    rating = data['rating']
-    comments = data.get('comments', '')
-    
-    if rating < 1 or rating > 5:
-        return jsonify({"error": "Rating must be between 1 and 5"}), 400
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Check if registration exists and student attended
-    registration = cursor.execute("""
-        SELECT r.*, a.attended
-        FROM registrations r
-        LEFT JOIN attendance a ON r.id = a.registration_id
-        WHERE r.id = ?
-    """, (registration_id,)).fetchone()
-    
-    if not registration:
-        conn.close()
-        return jsonify({"error": "Registration not found"}), 404
-    
-    try:
-        cursor.execute("""
-            INSERT OR REPLACE INTO feedback (registration_id, rating, comments)
-            VALUES (?, ?, ?)
-        """, (registration_id, rating, comments))
-        
-        conn.commit()
-        conn.close()
-        
-        return jsonify({"message": "Feedback submitted successfully"})
-        
-    except Exception as e:
-        conn.close()
-        return jsonify({"error": str(e)}), 500
-
-# Report endpoints
-@app.route('/api/reports/event-popularity', methods=['GET'])
-def event_popularity_report():
-    event_type = request.args.get('event_type')
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    query = """
-        SELECT e.id, e.name, e.event_type, e.event_date, c.name as college_name,
-               COUNT(r.id) as total_registrations,
-               COUNT(CASE WHEN a.attended = 1 THEN 1 END) as total_attendance,
-               CASE 
-                 WHEN COUNT(r.id) > 0 THEN 
-                   ROUND(COUNT(CASE WHEN a.attended = 1 THEN 1 END) * 100.0 / COUNT(r.id), 2)
-                 ELSE 0 
-               END as attendance_percentage
-        FROM events e
-        JOIN colleges c ON e.college_id = c.id
-        LEFT JOIN registrations r ON e.id = r.event_id
-        LEFT JOIN attendance a ON r.id = a.registration_id
-        WHERE 1=1
-    """
-    
-    params = []
-    if event_type:
-        query += " AND e.event_type = ?"
-        params.append(event_type)
-    
-    query += """
-        GROUP BY e.id
-        ORDER BY total_registrations DESC, total_attendance DESC
-    """
-    
-    events = cursor.execute(query, params).fetchall()
-    conn.close()
-    
-    events_list = [dict(event) for event in events]
-    return jsonify({"event_popularity_report": events_list})
-
-@app.route('/api/reports/student-participation', methods=['GET'])
-def student_participation_report():
-    college_id = request.args.get('college_id')
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    query = """
-        SELECT s.id, s.name, s.email, c.name as college_name,
-               COUNT(r.id) as total_registrations,
-               COUNT(CASE WHEN a.attended = 1 THEN 1 END) as events_attended,
-               AVG(CASE WHEN f.rating IS NOT NULL THEN f.rating END) as avg_feedback_rating
-        FROM students s
-        JOIN colleges c ON s.college_id = c.id
-        LEFT JOIN registrations r ON s.id = r.student_id
-        LEFT JOIN attendance a ON r.id = a.registration_id
-        LEFT JOIN feedback f ON r.id = f.registration_id
-        WHERE 1=1
-    """
-    
-    params = []
-    if college_id:
-        query += " AND s.college_id = ?"
-        params.append(college_id)
-    
-    query += """
-        GROUP BY s.id
-        HAVING COUNT(r.id) > 0
-        ORDER BY events_attended DESC, total_registrations DESC
-    """
-    
-    students = cursor.execute(query, params).fetchall()
-    conn.close()
-    
-    students_list = []
-    for student in students:
-        student_dict = dict(student)
-        if student_dict['avg_feedback_rating']:
-            student_dict['avg_feedback_rating'] = round(student_dict['avg_feedback_rating'], 2)
-        students_list.append(student_dict)
-    
-    return jsonify({"student_participation_report": students_list})
-
-@app.route('/api/reports/top-students', methods=['GET'])
-def top_students_report():
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    students = cursor.execute("""
-        SELECT s.id, s.name, s.email, c.name as college_name,
-               COUNT(r.id) as total_registrations,
-               COUNT(CASE WHEN a.attended = 1 THEN 1 END) as events_attended,
-               AVG(CASE WHEN f.rating IS NOT NULL THEN f.rating END) as avg_feedback_rating
-        FROM students s
-        JOIN colleges c ON s.college_id = c.id
-        LEFT JOIN registrations r ON s.id = r.student_id
-        LEFT JOIN attendance a ON r.id = a.registration_id
-        LEFT JOIN feedback f ON r.id = f.registration_id
-        GROUP BY s.id
-        HAVING COUNT(CASE WHEN a.attended = 1 THEN 1 END) > 0
-        ORDER BY events_attended DESC, total_registrations DESC
-        LIMIT 3
-    """).fetchall()
-    
-    conn.close()
-    
-    students_list = []
-    for student in students:
-        student_dict = dict(student)
-        if student_dict['avg_feedback_rating']:
-            student_dict['avg_feedback_rating'] = round(student_dict['avg_feedback_rating'], 2)
-        students_list.append(student_dict)
-    
-    return jsonify({"top_3_students": students_list})
-
-if __name__ == '__main__':
+from flask import Blueprint, Flask, Response, current_app, request, jsonify, g
+from datetime import datetime
+from itertools import islice
+import atexit
+import cProfile
+import functools
+import hmac
+import io
+import sqlite3
+import os
+import time
+
+from archive import archive_path, union_archive
+from audience import DEFAULT_ID_LIMIT, MAX_ID_LIMIT, AudienceIndex, parse_expression
+from bulk_import import DEFAULT_BATCH_SIZE, IMPORTERS, import_csv
+from changes import DEFAULT_CHANGES_LIMIT, MAX_CHANGES_LIMIT, expired_through, latest_cursor, parse_tables, read_changes
+from coattendance import DEFAULT_RELATED_LIMIT, MAX_RELATED_LIMIT, recommend_events, related_events
+from engagement import ACTIVITIES, GROUPINGS, STANDARD_ERROR, EngagementSketches, exact_counts, sorted_groups
+from event_lookup import events_by_ids, parse_ids, student_events
+from event_versions import catalog_stamp, event_stamp, events_stamp, student_events_stamp
+from generate_reports import REPORTS_DIR, query_event_popularity, query_student_participation
+from hot_tier import HotTier, hot_events, hot_tier_window
+from idempotency import (IDEMPOTENCY_HEADER, IN_PROGRESS, MAX_KEY_LENGTH, MISMATCH, REPLAY, REPLAYED_HEADER,
+                         IdempotencyStore, SharedIdempotencyStore, idempotency_path, request_fingerprint)
+from leaderboard import DEFAULT_TOP_N, MAX_TOP_N, top_students
+from live_updates import HEARTBEAT_SECONDS, RETRY_MS, LivePublisher, format_message, max_subscribers, seat_counts
+from lookup_cache import LookupCache, lookup_cache_size
+from maintenance import maintenance_interval, start_background_maintenance
+from migrations import LATEST_VERSION, apply_migrations, schema_version
+from profiling import PROFILE_HEADER, profiling_token, save_profile
+from report_artifacts import ReportArtifacts, report_max_age
+from search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search_events
+from timeline import DEFAULT_GRANULARITY, GRANULARITIES, event_timeline
+
+api = Blueprint('api', __name__)
+
+# Database setup
+DATABASE = 'campus_events.db'
+
+def get_db_connection(database=None):
+    conn = sqlite3.connect(database or current_app.config['DATABASE'])
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def init_db(database=DATABASE):
+    conn = get_db_connection(database)
+    with open('schema.sql', 'r') as f:
+        conn.executescript(f.read())
+    conn.close()
+
+def migrate_db(database=DATABASE):
+    conn = get_db_connection(database)
+    apply_migrations(conn)
+    # WAL lets long report reads run alongside registration and check-in
+    # writes; the setting is stored in the database file
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.close()
+
+def prepare_database(database=DATABASE):
+    """Create the database if it doesn't exist, then bring its schema up to date
+
+    Run once per deployment (serve.py does it in the master process before
+    starting workers), not once per worker.
+    """
+    if not os.path.exists(database) or os.path.getsize(database) == 0:
+        init_db(database)
+    migrate_db(database)
+
+def check_schema(database=DATABASE):
+    """Raise RuntimeError unless the database is at this code's schema version"""
+    conn = get_db_connection(database)
+    version = schema_version(conn)
+    conn.close()
+    if version != LATEST_VERSION:
+        raise RuntimeError(f"{database} is at schema version {version}, expected {LATEST_VERSION}; "
+                           f"run python migrations.py")
+
+def warm_up(app):
+    """Fill in-process caches and the OS page cache before the first request
+
+    Returns the seconds spent.
+    """
+    start = time.perf_counter()
+    conn = get_db_connection(app.config['DATABASE'])
+    # Student bitmaps for /api/audience
+    app.extensions['audience_index'].build(conn)
+    # Unique-student sketches for /api/reports/engagement?approximate=true
+    app.extensions['engagement_sketches'].build(conn)
+    # Event metadata and per-event seat counts, read by event detail and
+    # registration requests
+    conn.execute("SELECT * FROM events").fetchall()
+    conn.execute("SELECT event_id, COUNT(*) FROM registrations GROUP BY event_id").fetchall()
+    conn.close()
+    # The first request through Flask also builds the URL map
+    with app.test_client() as client:
+        client.get('/')
+    return time.perf_counter() - start
+
+def create_app(database=DATABASE, prepare=True, warm=False, shared_idempotency=False):
+    """Application factory
+
+    prepare=False skips schema setup and only checks the schema version, for
+    worker processes whose master has already prepared the database.
+    shared_idempotency=True keeps Idempotency-Key responses in a file every
+    worker process reads, instead of in this process's memory.
+    """
+    if prepare:
+        prepare_database(database)
+    else:
+        check_schema(database)
+
+    app = Flask(__name__)
+    app.config['DATABASE'] = database
+    # Student bitmaps for audience queries, loaded on first use and caught
+    # up with new writes before each query (see audience.py)
+    app.extensions['audience_index'] = AudienceIndex()
+    # HyperLogLog sketches behind ?approximate=true engagement counts,
+    # maintained the same way (see engagement.py)
+    app.extensions['engagement_sketches'] = EngagementSketches()
+    # Published report files served by the report endpoints while fresh;
+    # disabled unless CAMPUS_REPORT_MAX_AGE is set (see report_artifacts.py)
+    app.extensions['report_artifacts'] = ReportArtifacts(REPORTS_DIR, report_max_age())
+    # Responses remembered for retried POSTs (see idempotency.py)
+    if shared_idempotency:
+        app.extensions['idempotency_store'] = SharedIdempotencyStore(idempotency_path(database))
+    else:
+        app.extensions['idempotency_store'] = IdempotencyStore()
+    # One thread pushing seat counts to every /live stream (see live_updates.py)
+    app.extensions['live_publisher'] = LivePublisher(database, max_subscribers())
+    # Fest-day events pinned in memory and written behind; only when
+    # CAMPUS_HOT_EVENTS is set (see hot_tier.py)
+    app.extensions['hot_tier'] = None
+    if hot_events():
+        app.extensions['hot_tier'] = HotTier(database, hot_events(), hot_tier_window()).start()
+        atexit.register(app.extensions['hot_tier'].close)
+    # Event, student and registration records behind request validation
+    # (see lookup_cache.py)
+    app.extensions['lookup_cache'] = LookupCache(lookup_cache_size())
+    app.register_blueprint(api)
+
+    if warm:
+        warm_up(app)
+    return app
+
+# On-demand profiling: requests carrying the configured token in the
+# X-Profile-Token header run under cProfile (see profiling.py)
+@api.before_app_request
+def start_request_profile():
+    token = profiling_token()
+    supplied = request.headers.get(PROFILE_HEADER)
+    if not token or not supplied:
+        return
+    if not hmac.compare_digest(token.encode(), supplied.encode()):
+        return
+    g.profiler = cProfile.Profile()
+    g.profiler.enable()
+
+@api.after_app_request
+def finish_request_profile(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        base = save_profile(profiler, f"{request.method}-{request.path}")
+        response.headers['X-Profile-File'] = os.path.basename(base)
+    return response
+
+# Writes made in this process reach live streams without waiting for the
+# publisher's next poll
+@api.after_app_request
+def notify_live_streams(response):
+    if request.method == 'POST' and response.status_code < 400:
+        current_app.extensions['live_publisher'].notify()
+    return response
+
+# A write that waited out the busy timeout; tell the client to retry
+@api.app_errorhandler(sqlite3.OperationalError)
+def database_busy(e):
+    if 'locked' not in str(e) and 'busy' not in str(e):
+        raise e
+    response = jsonify({"error": "Database is busy, please retry"})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+def idempotent(view):
+    """Replay the first response to a request carrying an Idempotency-Key
+    header instead of running the view again"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return view(*args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({"error": f"{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters"}), 400
+
+        store = current_app.extensions['idempotency_store']
+        fingerprint = request_fingerprint(request.method, request.path, request.get_data())
+        outcome, saved = store.begin(key, fingerprint)
+        if outcome == REPLAY:
+            response = Response(saved.body, status=saved.status, content_type=saved.content_type)
+            response.headers[REPLAYED_HEADER] = 'true'
+            return response
+        if outcome == IN_PROGRESS:
+            response = jsonify({"error": "A request with this Idempotency-Key is still in progress"})
+            response.headers['Retry-After'] = '1'
+            return response, 409
+        if outcome == MISMATCH:
+            return jsonify({"error": "Idempotency-Key was already used for a different request"}), 422
+
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+        except Exception:
+            store.release(key)
+            raise
+        store.complete(key, fingerprint, response.status_code, response.get_data(), response.content_type)
+        return response
+    return wrapper
+
+@api.route('/')
+def index():
+    return jsonify({"message": "Campus Event Management API", "status": "running"})
+
+# Event endpoints
+@api.route('/api/events', methods=['POST'])
+def create_event():
+    data = request.get_json()
+    
+    required_fields = ['name', 'event_type', 'college_id', 'event_date']
+    for field in required_fields:
+        if field not in data:
+            return jsonify({"error": f"Missing required field: {field}"}), 400
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        INSERT INTO events (name, description, event_type, college_id, event_date, max_capacity)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (
+        data['name'],
+        data.get('description', ''),
+        data['event_type'],
+        data['college_id'],
+        data['event_date'],
+        data.get('max_capacity', 100)
+    ))
+    
+    event_id = cursor.lastrowid
+    conn.commit()
+    conn.close()
+    
+    return jsonify({"event_id": event_id, "message": "Event created successfully"}), 201
+
+# Conditional GETs: stamps are (etag, last_modified) from event_versions.py.
+# Only the ETag is served: Last-Modified has one-second resolution, so an
+# If-Modified-Since check would answer 304 after a second write in the same
+# second
+def _not_modified(stamp):
+    """A 304 response if the request's If-None-Match matches stamp, else None"""
+    if stamp is None or not request.if_none_match:
+        return None
+    if not request.if_none_match.contains_weak(stamp[0]):
+        return None
+    return _with_validators(Response(status=304), stamp)
+
+def _with_validators(response, stamp):
+    if stamp is not None:
+        response.set_etag(stamp[0])
+        # Clients may keep the body but must revalidate before reusing it
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@api.route('/api/events', methods=['GET'])
+def get_events():
+    if 'ids' in request.args:
+        return get_events_by_ids()
+    
+    event_type = request.args.get('event_type')
+    college_id = request.args.get('college_id')
+    
+    conn = get_db_connection()
+    stamp = catalog_stamp(conn)
+    not_modified = _not_modified(stamp)
+    if not_modified:
+        conn.close()
+        return not_modified
+    
+    cursor = conn.cursor()
+    
+    query = """
+        SELECT e.*, c.name as college_name 
+        FROM events e 
+        JOIN colleges c ON e.college_id = c.id
+        WHERE 1=1
+    """
+    params = []
+    
+    if event_type:
+        query += " AND e.event_type = ?"
+        params.append(event_type)
+    
+    if college_id:
+        query += " AND e.college_id = ?"
+        params.append(college_id)
+    
+    query += " ORDER BY e.event_date DESC"
+    
+    events = cursor.execute(query, params).fetchall()
+    conn.close()
+    
+    events_list = [dict(event) for event in events]
+    return _with_validators(jsonify({"events": events_list}), stamp)
+
+def get_events_by_ids():
+    """GET /api/events?ids=1,2,3[&student_id=N]: many events in one query"""
+    try:
+        event_ids = parse_ids(request.args['ids'])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    student_id = request.args.get('student_id', type=int)
+    
+    conn = get_db_connection()
+    # The student's own rows are covered too: registering, checking in and
+    # feedback all bump the event's version
+    stamp = events_stamp(conn, event_ids)
+    not_modified = _not_modified(stamp)
+    if not_modified:
+        conn.close()
+        return not_modified
+    
+    events, missing_ids = events_by_ids(conn, event_ids, student_id)
+    conn.close()
+    
+    return _with_validators(jsonify({"events": events, "missing_ids": missing_ids}), stamp)
+
+@api.route('/api/events/search', methods=['GET'])
+def search_events_endpoint():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "Missing search query: q"}), 400
+    
+    limit = request.args.get('limit', DEFAULT_SEARCH_LIMIT, type=int)
+    offset = request.args.get('offset', 0, type=int)
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    offset = max(0, offset)
+    
+    conn = get_db_connection()
+    results = search_events(
+        conn,
+        query,
+        event_type=request.args.get('event_type'),
+        college_id=request.args.get('college_id'),
+        limit=limit,
+        offset=offset
+    )
+    conn.close()
+    
+    return jsonify({"query": query, "count": len(results), "events": results})
+
+def _lookup(conn, kind, record_id):
+    """Event, student or registration record through the lookup cache"""
+    return current_app.extensions['lookup_cache'].get(conn, kind, record_id)
+
+# Hit rate of this process's lookup cache; with serve.py each worker has
+# its own, so the pid says which one answered
+@api.route('/api/stats/lookup-cache', methods=['GET'])
+def lookup_cache_stats():
+    return jsonify({"pid": os.getpid(), **current_app.extensions['lookup_cache'].stats()})
+
+@api.route('/api/events/<int:event_id>', methods=['GET'])
+def get_event(event_id):
+    conn = get_db_connection()
+    
+    # Pinned events count registrations in memory; their version stamps lag
+    # until the next flush, so they are served without validators
+    hot_tier = current_app.extensions['hot_tier']
+    if hot_tier and hot_tier.pins(event_id):
+        event = _lookup(conn, 'events', event_id)
+        conn.close()
+        if not event or event['college_name'] is None:
+            return jsonify({"error": "Event not found"}), 404
+        event_dict = dict(event)
+        event_dict['registration_count'] = hot_tier.registration_count(event_id)
+        return jsonify({"event": event_dict})
+    
+    # Unchanged since the client's copy: skip the detail queries
+    stamp = event_stamp(conn, event_id)
+    not_modified = _not_modified(stamp)
+    if not_modified:
+        conn.close()
+        return not_modified
+    
+    cursor = conn.cursor()
+    
+    # Events lose their stamp when deleted (archived): drop any cached copy
+    if stamp is None:
+        current_app.extensions['lookup_cache'].invalidate('events', event_id)
+    
+    # Events whose college does not exist are not shown
+    event = _lookup(conn, 'events', event_id)
+    
+    if not event or event['college_name'] is None:
+        conn.close()
+        return jsonify({"error": "Event not found"}), 404
+    
+    # Get registration count
+    reg_count = cursor.execute(
+        "SELECT COUNT(*) as count FROM registrations WHERE event_id = ?",
+        (event_id,)
+    ).fetchone()['count']
+    
+    conn.close()
+    
+    event_dict = dict(event)
+    event_dict['registration_count'] = reg_count
+    
+    return _with_validators(jsonify({"event": event_dict}), stamp)
+
+# Registration endpoints
+@api.route('/api/events/<int:event_id>/register', methods=['POST'])
+@idempotent
+def register_student(event_id):
+    data = request.get_json()
+    
+    if 'student_id' not in data:
+        return jsonify({"error": "Missing student_id"}), 400
+    
+    student_id = data['student_id']
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    hot_tier = current_app.extensions['hot_tier']
+    if hot_tier and hot_tier.pins(event_id):
+        student = _lookup(conn, 'students', student_id)
+        conn.close()
+        if not student:
+            return jsonify({"error": "Student not found"}), 404
+        try:
+            registration_id = hot_tier.register(event_id, student['id'])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({
+            "registration_id": registration_id,
+            "message": "Registration successful"
+        }), 201
+    
+    # Check if event exists
+    event = _lookup(conn, 'events', event_id)
+    if not event:
+        conn.close()
+        return jsonify({"error": "Event not found"}), 404
+    
+    # Check if student exists
+    student = _lookup(conn, 'students', student_id)
+    if not student:
+        conn.close()
+        return jsonify({"error": "Student not found"}), 404
+    
+    # Check current registrations vs capacity
+    current_registrations = cursor.execute(
+        "SELECT COUNT(*) as count FROM registrations WHERE event_id = ?",
+        (event_id,)
+    ).fetchone()['count']
+    
+    if current_registrations >= event['max_capacity']:
+        conn.close()
+        return jsonify({"error": "Event is at full capacity"}), 400
+    
+    try:
+        # The event may have been archived since it was cached
+        cursor.execute("""
+            INSERT INTO registrations (student_id, event_id)
+            SELECT ?, ? WHERE EXISTS (SELECT 1 FROM events WHERE id = ?)
+        """, (student_id, event_id, event_id))
+        if cursor.rowcount == 0:
+            conn.close()
+            current_app.extensions['lookup_cache'].invalidate('events', event_id)
+            return jsonify({"error": "Event not found"}), 404
+        
+        registration_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        
+        return jsonify({
+            "registration_id": registration_id,
+            "message": "Registration successful"
+        }), 201
+        
+    except sqlite3.IntegrityError:
+        conn.close()
+        return jsonify({"error": "Student already registered for this event"}), 400
+
+@api.route('/api/events/<int:event_id>/registrations', methods=['GET'])
+def get_event_registrations(event_id):
+    hot_tier = current_app.extensions['hot_tier']
+    if hot_tier and hot_tier.pins(event_id):
+        hot_tier.flush()
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    registrations = cursor.execute("""
+        SELECT r.id, r.registered_at, s.name, s.email, s.college_id,
+               COALESCE(a.attended, 0) as attended,
+               f.rating, f.comments
+        FROM registrations r
+        JOIN students s ON r.student_id = s.id
+        LEFT JOIN attendance a ON r.id = a.registration_id
+        LEFT JOIN feedback f ON r.id = f.registration_id
+        WHERE r.event_id = ?
+        ORDER BY r.registered_at
+    """, (event_id,)).fetchall()
+    
+    conn.close()
+    
+    registrations_list = [dict(reg) for reg in registrations]
+    return jsonify({"registrations": registrations_list})
+
+@api.route('/api/events/<int:event_id>/live', methods=['GET'])
+def get_event_live(event_id):
+    conn = get_db_connection()
+    counts = seat_counts(conn, [event_id]).get(event_id)
+    conn.close()
+    if counts is None:
+        return jsonify({"error": "Event not found"}), 404
+    
+    # A reconnecting browser sends the id of the last update it got
+    last_version = request.headers.get('Last-Event-ID', '')
+    last_version = int(last_version) if last_version.isdigit() else -1
+    publisher = current_app.extensions['live_publisher']
+    if publisher.full():
+        response = jsonify({"error": "Too many live streams, poll GET /api/events/<id> instead"})
+        response.headers['Retry-After'] = '30'
+        return response, 503
+    
+    def stream():
+        # Subscribed only once the response is being sent, so a client
+        # that goes away before then never holds a stream slot
+        subscription = publisher.subscribe(event_id, counts, last_version)
+        if subscription is None:
+            # The cap filled up since the check above; the browser reconnects
+            yield f"retry: {RETRY_MS}\n\n"
+            return
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            while True:
+                update = subscription.next(HEARTBEAT_SECONDS)
+                if update is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_message(update)
+                if update.get('deleted'):
+                    return
+        finally:
+            subscription.close()
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@api.route('/api/events/<int:event_id>/timeline', methods=['GET'])
+def get_event_timeline(event_id):
+    granularity = request.args.get('bucket', DEFAULT_GRANULARITY)
+    if granularity not in GRANULARITIES:
+        return jsonify({"error": f"bucket must be one of: {', '.join(GRANULARITIES)}"}), 400
+    
+    # Optional: without it every bucket is returned
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        if limit < 1:
+            return jsonify({"error": "limit must be at least 1"}), 400
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    event = cursor.execute(
+        "SELECT id, name, max_capacity FROM events WHERE id = ?",
+        (event_id,)
+    ).fetchone()
+    
+    if not event:
+        conn.close()
+        return jsonify({"error": "Event not found"}), 404
+    
+    buckets = event_timeline(conn, event_id, granularity, limit)
+    conn.close()
+    
+    return jsonify({
+        "event_id": event_id,
+        "event_name": event['name'],
+        "max_capacity": event['max_capacity'],
+        "bucket": granularity,
+        "timeline": buckets
+    })
+
+def _related_limit():
+    """Validated ?limit= for the co-attendance endpoints, or None"""
+    try:
+        limit = int(request.args.get('limit', DEFAULT_RELATED_LIMIT))
+    except ValueError:
+        return None
+    return limit if 1 <= limit <= MAX_RELATED_LIMIT else None
+
+@api.route('/api/events/<int:event_id>/related', methods=['GET'])
+def get_related_events(event_id):
+    limit = _related_limit()
+    if limit is None:
+        return jsonify({"error": f"limit must be between 1 and {MAX_RELATED_LIMIT}"}), 400
+    
+    conn = get_db_connection()
+    
+    event = conn.execute("SELECT id, name FROM events WHERE id = ?", (event_id,)).fetchone()
+    if not event:
+        conn.close()
+        return jsonify({"error": "Event not found"}), 404
+    
+    # Served from the co-attendance index (see coattendance.py)
+    related = related_events(conn, event_id, limit)
+    conn.close()
+    
+    return jsonify({
+        "event_id": event_id,
+        "event_name": event['name'],
+        "related_events": related
+    })
+
+# Student endpoints
+@api.route('/api/students/<int:student_id>/recommendations', methods=['GET'])
+def get_student_recommendations(student_id):
+    limit = _related_limit()
+    if limit is None:
+        return jsonify({"error": f"limit must be between 1 and {MAX_RELATED_LIMIT}"}), 400
+    upcoming = request.args.get('upcoming', '').lower() in ('1', 'true', 'yes')
+    
+    conn = get_db_connection()
+    
+    student = conn.execute("SELECT id, name FROM students WHERE id = ?", (student_id,)).fetchone()
+    if not student:
+        conn.close()
+        return jsonify({"error": "Student not found"}), 404
+    
+    recommendations = recommend_events(conn, student_id, limit, upcoming=upcoming)
+    conn.close()
+    
+    return jsonify({
+        "student_id": student_id,
+        "student_name": student['name'],
+        "recommendations": recommendations
+    })
+
+@api.route('/api/students/<int:student_id>/events', methods=['GET'])
+def get_student_events(student_id):
+    conn = get_db_connection()
+    
+    student = conn.execute("SELECT id, name FROM students WHERE id = ?", (student_id,)).fetchone()
+    if not student:
+        conn.close()
+        return jsonify({"error": "Student not found"}), 404
+    
+    stamp = student_events_stamp(conn, student_id)
+    not_modified = _not_modified(stamp)
+    if not_modified:
+        conn.close()
+        return not_modified
+    
+    # Registration counts, attendance and feedback in one query (see event_lookup.py)
+    events = student_events(conn, student_id)
+    conn.close()
+    
+    return _with_validators(jsonify({
+        "student_id": student_id,
+        "student_name": student['name'],
+        "events": events
+    }), stamp)
+
+# Attendance endpoints
+@api.route('/api/registrations/<int:registration_id>/attendance', methods=['POST'])
+@idempotent
+def mark_attendance(registration_id):
+    data = request.get_json()
+    attended = data.get('attended', True)
+    
+    hot_tier = current_app.extensions['hot_tier']
+    if hot_tier and hot_tier.holds(registration_id):
+        hot_tier.mark_attendance(registration_id, attended)
+        return jsonify({"message": "Attendance marked successfully"})
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    # Check if registration exists
+    registration = _lookup(conn, 'registrations', registration_id)
+    
+    if not registration:
+        conn.close()
+        return jsonify({"error": "Registration not found"}), 404
+    
+    try:
+        # Upsert rather than REPLACE so UPDATE triggers (timeline rollups)
+        # see the previous attendance value. marked_at only moves when the
+        # value changes: the rollups count a check-in in the bucket of its
+        # marked_at, and repeating a mark fires no trigger to move it. The
+        # registration may have been archived since it was cached, so insert
+        # only while it exists
+        cursor.execute("""
+            INSERT INTO attendance (registration_id, attended)
+            SELECT ?, ? WHERE EXISTS (SELECT 1 FROM registrations WHERE id = ?)
+            ON CONFLICT (registration_id) DO UPDATE SET
+                attended = excluded.attended,
+                marked_at = CASE WHEN attended IS excluded.attended
+                                 THEN marked_at ELSE CURRENT_TIMESTAMP END
+        """, (registration_id, attended, registration_id))
+        if cursor.rowcount == 0:
+            conn.close()
+            current_app.extensions['lookup_cache'].invalidate('registrations', registration_id)
+            return jsonify({"error": "Registration not found"}), 404
+        
+        conn.commit()
+        conn.close()
+        
+        return jsonify({"message": "Attendance marked successfully"})
+        
+    except sqlite3.OperationalError:
+        # A locked database becomes a 503 with Retry-After (database_busy)
+        conn.close()
+        raise
+    except Exception as e:
+        conn.close()
+        return jsonify({"error": str(e)}), 500
+
+# Feedback endpoints
+@api.route('/api/registrations/<int:registration_id>/feedback', methods=['POST'])
+@idempotent
+def submit_feedback(registration_id):
+    data = request.get_json()
+    
+    if 'rating' not in data:
+        return jsonify({"error": "Missing rating"}), 400
+    
+    rating = data['rating']
+    comments = data.get('comments', '')
+    
+    if rating < 1 or rating > 5:
+        return jsonify({"error": "Rating must be between 1 and 5"}), 400
+    
+    # The registration may still be waiting in the hot tier
+    hot_tier = current_app.extensions['hot_tier']
+    if hot_tier and hot_tier.holds(registration_id):
+        hot_tier.flush()
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    # Check if registration exists and student attended
+    registration = cursor.execute("""
+        SELECT r.*, a.attended
+        FROM registrations r
+        LEFT JOIN attendance a ON r.id = a.registration_id
+        WHERE r.id = ?
+    """, (registration_id,)).fetchone()
+    
+    if not registration:
+        conn.close()
+        return jsonify({"error": "Registration not found"}), 404
+    
+    try:
+        cursor.execute("""
+            INSERT INTO feedback (registration_id, rating, comments)
+            VALUES (?, ?, ?)
+            ON CONFLICT(registration_id) DO UPDATE SET
+                rating = excluded.rating,
+                comments = excluded.comments,
+                submitted_at = CURRENT_TIMESTAMP
+        """, (registration_id, rating, comments))
+        
+        conn.commit()
+        conn.close()
+        
+        return jsonify({"message": "Feedback submitted successfully"})
+        
+    except sqlite3.OperationalError:
+        # A locked database becomes a 503 with Retry-After (database_busy)
+        conn.close()
+        raise
+    except Exception as e:
+        conn.close()
+        return jsonify({"error": str(e)}), 500
+
+# Change data capture: consumers tail every write through a cursor
+@api.route('/api/changes', methods=['GET'])
+def get_changes():
+    after = request.args.get('after', '0')
+    limit = request.args.get('limit', DEFAULT_CHANGES_LIMIT, type=int)
+    limit = max(1, min(limit, MAX_CHANGES_LIMIT))
+    try:
+        tables = parse_tables(request.args.get('tables', ''))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    conn = get_db_connection()
+    if after == 'latest':
+        cursor = latest_cursor(conn)
+        conn.close()
+        return jsonify({"changes": [], "next_cursor": cursor, "has_more": False})
+    if not after.isdigit():
+        conn.close()
+        return jsonify({"error": "after must be a cursor (non-negative integer) or 'latest'"}), 400
+    
+    after = int(after)
+    expired = expired_through(conn)
+    if after < expired:
+        conn.close()
+        return jsonify({
+            "error": "Changes after this cursor are past retention; resync, then resume from expired_through",
+            "expired_through": expired
+        }), 410
+    
+    changes, next_cursor, has_more = read_changes(conn, after, limit, tables)
+    conn.close()
+    
+    return jsonify({"changes": changes, "next_cursor": next_cursor, "has_more": has_more})
+
+# Bulk import endpoint
+@api.route('/api/import/<kind>', methods=['POST'])
+def bulk_import(kind):
+    """Import colleges, students or events from a CSV body or 'file' upload"""
+    if kind not in IMPORTERS:
+        return jsonify({"error": f"Unknown import type: {kind}"}), 404
+    
+    try:
+        batch_size = int(request.args.get('batch_size', DEFAULT_BATCH_SIZE))
+    except ValueError:
+        return jsonify({"error": "batch_size must be an integer"}), 400
+    
+    # Read the upload as a stream so large files are never held in memory
+    if request.mimetype == 'multipart/form-data':
+        if 'file' not in request.files:
+            return jsonify({"error": "Missing file"}), 400
+        stream = request.files['file'].stream
+    else:
+        stream = request.stream
+    csv_file = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    
+    conn = get_db_connection()
+    try:
+        result = import_csv(conn, kind, csv_file, max(1, batch_size))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    finally:
+        conn.close()
+    
+    # New colleges can complete cached events whose college was missing
+    if kind == 'colleges' and result.rows_inserted:
+        current_app.extensions['lookup_cache'].invalidate('events')
+    
+    return jsonify(result.to_dict()), 200 if result.rows_inserted or not result.error_count else 400
+
+# Report endpoints
+def _include_archive():
+    return request.args.get('include_archive', '').lower() in ('1', 'true', 'yes')
+
+def _report_connection():
+    """Connection for a report; ?include_archive=true adds archived events"""
+    conn = get_db_connection()
+    if _include_archive():
+        union_archive(conn, archive_path(current_app.config['DATABASE']))
+    return conn
+
+def _published_report(filename):
+    """(report, manifest) from the published reports/ files when they are
+    fresh enough to serve (see report_artifacts.py), else None"""
+    return current_app.extensions['report_artifacts'].fresh_report(
+        filename, _include_archive(), get_db_connection)
+
+def _report_response(key, rows, published=None):
+    response = jsonify({key: rows})
+    if published:
+        response.headers['X-Report-Source'] = 'artifact'
+        response.headers['X-Report-Generated-At'] = published[1]['generated_at']
+    else:
+        response.headers['X-Report-Source'] = 'live'
+    return response
+
+@api.route('/api/reports/event-popularity', methods=['GET'])
+def event_popularity_report():
+    event_type = request.args.get('event_type')
+    
+    published = _published_report('event_popularity.json')
+    if published:
+        events_list = [event for event in published[0]['events']
+                       if not event_type or event['event_type'] == event_type]
+        return _report_response("event_popularity_report", events_list, published)
+    
+    conn = _report_connection()
+    events_list = query_event_popularity(conn, event_type)
+    conn.close()
+    return _report_response("event_popularity_report", events_list)
+
+@api.route('/api/reports/student-participation', methods=['GET'])
+def student_participation_report():
+    college_id = request.args.get('college_id')
+    
+    # Published rows carry the college name only, so per-college reports run live
+    published = None if college_id else _published_report('student_participation.json')
+    if published:
+        return _report_response("student_participation_report", published[0]['students'], published)
+    
+    conn = _report_connection()
+    students_list = query_student_participation(conn, college_id)
+    conn.close()
+    return _report_response("student_participation_report", students_list)
+
+@api.route('/api/reports/top-students', methods=['GET'])
+def top_students_report():
+    college_id = request.args.get('college_id')
+    event_type = request.args.get('event_type')
+    
+    try:
+        limit = int(request.args.get('limit', DEFAULT_TOP_N))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if limit < 1 or limit > MAX_TOP_N:
+        return jsonify({"error": f"limit must be between 1 and {MAX_TOP_N}"}), 400
+    
+    # Served from the leaderboard counters (see leaderboard.py)
+    conn = get_db_connection()
+    students_list = top_students(conn, limit, college_id=college_id, event_type=event_type)
+    conn.close()
+    
+    return jsonify({
+        "top_students": students_list,
+        # Kept for clients written against the fixed top-3 report
+        "top_3_students": students_list[:3]
+    })
+
+@api.route('/api/reports/engagement', methods=['GET'])
+def engagement_report():
+    by = request.args.get('by', 'college')
+    activity = request.args.get('activity', 'registered')
+    event_type = request.args.get('event_type') or None
+    months = (request.args.get('from') or None, request.args.get('to') or None)
+    approximate = request.args.get('approximate', '').lower() in ('1', 'true', 'yes')
+    
+    if by not in GROUPINGS:
+        return jsonify({"error": f"by must be one of {', '.join(GROUPINGS)}"}), 400
+    if activity not in ACTIVITIES:
+        return jsonify({"error": f"activity must be one of {', '.join(ACTIVITIES)}"}), 400
+    try:
+        college_id = int(request.args['college_id']) if request.args.get('college_id') else None
+    except ValueError:
+        return jsonify({"error": "college_id must be an integer"}), 400
+    for month in months:
+        if month and not (len(month) == 7 and month[4] == '-' and month.replace('-', '').isdigit()):
+            return jsonify({"error": "from and to must be months (YYYY-MM)"}), 400
+    
+    conn = get_db_connection()
+    try:
+        if approximate:
+            sketches = current_app.extensions['engagement_sketches']
+            sketches.refresh(conn)
+            counts, total = sketches.estimate(activity, by, college_id, event_type, months)
+        else:
+            counts, total = exact_counts(conn, activity, by, college_id, event_type, months)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    finally:
+        conn.close()
+    
+    key = 'college_id' if by == 'college' else by
+    result = {
+        "by": by,
+        "activity": activity,
+        "approximate": approximate,
+        "groups": [{key: group, "unique_students": counts[group]} for group in sorted_groups(counts)],
+        # Students active in several groups are counted once
+        "total_unique_students": total
+    }
+    if approximate:
+        result["standard_error"] = round(STANDARD_ERROR, 4)
+    return jsonify(result)
+
+@api.route('/api/audience', methods=['GET'])
+def audience_query():
+    expression = request.args.get('expr', '')
+    include_ids = request.args.get('ids', '').lower() in ('1', 'true', 'yes')
+    
+    try:
+        limit = int(request.args.get('limit', DEFAULT_ID_LIMIT))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if limit < 1 or limit > MAX_ID_LIMIT:
+        return jsonify({"error": f"limit must be between 1 and {MAX_ID_LIMIT}"}), 400
+    
+    try:
+        tree = parse_expression(expression)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid expression: {e}"}), 400
+    
+    audience_index = current_app.extensions['audience_index']
+    conn = get_db_connection()
+    audience_index.refresh(conn)
+    conn.close()
+    
+    audience = audience_index.evaluate(tree)
+    result = {"expression": expression, "count": len(audience)}
+    if include_ids:
+        result["student_ids"] = list(islice(audience, limit))
+        result["truncated"] = len(audience) > limit
+    return jsonify(result)
+
+if __name__ == '__main__':
+    # Development server; see serve.py for running with multiple workers
+    app = create_app()
+    # Optional periodic maintenance (statistics, vacuum, WAL checkpoints)
+    if maintenance_interval():
+        start_background_maintenance(maintenance_interval(), DATABASE)
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,296 @@
+"""
+Archive tiering for Campus Event Management Platform
+Moves events dated before a cutoff, together with their registrations,
+attendance and feedback, out of the live database into a separate archive
+database file (campus_events_archive.db next to it). Rows are moved a few
+events at a time, each chunk in its own short transaction, so registration
+and check-in writes only ever wait for one chunk.
+
+Colleges and students stay in the live database. The leaderboard counters
+keep counting archived activity (they are all-time totals); the timeline
+rollups of archived events are dropped with them.
+
+Historical reports read hot and archived rows together through
+union_archive(), which shadows the four tables with UNION ALL views on one
+connection:
+
+    python generate_reports.py --include-archive
+
+Usage: python archive.py --older-than 365 [--dry-run]
+       python archive.py --before 2025-01-01 --chunk-rows 2000
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import time
+from datetime import date, timedelta
+
+DATABASE = 'campus_events.db'
+
+DEFAULT_OLDER_THAN_DAYS = 365
+# Registrations (plus their attendance and feedback) moved per transaction
+DEFAULT_CHUNK_ROWS = 1000
+# Pause between chunks so waiting writers get the lock. SQLite's busy
+# handler retries at most every 100 ms, so a shorter gap can be missed.
+DEFAULT_PAUSE_SECONDS = 0.1
+BUSY_TIMEOUT_MS = 5000
+
+ARCHIVE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS archive.events (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT,
+        event_type TEXT NOT NULL,
+        college_id INTEGER NOT NULL,
+        event_date DATE NOT NULL,
+        max_capacity INTEGER,
+        created_at TIMESTAMP,
+        archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS archive.registrations (
+        id INTEGER PRIMARY KEY,
+        student_id INTEGER NOT NULL,
+        event_id INTEGER NOT NULL,
+        registered_at TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS archive.attendance (
+        id INTEGER PRIMARY KEY,
+        registration_id INTEGER NOT NULL UNIQUE,
+        attended BOOLEAN,
+        marked_at TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS archive.feedback (
+        id INTEGER PRIMARY KEY,
+        registration_id INTEGER NOT NULL UNIQUE,
+        rating INTEGER NOT NULL,
+        comments TEXT,
+        submitted_at TIMESTAMP
+    );
+
+    CREATE INDEX IF NOT EXISTS archive.idx_events_date ON events(event_date);
+    CREATE INDEX IF NOT EXISTS archive.idx_registrations_event_id ON registrations(event_id);
+    CREATE INDEX IF NOT EXISTS archive.idx_registrations_student_id ON registrations(student_id);
+"""
+
+# (table, rows belonging to the chunk's events), parents first. Copies run
+# in this order and deletes in reverse, so child rows can still be found
+# through main.registrations while they are copied and deleted.
+ARCHIVED_TABLES = [
+    ('events', "id IN ({events})"),
+    ('registrations', "event_id IN ({events})"),
+    ('attendance', "registration_id IN (SELECT id FROM main.registrations WHERE event_id IN ({events}))"),
+    ('feedback', "registration_id IN (SELECT id FROM main.registrations WHERE event_id IN ({events}))"),
+]
+
+
+def archive_path(database=DATABASE):
+    """Archive file kept next to the live database"""
+    return os.path.splitext(database)[0] + '_archive.db'
+
+
+def attach_archive(conn, path):
+    """Attach the archive database as 'archive', creating its tables"""
+    attached = [row[1] for row in conn.execute("PRAGMA database_list")]
+    if 'archive' not in attached:
+        conn.execute("ATTACH DATABASE ? AS archive", (path,))
+    conn.executescript(ARCHIVE_SCHEMA)
+
+
+def _columns(conn, table):
+    return ', '.join(row[1] for row in conn.execute(f"PRAGMA main.table_info({table})"))
+
+
+def union_archive(conn, path):
+    """Make events, registrations, attendance and feedback on conn read hot
+    and archived rows together
+
+    TEMP views are resolved before main tables, so existing report queries
+    run unchanged. The connection becomes read-only for those tables.
+    Returns False (leaving conn untouched) when there is no archive yet.
+    """
+    if not os.path.exists(path):
+        return False
+    attach_archive(conn, path)
+    for table, _ in ARCHIVED_TABLES:
+        columns = _columns(conn, table)
+        conn.execute(f"""
+            CREATE TEMP VIEW IF NOT EXISTS {table} AS
+            SELECT {columns} FROM main.{table}
+            UNION ALL
+            SELECT {columns} FROM archive.{table}
+        """)
+    return True
+
+
+def archivable_events(conn, cutoff):
+    """(event_id, registrations) for events dated before cutoff, oldest first"""
+    return conn.execute("""
+        SELECT e.id, (SELECT COUNT(*) FROM registrations r WHERE r.event_id = e.id)
+        FROM main.events e
+        WHERE e.event_date < ?
+        ORDER BY e.event_date, e.id
+    """, (cutoff,)).fetchall()
+
+
+def _chunks(events, chunk_rows):
+    """Group events so each chunk holds about chunk_rows registrations"""
+    chunk, rows = [], 0
+    for event_id, registrations in events:
+        chunk.append(event_id)
+        rows += registrations
+        if rows >= chunk_rows:
+            yield chunk
+            chunk, rows = [], 0
+    if chunk:
+        yield chunk
+
+
+def move_chunk(conn, event_ids):
+    """Copy one chunk of events and their rows to the archive, then delete
+    them from the live tables, in one transaction. Returns rows moved per table.
+
+    Copies use INSERT OR REPLACE: in WAL mode a commit spanning two database
+    files is atomic per file only, so a chunk interrupted between the two
+    can be moved again safely.
+    """
+    events = ','.join(str(int(event_id)) for event_id in event_ids)
+    moved = {}
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for table, where in ARCHIVED_TABLES:
+            columns = _columns(conn, table)
+            cursor = conn.execute(f"""
+                INSERT OR REPLACE INTO archive.{table} ({columns})
+                SELECT {columns} FROM main.{table} WHERE {where.format(events=events)}
+            """)
+            moved[table] = cursor.rowcount
+        for table, where in reversed(ARCHIVED_TABLES):
+            conn.execute(f"DELETE FROM main.{table} WHERE {where.format(events=events)}")
+        conn.execute(f"DELETE FROM main.event_timeline WHERE event_id IN ({events})")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return moved
+
+
+def archive_events(database, cutoff, path=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+                   pause=DEFAULT_PAUSE_SECONDS, dry_run=False):
+    """Move every event dated before cutoff (YYYY-MM-DD) to the archive
+
+    Returns a summary: rows moved per table, chunk count and the longest
+    chunk transaction, which bounds how long a writer can be held up.
+    """
+    conn = sqlite3.connect(database, isolation_level=None)
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    events = archivable_events(conn, cutoff)
+    summary = {
+        "cutoff": cutoff,
+        "archive": path or archive_path(database),
+        "events": len(events),
+        "registrations": sum(registrations for _, registrations in events),
+        "moved": {table: 0 for table, _ in ARCHIVED_TABLES},
+        "chunks": 0,
+        "max_chunk_ms": 0.0,
+        "seconds": 0.0,
+    }
+    if dry_run or not events:
+        conn.close()
+        return summary
+
+    attach_archive(conn, summary["archive"])
+    start = time.perf_counter()
+    for chunk in _chunks(events, chunk_rows):
+        chunk_start = time.perf_counter()
+        for table, count in move_chunk(conn, chunk).items():
+            summary["moved"][table] += count
+        summary["max_chunk_ms"] = max(summary["max_chunk_ms"], (time.perf_counter() - chunk_start) * 1000)
+        summary["chunks"] += 1
+        time.sleep(pause)
+    summary["seconds"] = time.perf_counter() - start
+    conn.close()
+    return summary
+
+
+def hot_path_timings(database, repeat=5):
+    """Median milliseconds of the queries live traffic runs on the hot tables"""
+    # Imported here: generate_reports pulls in the analytics stack
+    from generate_reports import query_event_popularity, query_student_participation
+
+    conn = sqlite3.connect(database)
+    conn.row_factory = sqlite3.Row
+    upcoming = [row[0] for row in conn.execute(
+        "SELECT id FROM events ORDER BY event_date DESC LIMIT 50")]
+
+    def capacity_checks():
+        for event_id in upcoming:
+            conn.execute("SELECT COUNT(*) FROM registrations WHERE event_id = ?", (event_id,)).fetchone()
+
+    queries = {
+        "capacity COUNT(*) x 50 events": capacity_checks,
+        "event popularity report": lambda: query_event_popularity(conn),
+        "student participation report": lambda: query_student_participation(conn),
+    }
+    timings = {}
+    for label, query in queries.items():
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            query()
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[label] = statistics.median(samples)
+    conn.close()
+    return timings
+
+
+def print_summary(summary):
+    moved = summary["moved"]
+    print(f"\nMoved {moved['events']:,} events, {moved['registrations']:,} registrations, "
+          f"{moved['attendance']:,} attendance and {moved['feedback']:,} feedback rows "
+          f"to {summary['archive']}")
+    print(f"{summary['chunks']} chunks in {summary['seconds']:.1f}s, "
+          f"longest transaction {summary['max_chunk_ms']:.1f} ms")
+
+
+def print_timings(before, after):
+    print("\nHot-path latency (median ms):")
+    for label in before:
+        speedup = before[label] / after[label] if after[label] else float('inf')
+        print(f"  {label:<32} {before[label]:>10.2f} -> {after[label]:>10.2f}   ({speedup:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move past events into the archive database")
+    cutoff_group = parser.add_mutually_exclusive_group()
+    cutoff_group.add_argument('--older-than', type=int, default=DEFAULT_OLDER_THAN_DAYS, metavar='DAYS',
+                              help="archive events dated more than DAYS ago (default 365)")
+    cutoff_group.add_argument('--before', metavar='YYYY-MM-DD',
+                              help="archive events dated before this day")
+    parser.add_argument('--database', default=DATABASE)
+    parser.add_argument('--archive', metavar='PATH', help="archive file (default: <database>_archive.db)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="registrations moved per transaction")
+    parser.add_argument('--dry-run', action='store_true', help="only count what would move")
+    parser.add_argument('--no-timings', action='store_true', help="skip the before/after latency check")
+    args = parser.parse_args()
+
+    cutoff = args.before or (date.today() - timedelta(days=args.older_than)).isoformat()
+
+    print("=" * 60)
+    print(f"ARCHIVING EVENTS BEFORE {cutoff}")
+    print("=" * 60)
+
+    if args.dry_run:
+        summary = archive_events(args.database, cutoff, args.archive, dry_run=True)
+        print(f"\n{summary['events']:,} events with {summary['registrations']:,} registrations would move")
+    else:
+        before = None if args.no_timings else hot_path_timings(args.database)
+        summary = archive_events(args.database, cutoff, args.archive, args.chunk_rows)
+        print_summary(summary)
+        if before and summary["chunks"]:
+            print_timings(before, hot_path_timings(args.database))
@@ -0,0 +1,534 @@
+"""
+Bitmap audience index for Campus Event Management Platform
+Keeps compressed bitsets of student ids per event (registered, attended),
+per college and per event type, and evaluates boolean audience expressions
+over them:
+
+    registered:12 AND registered:15 AND NOT attended:20
+    college:2 AND attended_type:Hackathon
+    (registered_type:Workshop OR registered_type:Seminar) AND NOT college:1
+
+Bitmaps follow the Roaring layout: ids are split into 2^16-id chunks, and
+each chunk is a sorted uint16 array while sparse or a bitset (Python int)
+once it holds more than ARRAY_LIMIT ids.
+
+The index lives in process memory. refresh() catches up with writes from
+any process by reading students past the last seen id and the registrations
+and check-ins in the change log past the last seen cursor (see changes.py);
+a full rebuild every REBUILD_SECONDS picks up anything else (e.g. deleted
+rows).
+
+Usage: python audience.py "registered:1 AND NOT attended:1" [--ids]
+"""
+
+import argparse
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from changes import expired_through, latest_cursor
+
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+# A chunk switches from a sorted array to a bitset above this many ids
+# (4096 x 2 bytes = the 8 KiB a full bitset takes)
+ARRAY_LIMIT = 4096
+
+DATABASE = 'campus_events.db'
+
+REBUILD_SECONDS = 15 * 60
+FETCH_CHUNK = 100_000
+DEFAULT_ID_LIMIT = 1000
+MAX_ID_LIMIT = 100_000
+
+
+def _popcount(bitset):
+    return bin(bitset).count('1')
+
+
+# int.bit_count() is Python 3.10+
+_popcount = getattr(int, 'bit_count', _popcount)
+
+
+def _bits_to_int(values):
+    bits = bytearray(1 << (CHUNK_BITS - 3))
+    for value in values:
+        bits[value >> 3] |= 1 << (value & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _int_to_bits(bitset):
+    data = bitset.to_bytes((bitset.bit_length() + 7) // 8, 'little')
+    for index, byte in enumerate(data):
+        if byte:
+            base = index << 3
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield base + bit
+
+
+def _container(values):
+    """Best container for a sorted sequence of uint16 values"""
+    if len(values) > ARRAY_LIMIT:
+        return _bits_to_int(values)
+    return array('H', values)
+
+
+def _normalize(bitset):
+    if not bitset:
+        return None
+    if _popcount(bitset) <= ARRAY_LIMIT:
+        return array('H', _int_to_bits(bitset))
+    return bitset
+
+
+def _as_int(container):
+    return container if isinstance(container, int) else _bits_to_int(container)
+
+
+def _combine(a, b, op):
+    """Apply op ('and', 'or', 'sub') to two chunk containers"""
+    if isinstance(a, array) and isinstance(b, array):
+        if op == 'and':
+            values = set(a).intersection(b)
+        elif op == 'or':
+            values = set(a).union(b)
+        else:
+            values = set(a).difference(b)
+        return _container(sorted(values)) if values else None
+    if op != 'or' and isinstance(a, array):
+        # Sparse side against a bitset: test each array value's bit
+        bits = b.to_bytes(1 << (CHUNK_BITS - 3), 'little')
+        keep = op == 'and'
+        values = [value for value in a if bool(bits[value >> 3] >> (value & 7) & 1) == keep]
+        return array('H', values) if values else None
+    if op == 'and' and isinstance(b, array):
+        return _combine(b, a, op)
+    a, b = _as_int(a), _as_int(b)
+    if op == 'and':
+        return _normalize(a & b)
+    if op == 'or':
+        return a | b
+    return _normalize(a & ~b)
+
+
+class Bitmap:
+    """Compressed set of non-negative integer ids"""
+
+    __slots__ = ('_chunks',)
+
+    def __init__(self, chunks=None):
+        self._chunks = chunks or {}
+
+    @classmethod
+    def from_sorted(cls, ids):
+        """Build from ascending ids (duplicates allowed)"""
+        chunks = {}
+        key, values = None, []
+        for value in ids:
+            high = value >> CHUNK_BITS
+            if high != key:
+                if values:
+                    chunks[key] = _container(values)
+                key, values = high, []
+            low = value & CHUNK_MASK
+            if not values or values[-1] != low:
+                values.append(low)
+        if values:
+            chunks[key] = _container(values)
+        return cls(chunks)
+
+    def add(self, value):
+        key, low = value >> CHUNK_BITS, value & CHUNK_MASK
+        container = self._chunks.get(key)
+        if container is None:
+            self._chunks[key] = array('H', [low])
+        elif isinstance(container, int):
+            self._chunks[key] = container | (1 << low)
+        else:
+            position = bisect_left(container, low)
+            if position == len(container) or container[position] != low:
+                container.insert(position, low)
+                if len(container) > ARRAY_LIMIT:
+                    self._chunks[key] = _bits_to_int(container)
+
+    def discard(self, value):
+        key, low = value >> CHUNK_BITS, value & CHUNK_MASK
+        container = self._chunks.get(key)
+        if container is None:
+            return
+        if isinstance(container, int):
+            container = _normalize(container & ~(1 << low))
+        else:
+            position = bisect_left(container, low)
+            if position < len(container) and container[position] == low:
+                del container[position]
+            if not container:
+                container = None
+        if container is None:
+            del self._chunks[key]
+        else:
+            self._chunks[key] = container
+
+    def __contains__(self, value):
+        container = self._chunks.get(value >> CHUNK_BITS)
+        if container is None:
+            return False
+        low = value & CHUNK_MASK
+        if isinstance(container, int):
+            return bool(container >> low & 1)
+        position = bisect_left(container, low)
+        return position < len(container) and container[position] == low
+
+    def __len__(self):
+        return sum(
+            _popcount(container) if isinstance(container, int) else len(container)
+            for container in self._chunks.values()
+        )
+
+    def __iter__(self):
+        for key in sorted(self._chunks):
+            container = self._chunks[key]
+            base = key << CHUNK_BITS
+            values = _int_to_bits(container) if isinstance(container, int) else container
+            for low in values:
+                yield base + low
+
+    def _apply(self, other, op):
+        chunks = {}
+        if op == 'and':
+            keys = self._chunks.keys() & other._chunks.keys()
+        elif op == 'or':
+            keys = self._chunks.keys() | other._chunks.keys()
+        else:
+            keys = self._chunks.keys()
+        for key in keys:
+            a, b = self._chunks.get(key), other._chunks.get(key)
+            if b is None:
+                result = a if op != 'and' else None
+            elif a is None:
+                result = b if op == 'or' else None
+            else:
+                result = _combine(a, b, op)
+            if result is not None:
+                # Containers are shared between bitmaps; copy arrays before
+                # they can be mutated through add()/discard()
+                chunks[key] = array('H', result) if isinstance(result, array) else result
+        return Bitmap(chunks)
+
+    def copy(self):
+        return Bitmap({key: array('H', container) if isinstance(container, array) else container
+                       for key, container in self._chunks.items()})
+
+    def __and__(self, other):
+        return self._apply(other, 'and')
+
+    def __or__(self, other):
+        return self._apply(other, 'or')
+
+    def __sub__(self, other):
+        return self._apply(other, 'sub')
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the containers"""
+        return sum(
+            (container.bit_length() + 7) // 8 if isinstance(container, int)
+            else container.itemsize * len(container)
+            for container in self._chunks.values()
+        )
+
+
+TOKEN_PATTERN = re.compile(r'\s*(?:(\()|(\))|([A-Za-z_]+)(?::([\w-]+))?)')
+ATOMS = {'registered', 'attended', 'college', 'registered_type', 'attended_type'}
+# Parsing and evaluation recurse, so expressions are kept well inside the
+# interpreter's recursion limit
+MAX_SELECTORS = 64
+MAX_NESTING = 32
+
+
+def parse_expression(text):
+    """Parse an audience expression into nested tuples
+
+    Grammar (AND binds tighter than OR; keywords are case-insensitive):
+        expr   := term (OR term)*
+        term   := factor (AND factor)*
+        factor := NOT factor | '(' expr ')' | ALL | atom:value
+    Raises ValueError with a readable message on bad input, including more
+    than MAX_SELECTORS selectors or NOT and parentheses nested deeper than
+    MAX_NESTING.
+    """
+    tokens = []
+    position = 0
+    text = text or ''
+    while position < len(text):
+        if text[position:].strip() == '':
+            break
+        match = TOKEN_PATTERN.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unexpected input at position {position}: {text[position:position + 20]!r}")
+        position = match.end()
+        open_paren, close_paren, word, value = match.groups()
+        if open_paren or close_paren:
+            tokens.append((open_paren or close_paren, None))
+        elif value is not None:
+            if word.lower() not in ATOMS:
+                raise ValueError(f"Unknown selector: {word} (use one of {', '.join(sorted(ATOMS))})")
+            tokens.append(('atom', (word.lower(), value)))
+        else:
+            tokens.append((word.upper(), None))
+    if not tokens:
+        raise ValueError("Empty expression")
+    selectors = sum(1 for kind, _ in tokens if kind in ('atom', 'ALL'))
+    if selectors > MAX_SELECTORS:
+        raise ValueError(f"Too many selectors: {selectors} (at most {MAX_SELECTORS})")
+
+    index = 0
+    depth = 0
+
+    def peek():
+        return tokens[index][0] if index < len(tokens) else None
+
+    def take(expected):
+        nonlocal index
+        if peek() != expected:
+            found = peek() or 'end of expression'
+            raise ValueError(f"Expected {expected}, found {found}")
+        index += 1
+        return tokens[index - 1][1]
+
+    def expr():
+        node = term()
+        while peek() == 'OR':
+            take('OR')
+            node = ('or', node, term())
+        return node
+
+    def term():
+        node = factor()
+        while peek() == 'AND':
+            take('AND')
+            node = ('and', node, factor())
+        return node
+
+    def nested(parse):
+        nonlocal depth
+        depth += 1
+        if depth > MAX_NESTING:
+            raise ValueError(f"Expression nested deeper than {MAX_NESTING} levels")
+        node = parse()
+        depth -= 1
+        return node
+
+    def factor():
+        kind = peek()
+        if kind == 'NOT':
+            take('NOT')
+            return ('not', nested(factor))
+        if kind == '(':
+            take('(')
+            node = nested(expr)
+            take(')')
+            return node
+        if kind == 'ALL':
+            take('ALL')
+            return ('all',)
+        if kind == 'atom':
+            selector, value = take('atom')
+            if selector in ('registered', 'attended', 'college') and not value.isdigit():
+                raise ValueError(f"{selector} needs a numeric id, got {value!r}")
+            return ('atom', selector, value)
+        raise ValueError(f"Expected a selector, found {kind or 'end of expression'}")
+
+    tree = expr()
+    if index != len(tokens):
+        raise ValueError(f"Unexpected {tokens[index][0]} after complete expression")
+    return tree
+
+
+class AudienceIndex:
+    """Per-event, per-college and per-type student bitmaps"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.built_at = None
+        self.registered = {}
+        self.attended = {}
+        self.colleges = {}
+        self.students = Bitmap()
+        self.event_types = {}
+        self._type_cache = {}
+        self._last_student_id = 0
+        # change_log cursor registrations and check-ins are current to
+        self._last_change = 0
+
+    def _rows(self, conn, query, params=()):
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(FETCH_CHUNK)
+            if not rows:
+                break
+            yield from rows
+
+    def _grouped(self, conn, query):
+        """{group: Bitmap} from (group, student_id) rows ordered by both"""
+        bitmaps = {}
+        group, ids = None, []
+        for key, student_id in self._rows(conn, query):
+            if key != group:
+                if ids:
+                    bitmaps[group] = Bitmap.from_sorted(ids)
+                group, ids = key, []
+            ids.append(student_id)
+        if ids:
+            bitmaps[group] = Bitmap.from_sorted(ids)
+        return bitmaps
+
+    def build(self, conn):
+        """Load every bitmap from the tables"""
+        with self._lock:
+            # Read the high-water marks first: anything written while the
+            # bitmaps load is re-applied by the next refresh
+            self._last_student_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM students").fetchone()[0]
+            self._last_change = latest_cursor(conn)
+            self.students = Bitmap.from_sorted(
+                row[0] for row in self._rows(conn, "SELECT id FROM students ORDER BY id"))
+            self.colleges = self._grouped(
+                conn, "SELECT college_id, id FROM students ORDER BY college_id, id")
+            self.registered = self._grouped(
+                conn, "SELECT event_id, student_id FROM registrations ORDER BY event_id, student_id")
+            self.attended = self._grouped(conn, """
+                SELECT r.event_id, r.student_id
+                FROM registrations r
+                JOIN attendance a ON a.registration_id = r.id AND a.attended = 1
+                ORDER BY r.event_id, r.student_id
+            """)
+            self.event_types = dict(self._rows(conn, "SELECT id, event_type FROM events"))
+            self._type_cache = {}
+            self.built_at = time.monotonic()
+
+    def refresh(self, conn):
+        """Apply writes made since the last build or refresh"""
+        if (self.built_at is None or time.monotonic() - self.built_at > REBUILD_SECONDS
+                or expired_through(conn) > self._last_change):
+            self.build(conn)
+            return
+
+        with self._lock:
+            for student_id, college_id in self._rows(conn, """
+                SELECT id, college_id FROM students WHERE id > ? ORDER BY id
+            """, (self._last_student_id,)):
+                self.students.add(student_id)
+                self.colleges.setdefault(college_id, Bitmap()).add(student_id)
+                self._last_student_id = student_id
+
+            # Registrations and check-ins follow the change log: its cursor
+            # grows in commit order, while rows written behind by the hot
+            # tier carry older ids and timestamps. Each bit is set to the
+            # row's current state, so reading a row twice is harmless.
+            cursor = latest_cursor(conn)
+            window = (self._last_change, cursor)
+            for event_id, student_id in self._rows(conn, """
+                SELECT r.event_id, r.student_id
+                FROM change_log c JOIN registrations r ON r.id = c.row_id
+                WHERE c.id > ? AND c.id <= ? AND c.table_name = 'registrations'
+            """, window):
+                self.registered.setdefault(event_id, Bitmap()).add(student_id)
+                self._touch(conn, event_id, 'registered')
+
+            for event_id, student_id, attended in self._rows(conn, """
+                SELECT r.event_id, r.student_id, a.attended
+                FROM change_log c
+                JOIN attendance a ON a.id = c.row_id
+                JOIN registrations r ON r.id = a.registration_id
+                WHERE c.id > ? AND c.id <= ? AND c.table_name = 'attendance'
+                ORDER BY c.id
+            """, window):
+                bitmap = self.attended.setdefault(event_id, Bitmap())
+                if attended:
+                    bitmap.add(student_id)
+                else:
+                    bitmap.discard(student_id)
+                self._touch(conn, event_id, 'attended')
+            self._last_change = cursor
+
+    def _touch(self, conn, event_id, kind):
+        """Drop the cached type bitmap an event change affects"""
+        event_type = self.event_types.get(event_id)
+        if event_type is None:
+            row = conn.execute("SELECT event_type FROM events WHERE id = ?", (event_id,)).fetchone()
+            event_type = self.event_types[event_id] = row[0] if row else None
+        self._type_cache.pop((kind, event_type), None)
+
+    def _type_bitmap(self, kind, event_type):
+        key = (kind, event_type)
+        if key not in self._type_cache:
+            source = self.registered if kind == 'registered' else self.attended
+            result = Bitmap()
+            for event_id, bitmap in source.items():
+                if self.event_types.get(event_id) == event_type:
+                    result = result | bitmap
+            self._type_cache[key] = result
+        return self._type_cache[key]
+
+    def _evaluate(self, node):
+        kind = node[0]
+        if kind == 'and':
+            # x AND NOT y is a difference; no need to complement y
+            if node[2][0] == 'not':
+                return self._evaluate(node[1]) - self._evaluate(node[2][1])
+            if node[1][0] == 'not':
+                return self._evaluate(node[2]) - self._evaluate(node[1][1])
+            return self._evaluate(node[1]) & self._evaluate(node[2])
+        if kind == 'or':
+            return self._evaluate(node[1]) | self._evaluate(node[2])
+        if kind == 'not':
+            return self.students - self._evaluate(node[1])
+        if kind == 'all':
+            return self.students
+        _, selector, value = node
+        if selector == 'registered':
+            return self.registered.get(int(value), Bitmap())
+        if selector == 'attended':
+            return self.attended.get(int(value), Bitmap())
+        if selector == 'college':
+            return self.colleges.get(int(value), Bitmap())
+        return self._type_bitmap(selector.split('_')[0], value)
+
+    def evaluate(self, expression):
+        """Bitmap of the students matching an expression string or parse tree
+
+        The result is the caller's own: a single selector would otherwise be
+        one of the index's bitmaps, which refresh() changes under its lock.
+        """
+        tree = parse_expression(expression) if isinstance(expression, str) else expression
+        with self._lock:
+            return self._evaluate(tree).copy()
+
+    @property
+    def nbytes(self):
+        bitmaps = [self.students, *self.colleges.values(),
+                   *self.registered.values(), *self.attended.values()]
+        return sum(bitmap.nbytes for bitmap in bitmaps)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Count the students matching an audience expression")
+    parser.add_argument('expression')
+    parser.add_argument('--ids', action='store_true', help="print the matching student ids")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DATABASE)
+    index = AudienceIndex()
+    index.build(conn)
+    conn.close()
+
+    audience = index.evaluate(args.expression)
+    print(f"{len(audience)} students match: {args.expression}")
+    if args.ids:
+        print(' '.join(str(student_id) for student_id in audience))
@@ -0,0 +1,1424 @@
+"""
+Benchmark Script for Campus Event Management Platform
+Builds synthetic databases in a temporary directory and times the
+performance-sensitive paths against them. The live database is never touched.
+
+Usage: python benchmarks.py <benchmark> [options]
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from migrations import apply_migrations
+
+EVENT_TYPES = ['Workshop', 'Fest', 'Seminar', 'Hackathon']
+
+WORDS = [
+    'react', 'python', 'machine', 'learning', 'cloud', 'security', 'design',
+    'startup', 'robotics', 'data', 'science', 'quantum', 'music', 'dance',
+    'drama', 'photography', 'finance', 'marketing', 'blockchain', 'android',
+    'web', 'development', 'networking', 'ethics', 'innovation', 'leadership',
+    'climate', 'energy', 'biology', 'chemistry', 'physics', 'mathematics',
+    'literature', 'debate', 'quiz', 'gaming', 'sports', 'yoga', 'art', 'film'
+]
+
+
+def print_section(title):
+    print(f"\n{'='*60}")
+    print(f" {title}")
+    print(f"{'='*60}")
+
+
+def create_benchmark_db(directory, name='benchmark.db'):
+    """Create an empty database with the full schema in directory"""
+    path = os.path.join(directory, name)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    # Throwaway data: skip durability to keep bulk loading fast
+    conn.execute("PRAGMA synchronous = OFF")
+    with open('schema.sql', 'r') as f:
+        conn.executescript(f.read())
+    # Start from an empty database rather than the schema.sql sample rows
+    conn.executescript("""
+        DELETE FROM feedback; DELETE FROM attendance; DELETE FROM registrations;
+        DELETE FROM events; DELETE FROM students; DELETE FROM colleges;
+    """)
+    apply_migrations(conn)
+    return conn
+
+
+def populate_events(conn, count, colleges=50, seed=42):
+    """Insert count synthetic events spread over colleges"""
+    rng = random.Random(seed)
+    conn.executemany(
+        "INSERT OR IGNORE INTO colleges (id, name, location) VALUES (?, ?, ?)",
+        [(i, f"College {i}", f"City {i % 10}") for i in range(1, colleges + 1)]
+    )
+
+    def rows():
+        for i in range(count):
+            name = ' '.join(rng.choice(WORDS).title() for _ in range(3))
+            description = ' '.join(rng.choice(WORDS) for _ in range(12))
+            yield (
+                f"{name} {i}",
+                description,
+                rng.choice(EVENT_TYPES),
+                rng.randint(1, colleges),
+                f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                rng.randint(20, 500)
+            )
+
+    conn.executemany("""
+        INSERT INTO events (name, description, event_type, college_id, event_date, max_capacity)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, rows())
+    conn.commit()
+
+
+def populate_campus(conn, students, events, registrations, colleges=50,
+                    attendance_rate=0.75, feedback_rate=0.5, seed=42):
+    """Insert a synthetic campus: events, students, registrations, attendance, feedback
+
+    Registrations are spread evenly over students, each registering for
+    distinct random events. Returns the number of registrations inserted.
+    """
+    rng = random.Random(seed)
+    populate_events(conn, events, colleges=colleges, seed=seed)
+    event_ids = [row[0] for row in conn.execute("SELECT id FROM events")]
+
+    conn.executemany(
+        "INSERT INTO students (id, name, email, college_id) VALUES (?, ?, ?, ?)",
+        ((i, f"Student {i}", f"student{i}@college{i % colleges + 1}.edu", i % colleges + 1)
+         for i in range(1, students + 1))
+    )
+
+    per_student = max(1, min(len(event_ids), registrations // students))
+    attendance = []
+    feedback = []
+
+    def registration_rows():
+        registration_id = 0
+        for student_id in range(1, students + 1):
+            for event_id in rng.sample(event_ids, per_student):
+                registration_id += 1
+                if registration_id > registrations:
+                    return
+                registered_at = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} " \
+                                f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00"
+                yield (registration_id, student_id, event_id, registered_at)
+
+                roll = rng.random()
+                if roll < attendance_rate:
+                    attendance.append((registration_id, 1, registered_at))
+                    if rng.random() < feedback_rate:
+                        feedback.append((registration_id, rng.randint(1, 5),
+                                         ' '.join(rng.choice(WORDS) for _ in range(8)),
+                                         registered_at))
+                elif roll < attendance_rate + 0.1:
+                    attendance.append((registration_id, 0, registered_at))
+
+    def flush():
+        conn.executemany(
+            "INSERT INTO attendance (registration_id, attended, marked_at) VALUES (?, ?, ?)",
+            attendance
+        )
+        conn.executemany(
+            "INSERT INTO feedback (registration_id, rating, comments, submitted_at) VALUES (?, ?, ?, ?)",
+            feedback
+        )
+        attendance.clear()
+        feedback.clear()
+
+    # Each batch of registrations is inserted before the attendance and
+    # feedback rows generated alongside it, so triggers can join them
+    rows = registration_rows()
+    while True:
+        batch = list(itertools.islice(rows, 100_000))
+        if not batch:
+            break
+        conn.executemany(
+            "INSERT INTO registrations (id, student_id, event_id, registered_at) VALUES (?, ?, ?, ?)",
+            batch
+        )
+        flush()
+    conn.commit()
+
+    return conn.execute("SELECT COUNT(*) FROM registrations").fetchone()[0]
+
+
+def percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, math.ceil(len(sorted_samples) * fraction) - 1)
+    return sorted_samples[min(index, len(sorted_samples) - 1)]
+
+
+def time_calls(func, repeat):
+    """Call func repeat times and return latency percentiles in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(percentile(samples, 0.95), 3),
+        "max_ms": round(samples[-1], 3)
+    }
+
+
+def print_timings(label, timings):
+    print(f"  {label:<40} p50 {timings['p50_ms']:>9.3f} ms   "
+          f"p95 {timings['p95_ms']:>9.3f} ms   max {timings['max_ms']:>9.3f} ms")
+
+
+def benchmark_search(args):
+    """FTS5 search vs. pulling the event list and filtering it client-side"""
+    from search import search_events
+
+    print_section(f"EVENT SEARCH BENCHMARK ({args.events:,} events)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+
+        start = time.perf_counter()
+        populate_events(conn, args.events)
+        print(f"\nLoaded {args.events:,} events (FTS index maintained by triggers) "
+              f"in {time.perf_counter() - start:.2f}s")
+
+        queries = ['react', 'mach lea', 'quantum robotics', 'dat', 'film festival']
+        print("\nFTS5 search (top 20, BM25 ranked):")
+        for q in queries:
+            timings = time_calls(lambda: search_events(conn, q), args.repeat)
+            print_timings(f"q={q!r}", timings)
+
+        timings = time_calls(
+            lambda: search_events(conn, 'data', event_type='Workshop', college_id=7),
+            args.repeat
+        )
+        print_timings("q='data' event_type+college_id", timings)
+
+        print("\nBaseline: GET /api/events query + client-side filter:")
+
+        def client_side(q):
+            events = conn.execute("""
+                SELECT e.*, c.name as college_name
+                FROM events e
+                JOIN colleges c ON e.college_id = c.id
+                ORDER BY e.event_date DESC
+            """).fetchall()
+            return [
+                dict(e) for e in events
+                if q in e['name'].lower() or q in (e['description'] or '').lower()
+            ][:20]
+
+        for q in queries[:2]:
+            timings = time_calls(lambda: client_side(q), max(1, args.repeat // 10))
+            print_timings(f"q={q!r}", timings)
+
+        conn.close()
+
+
+def benchmark_analytics(args):
+    """SQL report queries vs. the vectorized NumPy analytics engine"""
+    import analytics
+    import generate_reports
+
+    print_section(f"REPORT ANALYTICS BENCHMARK ({args.registrations:,} registrations)")
+    if not analytics.HAVE_NUMPY:
+        print("\nNumPy is not installed; nothing to compare against")
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s")
+
+        # The report queries open their own connections to DATABASE
+        generate_reports.DATABASE = os.path.join(directory, 'benchmark.db')
+
+        sql_queries = [
+            ('event_popularity', generate_reports.query_event_popularity),
+            ('student_participation', generate_reports.query_student_participation),
+            ('top_students', generate_reports.query_top_students),
+            ('event_type_analysis', generate_reports.query_event_type_analysis),
+            ('college_statistics', generate_reports.query_college_statistics),
+            ('feedback', generate_reports.query_feedback_statistics),
+            ('summary_metrics', generate_reports.query_summary_metrics),
+        ]
+
+        print("\nSQL engine (one query per report):")
+        sql_results = {}
+        sql_total = 0.0
+        for name, query in sql_queries:
+            if name == 'college_statistics' and count > args.college_sql_limit:
+                # The college query joins students x events per college with an
+                # OR condition and grows quadratically
+                print(f"  {name:<28} skipped above {args.college_sql_limit:,} registrations")
+                continue
+            start = time.perf_counter()
+            sql_results[name] = query()
+            elapsed = time.perf_counter() - start
+            sql_total += elapsed
+            print(f"  {name:<28} {elapsed:>9.2f}s")
+        print(f"  {'total':<28} {sql_total:>9.2f}s")
+
+        print("\nNumPy engine:")
+        start = time.perf_counter()
+        facts = analytics.load_facts(conn)
+        dims = analytics.load_dimensions(conn)
+        load_time = time.perf_counter() - start
+        fact_bytes = sum(column.nbytes for column in facts.values())
+        print(f"  {'load facts + dimensions':<28} {load_time:>9.2f}s "
+              f"({fact_bytes / 1_048_576:.1f} MiB of fact columns)")
+
+        numpy_results = {}
+        numpy_total = load_time
+        for name, compute in [
+            ('event_popularity', analytics.event_popularity),
+            ('student_participation', analytics.student_participation),
+            ('top_students', analytics.top_students),
+            ('event_type_analysis', analytics.event_type_analysis),
+            ('college_statistics', analytics.college_statistics),
+            ('feedback', analytics.feedback_statistics),
+            ('summary_metrics', analytics.summary_metrics),
+        ]:
+            start = time.perf_counter()
+            numpy_results[name] = compute(facts, dims)
+            elapsed = time.perf_counter() - start
+            numpy_total += elapsed
+            print(f"  {name:<28} {elapsed:>9.2f}s")
+        print(f"  {'total':<28} {numpy_total:>9.2f}s")
+
+        mismatches = [
+            name for name in sql_results
+            if json.dumps(sql_results[name], sort_keys=True, default=str)
+            != json.dumps(numpy_results[name], sort_keys=True, default=str)
+        ]
+        print(f"\nResults identical for {len(sql_results) - len(mismatches)}/{len(sql_results)} reports"
+              + (f" (differ: {', '.join(mismatches)})" if mismatches else ""))
+        conn.close()
+
+
+def benchmark_snapshot(args):
+    """Loading report inputs from SQLite vs. a memory-mapped columnar snapshot"""
+    import analytics
+    import generate_reports
+    from snapshot import Snapshot, export_snapshot
+
+    print_section(f"COLUMNAR SNAPSHOT BENCHMARK ({args.registrations:,} registrations)")
+    if not analytics.HAVE_NUMPY:
+        print("\nNumPy is not installed; snapshots are read through NumPy")
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s")
+
+        path = os.path.join(directory, 'benchmark.snap')
+        start = time.perf_counter()
+        export_snapshot(conn, path)
+        print(f"Exported snapshot in {time.perf_counter() - start:.2f}s "
+              f"({os.path.getsize(path) / 1_048_576:.1f} MiB, database "
+              f"{os.path.getsize(os.path.join(directory, 'benchmark.db')) / 1_048_576:.1f} MiB)")
+
+        print("\nLoad facts + dimensions:")
+        start = time.perf_counter()
+        sql_reports = analytics.compute_reports_from_facts(
+            analytics.load_facts(conn), analytics.load_dimensions(conn))
+        print(f"  {'SQLite':<28} {time.perf_counter() - start:>9.2f}s (including report math)")
+
+        start = time.perf_counter()
+        snapshot = Snapshot(path)
+        snapshot_reports = analytics.compute_reports_from_facts(
+            analytics.load_snapshot_facts(snapshot), analytics.load_snapshot_dimensions(snapshot))
+        print(f"  {'snapshot':<28} {time.perf_counter() - start:>9.2f}s (including report math)")
+
+        print("\nSample comments:")
+        generate_reports.DATABASE = os.path.join(directory, 'benchmark.db')
+        start = time.perf_counter()
+        sql_comments = generate_reports.query_sample_comments()
+        print(f"  {'SQLite':<28} {time.perf_counter() - start:>9.2f}s")
+        start = time.perf_counter()
+        snapshot_comments = analytics.snapshot_sample_comments(
+            snapshot, generate_reports.SAMPLE_COMMENTS_PER_EVENT,
+            generate_reports.SAMPLE_COMMENT_LENGTH)
+        print(f"  {'snapshot':<28} {time.perf_counter() - start:>9.2f}s")
+        sql_reports['sample_comments'] = sql_comments
+        snapshot_reports['sample_comments'] = snapshot_comments
+
+        mismatches = [
+            name for name in sql_reports
+            if json.dumps(sql_reports[name], sort_keys=True, default=str)
+            != json.dumps(snapshot_reports[name], sort_keys=True, default=str)
+        ]
+        print(f"\nResults identical for {len(sql_reports) - len(mismatches)}/{len(sql_reports)} report inputs"
+              + (f" (differ: {', '.join(mismatches)})" if mismatches else ""))
+        del snapshot_reports, snapshot_comments
+        snapshot.close()
+        conn.close()
+
+
+def benchmark_report_writes(args):
+    """Check-in write latency while a full report run reads the database"""
+    import threading
+    import generate_reports
+
+    print_section(f"WRITE LATENCY DURING REPORTS ({args.registrations:,} registrations)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        conn.close()
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s")
+
+        path = os.path.join(directory, 'benchmark.db')
+        generate_reports.DATABASE = path
+        queries = [
+            generate_reports.query_event_popularity,
+            generate_reports.query_student_participation,
+            generate_reports.query_top_students,
+            generate_reports.query_event_type_analysis,
+            generate_reports.query_feedback_statistics,
+            generate_reports.query_sample_comments,
+            generate_reports.query_summary_metrics,
+        ]
+        if count <= args.college_sql_limit:
+            queries.append(generate_reports.query_college_statistics)
+
+        def run_reports(consistency):
+            if consistency is None:
+                for query in queries:
+                    query()
+                return
+            with generate_reports.consistent_connection(consistency) as shared:
+                for query in queries:
+                    query(shared)
+
+        def check_ins(stop, latencies, errors):
+            # One check-in per transaction, as the attendance endpoint does
+            writer = sqlite3.connect(path)
+            rng = random.Random(7)
+            while not stop.is_set():
+                registration_id = rng.randint(1, count)
+                start = time.perf_counter()
+                try:
+                    writer.execute("""
+                        INSERT INTO attendance (registration_id, attended) VALUES (?, 1)
+                        ON CONFLICT(registration_id) DO UPDATE SET
+                            attended = excluded.attended,
+                            marked_at = CASE WHEN attended IS excluded.attended
+                                             THEN marked_at ELSE CURRENT_TIMESTAMP END
+                    """, (registration_id,))
+                    writer.commit()
+                    latencies.append((time.perf_counter() - start) * 1000)
+                except sqlite3.OperationalError:
+                    writer.rollback()
+                    errors.append(registration_id)
+                time.sleep(0.001)
+            writer.close()
+
+        print(f"\n{'journal / read mode':<24} {'report':>8} {'writes':>7} {'locked':>7} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for journal_mode, consistency in [
+            ('delete', None), ('delete', 'backup'),
+            ('wal', None), ('wal', 'backup'), ('wal', 'wal'),
+        ]:
+            setup = sqlite3.connect(path)
+            setup.execute(f"PRAGMA journal_mode = {journal_mode}")
+            setup.close()
+
+            stop = threading.Event()
+            latencies, errors = [], []
+            writer = threading.Thread(target=check_ins, args=(stop, latencies, errors))
+            writer.start()
+            start = time.perf_counter()
+            run_reports(consistency)
+            report_time = time.perf_counter() - start
+            stop.set()
+            writer.join()
+
+            latencies.sort()
+            label = f"{journal_mode} / {consistency or 'live'}"
+            if latencies:
+                print(f"{label:<24} {report_time:>7.2f}s {len(latencies):>7,} {len(errors):>7,} "
+                      f"{percentile(latencies, 0.50):>8.2f} {percentile(latencies, 0.95):>8.2f} "
+                      f"{percentile(latencies, 0.99):>8.2f} {latencies[-1]:>8.2f}")
+            else:
+                print(f"{label:<24} {report_time:>7.2f}s {0:>7} {len(errors):>7,}")
+
+
+def benchmark_report_memory(args):
+    """Peak memory and time of the per-student and per-event reports:
+    rows materialized as lists vs. streamed into the files"""
+    import tracemalloc
+    import generate_reports
+
+    print_section("REPORT WRITER MEMORY")
+
+    print(f"\n{'students':>9} {'events':>7} {'report':<22} {'pipeline':<10} "
+          f"{'seconds':>8} {'peak MB':>8} {'bytes/row':>10}")
+    for scale in (4, 1):
+        students, events = args.students // scale, args.events // scale
+        with tempfile.TemporaryDirectory() as directory:
+            conn = create_benchmark_db(directory)
+            populate_campus(conn, students, events, args.registrations // scale)
+            conn.close()
+            generate_reports.DATABASE = os.path.join(directory, 'benchmark.db')
+            generate_reports.REPORTS_DIR = directory
+
+            reports = [
+                ("event popularity", events, generate_reports.query_event_popularity,
+                 generate_reports.generate_event_popularity_report),
+                ("student participation", students, generate_reports.query_student_participation,
+                 generate_reports.generate_student_participation_report),
+            ]
+            for label, rows, query, generate in reports:
+                for pipeline in ('lists', 'streamed'):
+                    tracemalloc.start()
+                    start = time.perf_counter()
+                    if pipeline == 'lists':
+                        generate(query())
+                    else:
+                        generate()
+                    seconds = time.perf_counter() - start
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                    print(f"{students:>9,} {events:>7,} {label:<22} {pipeline:<10} "
+                          f"{seconds:>8.2f} {peak / 1e6:>8.1f} {peak / rows:>10,.0f}")
+
+
+def benchmark_changes(args):
+    """Cost of capturing changes on the write path, and a consumer tailing
+    GET /api/changes while check-ins commit at 10,000 changes per second"""
+    import bisect
+    import threading
+    from app import create_app
+    from changes import compact_change_log, latest_cursor
+
+    target_rate = 10_000
+    batch = 100
+    seconds = 10
+    print_section(f"CHANGE FEED BENCHMARK ({target_rate:,} changes/s)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        conn.close()
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s")
+
+        path = os.path.join(directory, 'benchmark.db')
+        conn = sqlite3.connect(path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")
+        rng = random.Random(3)
+
+        def check_in_batch():
+            conn.execute("BEGIN")
+            conn.executemany("""
+                INSERT INTO attendance (registration_id, attended) VALUES (?, ?)
+                ON CONFLICT(registration_id) DO UPDATE SET
+                    attended = excluded.attended,
+                    marked_at = CASE WHEN attended IS excluded.attended
+                                     THEN marked_at ELSE CURRENT_TIMESTAMP END
+            """, [(rng.randint(1, count), rng.randint(0, 1)) for _ in range(batch)])
+            conn.execute("COMMIT")
+
+        # Write-path cost: the same check-in batches with and without capture
+        with_log = time_calls(check_in_batch, args.repeat)
+        triggers = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'change_log_%'").fetchall()
+        for name, _ in triggers:
+            conn.execute(f"DROP TRIGGER {name}")
+        without_log = time_calls(check_in_batch, args.repeat)
+        for _, sql in triggers:
+            conn.execute(sql)
+        print(f"\nCheck-ins, {batch} per transaction:")
+        print_timings("without change log", without_log)
+        print_timings("with change log", with_log)
+
+        # Tailing: a writer appends entries at the target rate while one
+        # consumer pages through the feed. Check-ins above top out well
+        # below that rate (their other triggers dominate), so the writer
+        # inserts log entries shaped like theirs directly.
+        client = create_app(path).test_client()
+        start_cursor = latest_cursor(conn)
+        entries = conn.execute("""
+            SELECT table_name, operation, row_id, event_id, data FROM change_log
+            ORDER BY id DESC LIMIT ?
+        """, (batch,)).fetchall()
+        committed = []
+        stop = threading.Event()
+
+        def writer():
+            log = sqlite3.connect(path, isolation_level=None)
+            started = time.perf_counter()
+            for i in range(seconds * target_rate // batch):
+                log.execute("BEGIN")
+                log.executemany("""
+                    INSERT INTO change_log (table_name, operation, row_id, event_id, data)
+                    VALUES (?, ?, ?, ?, ?)
+                """, entries)
+                log.execute("COMMIT")
+                committed.append((latest_cursor(log), time.perf_counter()))
+                time.sleep(max(0.0, started + (i + 1) * batch / target_rate - time.perf_counter()))
+            log.close()
+            stop.set()
+
+        thread = threading.Thread(target=writer)
+        lags = []
+        received = 0
+        cursor = start_cursor
+        start = time.perf_counter()
+        thread.start()
+        while True:
+            page = client.get(f'/api/changes?after={cursor}&limit=1000').get_json()
+            received += len(page['changes'])
+            if page['changes']:
+                cursor = page['next_cursor']
+                # The batch that committed this page's last change
+                done = list(committed)
+                index = bisect.bisect_left([last for last, _ in done], cursor)
+                if index < len(done):
+                    lags.append((time.perf_counter() - done[index][1]) * 1000)
+            elif stop.is_set() and cursor >= latest_cursor(conn):
+                break
+            else:
+                time.sleep(0.005)
+        elapsed = time.perf_counter() - start
+        thread.join()
+        written = latest_cursor(conn) - start_cursor
+
+        lags.sort()
+        print(f"\nTailing GET /api/changes?limit=1000 for {seconds}s:")
+        print(f"  written {written:,} changes ({written / elapsed:,.0f}/s), "
+              f"received {received:,} ({received / elapsed:,.0f}/s)")
+        if lags:
+            print(f"  commit to consumer: p50 {percentile(lags, 0.50):.0f} ms, "
+                  f"p95 {percentile(lags, 0.95):.0f} ms, max {lags[-1]:.0f} ms")
+
+        # Catching up on a backlog, e.g. after a consumer restart
+        for limit in (1000, 10_000):
+            start = time.perf_counter()
+            cursor, received = start_cursor, 0
+            while True:
+                page = client.get(f'/api/changes?after={cursor}&limit={limit}').get_json()
+                received += len(page['changes'])
+                cursor = page['next_cursor']
+                if not page['has_more']:
+                    break
+            print(f"  backlog read with limit={limit:<6,} {received / (time.perf_counter() - start):>9,.0f} changes/s")
+
+        # Compaction of the whole log, as if it were past the horizon
+        before = conn.execute("SELECT COUNT(*) FROM change_log").fetchone()[0]
+        conn.execute("UPDATE change_log SET changed_at = datetime('now', '-2 days')")
+        start = time.perf_counter()
+        removed = compact_change_log(conn)
+        print(f"\nCompaction: {before:,} entries -> {before - removed['superseded']:,} "
+              f"(latest per row) in {time.perf_counter() - start:.2f}s")
+        conn.close()
+
+
+def benchmark_coattendance(args):
+    """Co-attendance index build time and recommendation latency"""
+    from coattendance import backfill_coattendance, recommend_events, related_events
+
+    print_section(f"CO-ATTENDANCE BENCHMARK ({args.students:,} students)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s "
+              f"(index maintained by triggers)")
+
+        start = time.perf_counter()
+        backfill_coattendance(conn)
+        pairs = conn.execute("SELECT COUNT(*) FROM event_coattendance").fetchone()[0]
+        print(f"Bulk build: {pairs:,} event pairs in {time.perf_counter() - start:.2f}s")
+
+        rng = random.Random(1)
+
+        def random_event():
+            return rng.randint(1, args.events)
+
+        def random_student():
+            return rng.randint(1, args.students)
+
+        print(f"\nLatency over {args.repeat} calls:")
+        print_timings("related events (index)",
+                      time_calls(lambda: related_events(conn, random_event()), args.repeat))
+        print_timings("related events (on-demand SQL)", time_calls(lambda: conn.execute("""
+            SELECT o.event_id, COUNT(*) as shared_attendees
+            FROM registrations r
+            JOIN attendance a ON a.registration_id = r.id AND a.attended = 1
+            JOIN registrations o ON o.student_id = r.student_id AND o.event_id != r.event_id
+            JOIN attendance oa ON oa.registration_id = o.id AND oa.attended = 1
+            WHERE r.event_id = ?
+            GROUP BY o.event_id
+            ORDER BY shared_attendees DESC, o.event_id
+            LIMIT 10
+        """, (random_event(),)).fetchall(), args.repeat))
+        print_timings("student recommendations",
+                      time_calls(lambda: recommend_events(conn, random_student()), args.repeat))
+
+        def toggle_check_in():
+            registration_id = rng.randint(1, count)
+            for attended in (0, 1):
+                conn.execute("""
+                    INSERT INTO attendance (registration_id, attended) VALUES (?, ?)
+                    ON CONFLICT(registration_id) DO UPDATE SET attended = excluded.attended
+                """, (registration_id, attended))
+            conn.commit()
+
+        print_timings("check-in undo + redo (2 writes)", time_calls(toggle_check_in, args.repeat))
+        conn.close()
+
+
+def benchmark_audience(args):
+    """Audience expressions over the bitmap index vs. the equivalent SQL"""
+    from audience import AudienceIndex
+
+    print_section(f"AUDIENCE BENCHMARK ({args.registrations:,} registrations)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s")
+
+        index = AudienceIndex()
+        start = time.perf_counter()
+        index.build(conn)
+        print(f"Index build: {time.perf_counter() - start:.2f}s, "
+              f"{index.nbytes / 2**20:.1f} MiB of bitmaps "
+              f"(database {os.path.getsize(os.path.join(directory, 'benchmark.db')) / 2**20:.1f} MiB)")
+
+        def registered(event_id):
+            return f"SELECT student_id FROM registrations WHERE event_id = {event_id}"
+
+        def attended(event_id):
+            return f"""SELECT r.student_id FROM registrations r
+                       JOIN attendance a ON a.registration_id = r.id AND a.attended = 1
+                       WHERE r.event_id = {event_id}"""
+
+        def college(college_id):
+            return f"SELECT id FROM students WHERE college_id = {college_id}"
+
+        # (label, expression, equivalent SQL), each built from three random event ids
+        cases = [
+            ("registered A and B, not attended C",
+             lambda a, b, c: f"registered:{a} AND registered:{b} AND NOT attended:{c}",
+             lambda a, b, c: f"{registered(a)} INTERSECT {registered(b)} EXCEPT {attended(c)}"),
+            ("registered A or B, not college 1",
+             lambda a, b, c: f"(registered:{a} OR registered:{b}) AND NOT college:1",
+             lambda a, b, c: f"SELECT * FROM ({registered(a)} UNION {registered(b)}) EXCEPT {college(1)}"),
+            ("college 2 attended any Hackathon",
+             lambda a, b, c: "college:2 AND attended_type:Hackathon",
+             lambda a, b, c: f"""{college(2)} INTERSECT
+                 SELECT r.student_id FROM registrations r
+                 JOIN attendance a ON a.registration_id = r.id AND a.attended = 1
+                 JOIN events e ON e.id = r.event_id
+                 WHERE e.event_type = 'Hackathon'"""),
+        ]
+
+        rng = random.Random(1)
+
+        def random_events():
+            return [rng.randint(1, args.events) for _ in range(3)]
+
+        def sql_count(query):
+            return conn.execute(f"SELECT COUNT(*) FROM ({query})").fetchone()[0]
+
+        # Both sides must agree before their timings mean anything
+        for _, expression, query in cases:
+            for _ in range(5):
+                events = random_events()
+                assert len(index.evaluate(expression(*events))) == sql_count(query(*events)), \
+                    expression(*events)
+
+        index._type_cache.clear()
+        start = time.perf_counter()
+        index.evaluate("attended_type:Hackathon")
+        print(f"First attended_type:Hackathon (ORs every Hackathon roster, then cached): "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+        print(f"\nCount latency over {args.repeat} calls (random events per call):")
+        for label, expression, query in cases:
+            print_timings(f"{label} (bitmaps)", time_calls(
+                lambda: len(index.evaluate(expression(*random_events()))), args.repeat))
+            print_timings(f"{label} (SQL)", time_calls(
+                lambda: sql_count(query(*random_events())), args.repeat))
+
+        def check_in():
+            registration_id = rng.randint(1, count)
+            conn.execute("""
+                INSERT INTO attendance (registration_id, attended) VALUES (?, 1)
+                ON CONFLICT(registration_id) DO UPDATE SET
+                    attended = excluded.attended,
+                    marked_at = CASE WHEN attended IS excluded.attended
+                                     THEN marked_at ELSE CURRENT_TIMESTAMP END
+            """, (registration_id,))
+            conn.commit()
+            index.refresh(conn)
+
+        print_timings("check-in + index refresh", time_calls(check_in, args.repeat))
+        conn.close()
+
+
+def benchmark_engagement(args):
+    """Unique students per college / event type / month: COUNT(DISTINCT)
+    vs. HyperLogLog sketches, with the error of every estimate"""
+    from engagement import (ACTIVITIES, STANDARD_ERROR, EngagementSketches, exact_counts,
+                            relative_errors)
+
+    print_section(f"ENGAGEMENT SKETCH BENCHMARK ({args.registrations:,} registrations)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s")
+
+        sketches = EngagementSketches()
+        start = time.perf_counter()
+        sketches.build(conn)
+        print(f"Built {len(sketches.sketches):,} sketches ({sketches.nbytes() / 1e6:.1f} MB) "
+              f"in {time.perf_counter() - start:.1f}s; standard error {STANDARD_ERROR:.2%}")
+
+        queries = [
+            ("by college", 'college', {}),
+            ("by event type", 'event_type', {}),
+            ("by month", 'month', {}),
+            ("by month, one college", 'month', {"college_id": 1}),
+            ("by college, one quarter", 'college', {"months": ('2025-04', '2025-06')}),
+        ]
+        repeat = max(1, args.repeat // 10)
+        print(f"\n{'query':<34} {'exact ms':>9} {'approx ms':>10} {'speedup':>8} "
+              f"{'counts':>7} {'worst err':>10} {'mean err':>9}")
+        errors_seen = []
+        for activity in ACTIVITIES:
+            for label, by, filters in queries:
+                exact_ms = time_calls(lambda: exact_counts(conn, activity, by, **filters), repeat)['p50_ms']
+                approx_ms = time_calls(lambda: sketches.estimate(activity, by, **filters), repeat)['p50_ms']
+                exact, exact_total = exact_counts(conn, activity, by, **filters)
+                estimates, total = sketches.estimate(activity, by, **filters)
+                errors = list(relative_errors(exact, estimates).values())
+                errors.append(abs(total - exact_total) / exact_total)
+                errors_seen.extend(errors)
+                print(f"{activity + ' ' + label:<34} {exact_ms:>9.1f} {approx_ms:>10.1f} "
+                      f"{exact_ms / approx_ms:>7.0f}x {len(errors):>7} {max(errors):>10.2%} "
+                      f"{statistics.mean(errors):>9.2%}")
+        conn.close()
+
+        within = [sum(error <= k * STANDARD_ERROR for error in errors_seen) / len(errors_seen)
+                  for k in (1, 2, 3)]
+        print(f"\n{len(errors_seen)} estimates: {within[0]:.1%} within 1 standard error "
+              f"(expected ~68%), {within[1]:.1%} within 2 (~95%), {within[2]:.1%} within 3 (~99.7%)")
+
+
+def benchmark_live(args):
+    """Fest launch: open event pages polling GET /api/events/<id> vs. one
+    publisher pushing to the same number of /live streams"""
+    import threading
+    from app import create_app
+    from live_updates import DEFAULT_MAX_SUBSCRIBERS, LivePublisher, seat_counts
+
+    tabs = DEFAULT_MAX_SUBSCRIBERS
+    poll_every = 2.0
+    writes_per_second = 200
+    seconds = 5
+    print_section(f"LIVE SEAT COUNTS BENCHMARK ({tabs:,} open pages)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        event_id = conn.execute("SELECT MIN(id) FROM events").fetchone()[0]
+        new_students = range(args.students + 1, args.students + 1 + writes_per_second * seconds)
+        conn.execute("UPDATE events SET max_capacity = max_capacity + ? WHERE id = ?",
+                     (len(new_students), event_id))
+        conn.executemany(
+            "INSERT INTO students (id, name, email, college_id) VALUES (?, ?, ?, 1)",
+            ((i, f"Student {i}", f"student{i}@college1.edu") for i in new_students)
+        )
+        conn.commit()
+        conn.close()
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s")
+
+        path = os.path.join(directory, 'benchmark.db')
+        client = create_app(path).test_client()
+        detail = time_calls(lambda: client.get(f'/api/events/{event_id}'), args.repeat)
+        print(f"\nPolling: {tabs:,} pages x GET /api/events/<id> every {poll_every:.0f}s")
+        print_timings("GET /api/events/<id>", detail)
+        print(f"  {tabs / poll_every:,.0f} requests/s, ~{tabs / poll_every * detail['p50_ms']:,.0f} ms "
+              f"of request handling per second; changes show up {poll_every / 2:.1f}s late on average")
+
+        # Streams: every subscriber thread records when each update arrives
+        publisher = LivePublisher(path, max_subscribers=tabs)
+        reader = sqlite3.connect(path)
+        counts = seat_counts(reader, [event_id])[event_id]
+        committed = {}
+        delays = []
+        delays_lock = threading.Lock()
+        stop = threading.Event()
+
+        def subscriber(subscription):
+            # Delay of the oldest registration each update carries
+            delivered = counts['version']
+            while not stop.is_set():
+                update = subscription.next(timeout=0.5)
+                if update is not None and delivered + 1 in committed:
+                    delay = time.perf_counter() - committed[delivered + 1]
+                    with delays_lock:
+                        delays.append(delay * 1000)
+                if update is not None:
+                    delivered = update['version']
+            subscription.close()
+
+        subscriptions = [publisher.subscribe(event_id, counts) for _ in range(tabs)]
+        assert publisher.subscribe(event_id, counts) is None, "subscriber cap not enforced"
+        threads = [threading.Thread(target=subscriber, args=(subscription,))
+                   for subscription in subscriptions]
+        for thread in threads:
+            thread.start()
+
+        # Registrations committed by another connection, as another worker
+        # process would; the publisher only sees them by polling
+        writer = sqlite3.connect(path)
+        start = time.perf_counter()
+        for i, student_id in enumerate(new_students):
+            writer.execute("INSERT INTO registrations (student_id, event_id) VALUES (?, ?)",
+                           (student_id, event_id))
+            writer.commit()
+            version = writer.execute("SELECT version FROM event_versions WHERE event_id = ?",
+                                     (event_id,)).fetchone()[0]
+            committed[version] = time.perf_counter()
+            time.sleep(max(0.0, start + (i + 1) / writes_per_second - time.perf_counter()))
+        time.sleep(1.0)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for thread in threads:
+            thread.join()
+        writer.close()
+
+        reader.close()
+
+        stats = publisher.stats()
+        delays.sort()
+        print(f"\nStreams: {tabs:,} subscribers on one publisher, "
+              f"{len(new_students):,} registrations at {writes_per_second}/s")
+        print(f"  {stats['polls'] / elapsed:.1f} polls/s, ~{stats['poll_seconds'] / elapsed * 1000:.1f} ms "
+              f"of queries per second")
+        print(f"  {len(new_students):,} writes coalesced into {stats['pushes'] - 1:,} pushes, "
+              f"{len(delays):,} deliveries")
+        if delays:
+            print(f"  commit to delivery (oldest change per update): p50 {percentile(delays, 0.50):.0f} ms, "
+                  f"p95 {percentile(delays, 0.95):.0f} ms, max {delays[-1]:.0f} ms")
+
+
+def benchmark_hot_tier(args):
+    """Fest-day check-in rush on one event: every registration and check-in
+    written through vs. the event pinned in the hot tier, plus recovery of
+    a journal left by a crash"""
+    import hot_tier
+    from app import create_app
+
+    rush = max(args.repeat * 40, 2000)
+    window = 1.0
+    print_section(f"HOT TIER BENCHMARK ({rush:,} registrations + check-ins per event)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        cold_event, hot_event = [row[0] for row in conn.execute("SELECT id FROM events ORDER BY id LIMIT 2")]
+        conn.execute("UPDATE events SET max_capacity = max_capacity + ? WHERE id IN (?, ?)",
+                     (rush, cold_event, hot_event))
+        new_students = list(range(args.students + 1, args.students + 1 + rush))
+        conn.executemany(
+            "INSERT INTO students (id, name, email, college_id) VALUES (?, ?, ?, 1)",
+            ((i, f"Student {i}", f"student{i}@college1.edu") for i in new_students)
+        )
+        conn.commit()
+        conn.close()
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s")
+
+        database = os.path.join(directory, 'benchmark.db')
+        previous = {name: os.environ.get(name) for name in (hot_tier.HOT_EVENTS_ENV, hot_tier.HOT_TIER_WINDOW_ENV)}
+        os.environ[hot_tier.HOT_EVENTS_ENV] = str(hot_event)
+        os.environ[hot_tier.HOT_TIER_WINDOW_ENV] = str(window)
+        try:
+            app = create_app(database)
+        finally:
+            for name, value in previous.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+        client = app.test_client()
+        tier = app.extensions['hot_tier']
+
+        def rush_hour(event_id):
+            registrations = []
+            start = time.perf_counter()
+            for student_id in new_students:
+                response = client.post(f'/api/events/{event_id}/register', json={"student_id": student_id})
+                assert response.status_code == 201, response.get_json()
+                registrations.append(response.get_json()['registration_id'])
+            registered = time.perf_counter() - start
+            start = time.perf_counter()
+            for registration_id in registrations:
+                response = client.post(f'/api/registrations/{registration_id}/attendance', json={"attended": True})
+                assert response.status_code == 200, response.get_json()
+            return registered, time.perf_counter() - start
+
+        print("\nThroughput through the API (one client, sequential requests):")
+        for label, event_id in (("written through", cold_event), ("hot tier", hot_event)):
+            registered, checked_in = rush_hour(event_id)
+            print(f"  {label:<16} {rush / registered:8,.0f} registrations/s  {rush / checked_in:8,.0f} check-ins/s")
+
+        start = time.perf_counter()
+        tier.flush()
+        stats = tier.stats()
+        print(f"\nWrite-behind with a {window:.0f}s window: {stats['flushed_changes']:,} changes "
+              f"in {stats['flushes']:,} flushes, slowest {stats['max_flush_ms']:.0f} ms "
+              f"(final flush {(time.perf_counter() - start) * 1000:.0f} ms)")
+        check = sqlite3.connect(database)
+        written = check.execute("""
+            SELECT COUNT(*), SUM(a.attended) FROM registrations r
+            JOIN attendance a ON a.registration_id = r.id WHERE r.event_id = ?
+        """, (hot_event,)).fetchone()
+        assert written[0] >= rush and written[1] >= rush, written
+        print(f"  database holds {written[0]:,} registrations, {written[1]:,} check-ins for the pinned event")
+
+        # Crash: a tier that journaled a rush but never flushed it
+        crashed = hot_tier.HotTier(database, [cold_event], window,
+                                   path=os.path.join(directory, 'crash.journal'))
+        registrations = [row[0] for row in check.execute(
+            "SELECT id FROM registrations WHERE event_id = ? LIMIT ?", (cold_event, rush))]
+        for registration_id in registrations:
+            crashed.mark_attendance(registration_id, False)
+        crashed._journal.close()
+        start = time.perf_counter()
+        recovered = hot_tier.HotTier(database, [cold_event], window, path=crashed.path)
+        elapsed = time.perf_counter() - start
+        absent = check.execute(f"""
+            SELECT COUNT(*) FROM attendance WHERE attended = 0
+              AND registration_id IN ({','.join('?' * len(registrations))})
+        """, registrations).fetchone()[0]
+        assert recovered.recovered == len(registrations) and absent == len(registrations)
+        print(f"\nRecovery: {recovered.recovered:,} journaled check-ins replayed at startup "
+              f"in {elapsed * 1000:.0f} ms")
+        recovered.close()
+        check.close()
+        tier.close()
+
+
+def benchmark_lookup_cache(args):
+    """Validation lookups on the write and detail paths with and without the
+    lookup cache, and its hit rate under a size bound smaller than the
+    working set"""
+    from app import create_app
+    from lookup_cache import LookupCache
+
+    print_section(f"LOOKUP CACHE BENCHMARK ({args.registrations:,} registrations)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        conn.execute("UPDATE events SET max_capacity = max_capacity + ?", (4 * args.repeat,))
+        new_students = list(range(args.students + 1, args.students + 1 + 4 * args.repeat))
+        conn.executemany(
+            "INSERT INTO students (id, name, email, college_id) VALUES (?, ?, ?, 1)",
+            ((i, f"Student {i}", f"student{i}@college1.edu") for i in new_students)
+        )
+        conn.commit()
+        event_ids = [row[0] for row in conn.execute("SELECT id FROM events")]
+        registration_ids = [row[0] for row in conn.execute(
+            "SELECT id FROM registrations ORDER BY random() LIMIT 2000")]
+        conn.close()
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s")
+
+        database = os.path.join(directory, 'benchmark.db')
+        app = create_app(database)
+        client = app.test_client()
+        # A Fest day: most traffic on a few events and their check-in desks
+        hot_events = event_ids[:20]
+        hot_registrations = registration_ids[:200]
+        students = iter(new_students)
+
+        for label, max_entries in (("Uncached", 0), ("Cached", app.extensions['lookup_cache'].max_entries)):
+            cache = app.extensions['lookup_cache'] = LookupCache(max_entries)
+            rng = random.Random(1)
+            print(f"\n{label}, latency over {args.repeat} requests:")
+
+            def register():
+                response = client.post(f'/api/events/{rng.choice(hot_events)}/register',
+                                       json={"student_id": next(students)})
+                assert response.status_code == 201, response.get_json()
+
+            def check_in():
+                response = client.post(f'/api/registrations/{rng.choice(hot_registrations)}/attendance',
+                                       json={"attended": True})
+                assert response.status_code == 200, response.get_json()
+
+            def detail():
+                assert client.get(f'/api/events/{rng.choice(hot_events)}').status_code == 200
+
+            # One pass to fill the cache, as a running server would have
+            for _ in range(args.repeat):
+                register(), check_in(), detail()
+            print_timings("POST /api/events/<id>/register", time_calls(register, args.repeat))
+            print_timings("POST /api/registrations/<id>/attendance", time_calls(check_in, args.repeat))
+            print_timings("GET /api/events/<id>", time_calls(detail, args.repeat))
+            if max_entries:
+                stats = cache.stats()
+                print(f"  hit rate {stats['hit_rate']:.1%} over {stats['hits'] + stats['misses']:,} lookups")
+
+        # The lookup alone: a query on a pooled connection vs. a cache hit
+        reader = sqlite3.connect(database)
+        reader.row_factory = sqlite3.Row
+        cache = LookupCache()
+        print("\nOne event lookup:")
+        print_timings("SELECT ... WHERE id = ?",
+                      time_calls(lambda: LookupCache(0).get(reader, 'events', hot_events[0]), args.repeat * 20))
+        print_timings("cache hit", time_calls(lambda: cache.get(reader, 'events', hot_events[0]), args.repeat * 20))
+        reader.close()
+
+        # Bound below the working set: LRU keeps the hot records, the long
+        # tail of check-ins misses
+        lookups = 20 * args.repeat * 10
+        for max_entries in (100, 1000, 10_000):
+            cache = LookupCache(max_entries)
+            rng = random.Random(2)
+            reader = sqlite3.connect(database)
+            reader.row_factory = sqlite3.Row
+            for _ in range(lookups):
+                if rng.random() < 0.8:
+                    cache.get(reader, 'registrations', rng.choice(hot_registrations))
+                else:
+                    cache.get(reader, 'registrations', rng.choice(registration_ids))
+            reader.close()
+            stats = cache.stats()
+            print(f"\n{max_entries:>6,} entries: hit rate {stats['hit_rate']:.1%} over {lookups:,} check-in "
+                  f"lookups (80% on {len(hot_registrations)} registrations), {stats['evictions']:,} evictions")
+
+
+def benchmark_multiget(args):
+    """A student's "my events" page: one GET per event vs. the multi-get endpoints"""
+    from app import create_app
+
+    print_section(f"MULTI-GET BENCHMARK ({args.registrations:,} registrations)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        conn.close()
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s")
+
+        client = create_app(os.path.join(directory, 'benchmark.db')).test_client()
+        rng = random.Random(1)
+
+        def random_student():
+            return rng.randint(1, args.students)
+
+        def event_ids(student_id):
+            return [event['id'] for event in
+                    client.get(f'/api/students/{student_id}/events').get_json()['events']]
+
+        # Both ways must return the same events and counts
+        for _ in range(5):
+            student_id = random_student()
+            ids = event_ids(student_id)
+            one_by_one = [client.get(f'/api/events/{event_id}').get_json()['event'] for event_id in ids]
+            batched = client.get(f"/api/events?ids={','.join(map(str, ids))}").get_json()['events']
+            assert one_by_one == batched, student_id
+
+        per_student = count // args.students
+        print(f"\nLatency over {args.repeat} students ({per_student} events each):")
+
+        def n_calls():
+            for event_id in event_ids(random_student()):
+                client.get(f'/api/events/{event_id}')
+
+        print_timings(f"student events + {per_student} x GET /api/events/<id>",
+                      time_calls(n_calls, args.repeat))
+        print_timings("GET /api/events?ids=...", time_calls(
+            lambda: client.get(f"/api/events?ids={','.join(map(str, event_ids(random_student())))}"),
+            args.repeat))
+        print_timings("GET /api/students/<id>/events",
+                      time_calls(lambda: client.get(f'/api/students/{random_student()}/events'),
+                                 args.repeat))
+
+
+def benchmark_idempotency(args):
+    """Retried POSTs: first use of an Idempotency-Key vs. a replay, and the
+    memory an in-process store holds at its size bound"""
+    import tracemalloc
+    import uuid
+    from app import create_app
+    from idempotency import DEFAULT_MAX_ENTRIES, IdempotencyStore, request_fingerprint
+
+    print_section(f"IDEMPOTENCY BENCHMARK ({args.registrations:,} registrations)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        # Students with no registrations yet and room in every event, so
+        # every first request succeeds
+        conn.execute("UPDATE events SET max_capacity = max_capacity + ?", (4 * args.repeat,))
+        new_students = list(range(args.students + 1, args.students + 1 + 4 * args.repeat))
+        conn.executemany(
+            "INSERT INTO students (id, name, email, college_id) VALUES (?, ?, ?, 1)",
+            ((i, f"Student {i}", f"student{i}@college1.edu") for i in new_students)
+        )
+        conn.commit()
+        event_ids = [row[0] for row in conn.execute("SELECT id FROM events")]
+        conn.close()
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s")
+
+        database = os.path.join(directory, 'benchmark.db')
+        rng = random.Random(1)
+        students = iter(new_students)
+
+        for shared in (False, True):
+            client = create_app(database, shared_idempotency=shared).test_client()
+            print(f"\n{'Shared (SQLite)' if shared else 'In-memory'} store, latency over {args.repeat} requests:")
+            sent = []
+
+            def register(key=None):
+                path = f'/api/events/{rng.choice(event_ids)}/register'
+                body = {"student_id": next(students)}
+                headers = {'Idempotency-Key': key} if key else {}
+                response = client.post(path, json=body, headers=headers)
+                assert response.status_code == 201, response.get_json()
+                if key:
+                    sent.append((path, body, key, response.get_json()))
+                return response
+
+            def replay():
+                path, body, key, first = sent[rng.randrange(len(sent))]
+                response = client.post(path, json=body, headers={'Idempotency-Key': key})
+                assert response.headers.get('Idempotent-Replayed') == 'true'
+                assert response.status_code == 201 and response.get_json() == first
+
+            def retry_without_key():
+                path, body, _, _ = sent[rng.randrange(len(sent))]
+                client.post(path, json=body)
+
+            print_timings("register, no key", time_calls(register, args.repeat))
+            print_timings("register, first use of key",
+                          time_calls(lambda: register(str(uuid.uuid4())), args.repeat))
+            print_timings("register, replayed", time_calls(replay, args.repeat))
+            print_timings("register, retried without key (400)", time_calls(retry_without_key, args.repeat))
+
+        # Fill a store to twice its bound with registration-sized responses
+        body = json.dumps({"message": "Registration successful", "registration_id": 10_000_000}).encode()
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        store = IdempotencyStore()
+        for registration_id in range(2 * DEFAULT_MAX_ENTRIES):
+            key = str(uuid.uuid4())
+            fingerprint = request_fingerprint('POST', f'/api/events/{registration_id}/register', body)
+            store.begin(key, fingerprint)
+            store.complete(key, fingerprint, 201, body, 'application/json')
+        held = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        stats = store.stats()
+        print(f"\nIn-memory store after {2 * DEFAULT_MAX_ENTRIES:,} keys: {stats['entries']:,} kept "
+              f"(bound {stats['max_entries']:,}), {stats['evictions']:,} evicted")
+        print(f"  {held / 1e6:.1f} MB held, {held / stats['entries']:.0f} bytes per key "
+              f"({len(body)}-byte responses)")
+
+
+def benchmark_report_artifacts(args):
+    """Report endpoints computed live vs. served from published report files"""
+    import generate_reports
+    from app import create_app
+    from report_artifacts import ReportArtifacts, data_watermark, publish_manifest
+
+    print_section(f"REPORT ARTIFACTS BENCHMARK ({args.registrations:,} registrations)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        conn.close()
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s")
+
+        path = os.path.join(directory, 'benchmark.db')
+        reports_dir = os.path.join(directory, 'reports')
+        os.makedirs(reports_dir)
+        generate_reports.DATABASE = path
+        generate_reports.REPORTS_DIR = reports_dir
+        start = time.perf_counter()
+        conn = sqlite3.connect(path)
+        watermark = data_watermark(conn)
+        conn.close()
+        generate_reports.generate_event_popularity_report()
+        generate_reports.generate_student_participation_report()
+        publish_manifest(reports_dir, generate_reports.report_files(), watermark)
+        print(f"Published the two reports in {time.perf_counter() - start:.1f}s")
+
+        app = create_app(path)
+        client = app.test_client()
+        endpoints = ['/api/reports/event-popularity', '/api/reports/student-participation']
+        modes = [
+            ("live", None),
+            ("artifact, within bound", 3600),
+            # Past the bound the watermark is compared with the database
+            ("artifact, bound passed", 1e-9),
+        ]
+        live = {endpoint: client.get(endpoint).get_json() for endpoint in endpoints}
+        repeat = max(1, args.repeat // 5)
+        for endpoint in endpoints:
+            print(f"\nGET {endpoint}, {repeat} calls:")
+            for label, max_age in modes:
+                app.extensions['report_artifacts'] = ReportArtifacts(reports_dir, max_age)
+                response = client.get(endpoint)
+                expected = 'live' if max_age is None else 'artifact'
+                assert response.headers['X-Report-Source'] == expected, (endpoint, label)
+                assert response.get_json() == live[endpoint], (endpoint, label)
+                print_timings(label,
+                              time_calls(lambda: client.get(endpoint), repeat))
+
+
+def benchmark_archive(args):
+    """Hot-path latency before and after archiving past events, and check-in
+    latency while the archiver runs (chunked vs. one big transaction)"""
+    import threading
+    from archive import DEFAULT_CHUNK_ROWS, archive_events, archive_path, hot_path_timings, print_timings
+
+    print_section(f"ARCHIVE BENCHMARK ({args.registrations:,} registrations)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = create_benchmark_db(directory)
+        start = time.perf_counter()
+        count = populate_campus(conn, args.students, args.events, args.registrations)
+        # Spread the events over five years; four in five end up before the cutoff
+        conn.execute("UPDATE events SET event_date = date(event_date, '-' || (id % 5) || ' years')")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.commit()
+        hot_registrations = [row[0] for row in conn.execute("""
+            SELECT r.id FROM registrations r JOIN events e ON e.id = r.event_id
+            WHERE e.event_date >= '2025-01-01'
+        """)]
+        conn.close()
+        print(f"\nLoaded {args.students:,} students, {args.events:,} events, "
+              f"{count:,} registrations in {time.perf_counter() - start:.1f}s")
+
+        chunked = os.path.join(directory, 'benchmark.db')
+        single = os.path.join(directory, 'single.db')
+        with sqlite3.connect(chunked) as source, sqlite3.connect(single) as copy:
+            source.backup(copy)
+
+        def check_ins(path, stop, latencies):
+            # One check-in per transaction on events that stay live
+            writer = sqlite3.connect(path, timeout=60)
+            rng = random.Random(7)
+            while not stop.is_set():
+                start = time.perf_counter()
+                writer.execute("""
+                    INSERT INTO attendance (registration_id, attended) VALUES (?, 1)
+                    ON CONFLICT(registration_id) DO UPDATE SET
+                        attended = excluded.attended,
+                        marked_at = CASE WHEN attended IS excluded.attended
+                                         THEN marked_at ELSE CURRENT_TIMESTAMP END
+                """, (rng.choice(hot_registrations),))
+                writer.commit()
+                latencies.append((time.perf_counter() - start) * 1000)
+                time.sleep(0.001)
+            writer.close()
+
+        before = hot_path_timings(chunked)
+
+        print(f"\n{'archiver':<26} {'seconds':>8} {'longest tx':>11} {'writes':>7} "
+              f"{'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for label, path, chunk_rows in [(f'chunked ({DEFAULT_CHUNK_ROWS:,} rows)', chunked, DEFAULT_CHUNK_ROWS),
+                                        ('one transaction', single, 10**12)]:
+            stop = threading.Event()
+            latencies = []
+            writer = threading.Thread(target=check_ins, args=(path, stop, latencies))
+            writer.start()
+            summary = archive_events(path, '2025-01-01', archive_path(path), chunk_rows)
+            stop.set()
+            writer.join()
+            latencies.sort()
+            print(f"{label:<26} {summary['seconds']:>8.1f} {summary['max_chunk_ms']:>9.0f}ms "
+                  f"{len(latencies):>7,} {percentile(latencies, 0.50):>8.2f} "
+                  f"{percentile(latencies, 0.99):>8.2f} {latencies[-1]:>8.2f}")
+
+        moved = summary['moved']
+        print(f"\nArchived {moved['events']:,} events and {moved['registrations']:,} registrations")
+        print_timings(before, hot_path_timings(chunked))
+
+
+BENCHMARKS = {
+    'analytics': benchmark_analytics,
+    'archive': benchmark_archive,
+    'audience': benchmark_audience,
+    'changes': benchmark_changes,
+    'coattendance': benchmark_coattendance,
+    'engagement': benchmark_engagement,
+    'hot-tier': benchmark_hot_tier,
+    'idempotency': benchmark_idempotency,
+    'live': benchmark_live,
+    'lookup-cache': benchmark_lookup_cache,
+    'multiget': benchmark_multiget,
+    'report-artifacts': benchmark_report_artifacts,
+    'report-memory': benchmark_report_memory,
+    'report-writes': benchmark_report_writes,
+    'search': benchmark_search,
+    'snapshot': benchmark_snapshot,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run performance benchmarks")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--events', type=int, default=100_000,
+                        help="number of synthetic events")
+    parser.add_argument('--students', type=int, default=500_000,
+                        help="number of synthetic students")
+    parser.add_argument('--registrations', type=int, default=10_000_000,
+                        help="number of synthetic registrations")
+    parser.add_argument('--college-sql-limit', type=int, default=50_000,
+                        help="skip the SQL college statistics query above this many registrations")
+    parser.add_argument('--repeat', type=int, default=50,
+                        help="timed calls per measurement")
+    args = parser.parse_args()
+
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
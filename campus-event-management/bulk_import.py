@@ -0,0 +1,302 @@
+"""
+Bulk CSV import for Campus Event Management Platform
+Streams colleges, students or events from a CSV file into the database in
+batches: each batch is validated, checked against the database in bulk
+(existing emails, known colleges) and inserted with one executemany() in
+one transaction. Only one batch is held in memory, so file size does not
+matter.
+
+Usage: python bulk_import.py <colleges|students|events> FILE [--batch-size N] [--errors OUT.csv]
+
+CSV headers must name the columns, e.g. name,email,college_id for students.
+"""
+
+import argparse
+import csv
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+DATABASE = 'campus_events.db'
+
+DEFAULT_BATCH_SIZE = 5000
+# Per-row errors kept in the summary; the total is always counted
+MAX_REPORTED_ERRORS = 100
+# Bound on ? parameters in one IN (...) lookup
+LOOKUP_CHUNK = 500
+
+EVENT_TYPES = ('Workshop', 'Fest', 'Seminar', 'Hackathon')
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+class ImportRowError(ValueError):
+    """A CSV row that cannot be imported"""
+
+
+def _required(row, field):
+    value = (row.get(field) or '').strip()
+    if not value:
+        raise ImportRowError(f"Missing required field: {field}")
+    return value
+
+
+def _integer(row, field, default=None):
+    value = (row.get(field) or '').strip()
+    if not value:
+        if default is None:
+            raise ImportRowError(f"Missing required field: {field}")
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ImportRowError(f"{field} must be an integer, got {value!r}")
+    if number <= 0:
+        raise ImportRowError(f"{field} must be positive, got {number}")
+    return number
+
+
+def parse_college(row):
+    return (_required(row, 'name'), (row.get('location') or '').strip() or None)
+
+
+def parse_student(row):
+    email = _required(row, 'email')
+    if not EMAIL_PATTERN.match(email):
+        raise ImportRowError(f"Invalid email: {email!r}")
+    return (_required(row, 'name'), email, _integer(row, 'college_id'))
+
+
+def parse_event(row):
+    event_type = _required(row, 'event_type')
+    if event_type not in EVENT_TYPES:
+        raise ImportRowError(f"event_type must be one of {', '.join(EVENT_TYPES)}")
+    event_date = _required(row, 'event_date')
+    try:
+        datetime.fromisoformat(event_date)
+    except ValueError:
+        raise ImportRowError(f"event_date must be an ISO date, got {event_date!r}")
+    return (
+        _required(row, 'name'),
+        (row.get('description') or '').strip(),
+        event_type,
+        _integer(row, 'college_id'),
+        event_date,
+        _integer(row, 'max_capacity', default=100),
+    )
+
+
+# kind -> (required CSV columns, row parser, INSERT statement,
+#          index of college_id in the parsed tuple, index of email)
+IMPORTERS = {
+    'colleges': (
+        ['name'], parse_college,
+        "INSERT INTO colleges (name, location) VALUES (?, ?)",
+        None, None,
+    ),
+    'students': (
+        ['name', 'email', 'college_id'], parse_student,
+        "INSERT INTO students (name, email, college_id) VALUES (?, ?, ?)",
+        2, 1,
+    ),
+    'events': (
+        ['name', 'event_type', 'college_id', 'event_date'], parse_event,
+        """INSERT INTO events (name, description, event_type, college_id, event_date, max_capacity)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        3, None,
+    ),
+}
+
+
+def _existing(conn, query, values):
+    """Subset of values found by query (which has one IN (%s) placeholder)"""
+    found = set()
+    values = list(values)
+    for start in range(0, len(values), LOOKUP_CHUNK):
+        chunk = values[start:start + LOOKUP_CHUNK]
+        placeholders = ','.join('?' * len(chunk))
+        found.update(row[0] for row in conn.execute(query % placeholders, chunk))
+    return found
+
+
+class ImportResult:
+    """Running totals for one import"""
+
+    def __init__(self, kind, on_error=None):
+        self.kind = kind
+        self.rows_read = 0
+        self.rows_inserted = 0
+        self.error_count = 0
+        self.errors = []
+        self.on_error = on_error
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def reject(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+        if self.on_error:
+            self.on_error(line, message)
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+        return self
+
+    @property
+    def rows_per_second(self):
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "rows_read": self.rows_read,
+            "rows_inserted": self.rows_inserted,
+            "rows_rejected": self.error_count,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": sorted(self.errors, key=lambda error: error["line"]),
+            "errors_truncated": self.error_count > len(self.errors),
+        }
+
+
+def _insert_batch(conn, kind, batch, result):
+    """Validate one batch against the database and insert what survives"""
+    _, _, insert_sql, college_index, email_index = IMPORTERS[kind]
+
+    if college_index is not None:
+        known = _existing(conn, "SELECT id FROM colleges WHERE id IN (%s)",
+                          {values[college_index] for _, values in batch})
+        valid = []
+        for line, values in batch:
+            if values[college_index] in known:
+                valid.append((line, values))
+            else:
+                result.reject(line, f"College not found: {values[college_index]}")
+        batch = valid
+
+    if email_index is not None:
+        taken = _existing(conn, "SELECT email FROM students WHERE email IN (%s)",
+                          {values[email_index] for _, values in batch})
+        valid = []
+        for line, values in batch:
+            email = values[email_index]
+            if email in taken:
+                result.reject(line, f"Email already registered: {email}")
+            else:
+                # Later rows repeating an email in the same batch are rejected too
+                taken.add(email)
+                valid.append((line, values))
+        batch = valid
+
+    try:
+        with conn:
+            conn.executemany(insert_sql, [values for _, values in batch])
+        result.rows_inserted += len(batch)
+    except sqlite3.IntegrityError:
+        # A concurrent writer got in between validation and insert; fall back
+        # to row-at-a-time so only the conflicting rows are rejected
+        for line, values in batch:
+            try:
+                with conn:
+                    conn.execute(insert_sql, values)
+                result.rows_inserted += 1
+            except sqlite3.IntegrityError as e:
+                result.reject(line, str(e))
+
+
+def import_csv(conn, kind, csv_file, batch_size=DEFAULT_BATCH_SIZE, on_error=None, on_batch=None):
+    """Stream rows of kind from an open text file into the database
+
+    Raises ValueError when kind is unknown or the header cannot be read or
+    lacks required columns; row problems are collected in the returned
+    ImportResult. A malformed record (bad quoting, an oversized field,
+    invalid UTF-8) ends the import: the rows before it are still inserted
+    and the record is reported as the last error.
+    """
+    if kind not in IMPORTERS:
+        raise ValueError(f"Unknown import type: {kind}")
+    required_columns, parse_row, _, _, _ = IMPORTERS[kind]
+
+    reader = csv.DictReader(csv_file)
+    try:
+        fieldnames = reader.fieldnames or []
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed CSV: {e}")
+    missing = [column for column in required_columns if column not in fieldnames]
+    if missing:
+        raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+
+    result = ImportResult(kind, on_error)
+    batch = []
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            break
+        except (csv.Error, UnicodeDecodeError) as e:
+            # The reader cannot find the next record reliably after this
+            result.reject(reader.line_num, f"Malformed CSV, import stopped: {e}")
+            break
+        result.rows_read += 1
+        try:
+            batch.append((reader.line_num, parse_row(row)))
+        except ImportRowError as e:
+            result.reject(reader.line_num, str(e))
+        if len(batch) >= batch_size:
+            _insert_batch(conn, kind, batch, result)
+            batch = []
+            if on_batch:
+                on_batch(result)
+    if batch:
+        _insert_batch(conn, kind, batch, result)
+    return result.finish()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import colleges, students or events from CSV")
+    parser.add_argument('kind', choices=sorted(IMPORTERS))
+    parser.add_argument('file', help="CSV file with a header row ('-' for stdin)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--errors', metavar='OUT.csv', help="write every rejected row here")
+    args = parser.parse_args()
+
+    error_file = open(args.errors, 'w', newline='') if args.errors else None
+    error_writer = csv.writer(error_file) if error_file else None
+    if error_writer:
+        error_writer.writerow(['line', 'error'])
+
+    def report_error(line, message):
+        if error_writer:
+            error_writer.writerow([line, message])
+
+    def report_progress(result):
+        elapsed = time.perf_counter() - result.started
+        print(f"  {result.rows_read:,} rows read, {result.rows_inserted:,} inserted "
+              f"({result.rows_read / elapsed:,.0f} rows/s)")
+
+    csv_file = sys.stdin if args.file == '-' else open(args.file, newline='', encoding='utf-8')
+    conn = sqlite3.connect(DATABASE)
+    try:
+        result = import_csv(conn, args.kind, csv_file, args.batch_size,
+                            on_error=report_error, on_batch=report_progress)
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        conn.close()
+        if error_file:
+            error_file.close()
+
+    print(f"\n{'='*60}")
+    print(f" IMPORTED {args.kind.upper()}")
+    print(f"{'='*60}")
+    print(f"Rows read:     {result.rows_read:,}")
+    print(f"Rows inserted: {result.rows_inserted:,}")
+    print(f"Rows rejected: {result.error_count:,}")
+    print(f"Time:          {result.seconds:.2f}s ({result.rows_per_second:,.0f} rows/s)")
+    for error in result.errors[:10]:
+        print(f"  line {error['line']}: {error['error']}")
+    if result.error_count > 10:
+        print(f"  ... {result.error_count - 10:,} more" +
+              (f" (see {args.errors})" if args.errors else ""))
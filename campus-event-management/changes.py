@@ -0,0 +1,222 @@
+"""
+Change data capture for Campus Event Management Platform
+Triggers (installed by migrations.py) append a row to change_log for every
+insert and update of events, registrations, attendance and feedback, inside
+the transaction that makes the change: a change is in the log if and only
+if it committed. Each entry carries the row as it was written, so consumers
+(badge printing, the data warehouse) never read the tables themselves.
+
+The entry id is the cursor. Ids only grow and are never reused, and SQLite
+commits one writer at a time, so a consumer that asks for everything after
+the last cursor it processed sees every later change exactly once:
+
+    GET /api/changes?after=0&limit=1000
+    GET /api/changes?after=<next_cursor>&limit=1000    # ... and so on
+    GET /api/changes?after=latest                      # start from now
+
+Retention is compacted by maintenance.py (or `python changes.py compact`):
+
+    older than COMPACT_AFTER   only the latest entry per row is kept, so a
+                               consumer that fell behind catches up on final
+                               states without replaying every check-in toggle
+    older than RETAIN          entries are deleted; a cursor from before that
+                               gets 410 Gone and the consumer must resync
+
+Deletes are not captured: rows only leave the live tables when archive.py
+moves past events to the archive database.
+
+Usage: python changes.py tail --after 0
+       python changes.py compact [--compact-after 86400] [--retain 604800]
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+
+DATABASE = 'campus_events.db'
+
+DEFAULT_CHANGES_LIMIT = 1000
+MAX_CHANGES_LIMIT = 10_000
+COMPACT_AFTER_SECONDS = 24 * 60 * 60
+RETAIN_SECONDS = 7 * 24 * 60 * 60
+# Log entries examined per compaction statement, so writers never wait long
+COMPACT_CHUNK_IDS = 5000
+
+_EVENT_OF_REGISTRATION = "(SELECT event_id FROM registrations WHERE id = new.registration_id)"
+
+# table: (columns captured, SQL for the event the row belongs to)
+CAPTURED_TABLES = {
+    'events': (('id', 'name', 'description', 'event_type', 'college_id', 'event_date',
+                'max_capacity', 'created_at'), "new.id"),
+    'registrations': (('id', 'student_id', 'event_id', 'registered_at'), "new.event_id"),
+    'attendance': (('id', 'registration_id', 'attended', 'marked_at'), _EVENT_OF_REGISTRATION),
+    'feedback': (('id', 'registration_id', 'rating', 'comments', 'submitted_at'), _EVENT_OF_REGISTRATION),
+}
+
+
+def _capture(table, operation):
+    columns, event_sql = CAPTURED_TABLES[table]
+    data = ', '.join(f"'{column}', new.{column}" for column in columns)
+    return f"""
+    CREATE TRIGGER IF NOT EXISTS change_log_{table}_{operation} AFTER {operation.upper()} ON {table} BEGIN
+        INSERT INTO change_log (table_name, operation, row_id, event_id, data)
+        VALUES ('{table}', '{operation}', new.id, {event_sql}, json_object({data}));
+    END;"""
+
+
+CHANGE_LOG_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS change_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        operation TEXT NOT NULL CHECK (operation IN ('insert', 'update')),
+        row_id INTEGER NOT NULL,
+        event_id INTEGER,
+        data TEXT NOT NULL,
+        changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_change_log_row ON change_log(table_name, row_id);
+
+    -- How far compaction has got; cursors below expired_through are gone
+    CREATE TABLE IF NOT EXISTS change_log_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        compacted_through INTEGER NOT NULL DEFAULT 0,
+        expired_through INTEGER NOT NULL DEFAULT 0
+    );
+
+    INSERT OR IGNORE INTO change_log_state (id) VALUES (1);
+""" + ''.join(_capture(table, operation) for table in CAPTURED_TABLES for operation in ('insert', 'update'))
+
+
+def latest_cursor(conn):
+    """Cursor of the newest change, even if compaction removed it"""
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    return row[0] if row else 0
+
+
+def expired_through(conn):
+    """Cursors below this have lost changes to retention"""
+    return conn.execute("SELECT expired_through FROM change_log_state").fetchone()[0]
+
+
+def parse_tables(value):
+    """Table filter from a comma-separated list; ValueError for unknown names"""
+    tables = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = sorted(set(tables) - set(CAPTURED_TABLES))
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(unknown)}; choose from {', '.join(CAPTURED_TABLES)}")
+    return tables
+
+
+def read_changes(conn, after, limit=DEFAULT_CHANGES_LIMIT, tables=None):
+    """Up to limit changes after the cursor, oldest first
+
+    Returns (changes, next_cursor, has_more). next_cursor is the cursor of
+    the last change returned, or after itself when there was none.
+    """
+    sql = "SELECT id, table_name, operation, row_id, event_id, data, changed_at FROM change_log WHERE id > ?"
+    params = [after]
+    if tables:
+        sql += f" AND table_name IN ({','.join('?' * len(tables))})"
+        params.extend(tables)
+    sql += " ORDER BY id LIMIT ?"
+    params.append(limit + 1)
+    rows = conn.execute(sql, params).fetchall()
+
+    has_more = len(rows) > limit
+    changes = [
+        {
+            "cursor": change_id,
+            "table": table,
+            "operation": operation,
+            "row_id": row_id,
+            "event_id": event_id,
+            "data": json.loads(data),
+            "changed_at": changed_at
+        }
+        for change_id, table, operation, row_id, event_id, data, changed_at in rows[:limit]
+    ]
+    return changes, (changes[-1]["cursor"] if changes else after), has_more
+
+
+def _first_id_since(conn, seconds):
+    """Id of the oldest change newer than seconds ago (or one past the
+    newest change); scans only the entries older than that"""
+    row = conn.execute("""
+        SELECT id FROM change_log WHERE changed_at >= datetime('now', ?) ORDER BY id LIMIT 1
+    """, (f'-{int(seconds)} seconds',)).fetchone()
+    return row[0] if row else latest_cursor(conn) + 1
+
+
+def compact_change_log(conn, compact_after=COMPACT_AFTER_SECONDS, retain=RETAIN_SECONDS,
+                       deadline=None, chunk_ids=COMPACT_CHUNK_IDS):
+    """Expire entries older than retain and drop superseded entries older
+    than compact_after, a chunk of ids per statement
+
+    conn must be in autocommit mode (isolation_level=None) so each chunk
+    commits on its own. With a deadline (time.monotonic()), stops early and
+    picks up from there next time. Returns entries removed per step.
+    """
+    removed = {"expired": 0, "superseded": 0}
+    state = conn.execute("SELECT compacted_through, expired_through FROM change_log_state").fetchone()
+    compacted_through, expired = state
+
+    expire_before = _first_id_since(conn, retain)
+    while expired < expire_before - 1:
+        if deadline is not None and time.monotonic() >= deadline:
+            return removed
+        upper = min(expired + chunk_ids, expire_before - 1)
+        removed["expired"] += conn.execute(
+            "DELETE FROM change_log WHERE id > ? AND id <= ?", (expired, upper)).rowcount
+        conn.execute("UPDATE change_log_state SET expired_through = ?", (upper,))
+        expired = upper
+
+    compact_before = _first_id_since(conn, compact_after)
+    compacted_through = max(compacted_through, expired)
+    while compacted_through < compact_before - 1:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        upper = min(compacted_through + chunk_ids, compact_before - 1)
+        removed["superseded"] += conn.execute("""
+            DELETE FROM change_log WHERE id IN (
+                SELECT c.id FROM change_log c
+                WHERE c.id > ? AND c.id <= ?
+                  AND EXISTS (SELECT 1 FROM change_log later
+                              WHERE later.table_name = c.table_name AND later.row_id = c.row_id
+                                AND later.id > c.id)
+            )
+        """, (compacted_through, upper)).rowcount
+        conn.execute("UPDATE change_log_state SET compacted_through = ?", (upper,))
+        compacted_through = upper
+    return removed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read or compact the change log")
+    parser.add_argument('command', choices=['tail', 'compact'])
+    parser.add_argument('--database', default=DATABASE)
+    parser.add_argument('--after', type=int, default=0, help="tail: cursor to start after")
+    parser.add_argument('--compact-after', type=int, default=COMPACT_AFTER_SECONDS, metavar='SECONDS')
+    parser.add_argument('--retain', type=int, default=RETAIN_SECONDS, metavar='SECONDS')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.database, isolation_level=None)
+    if args.command == 'compact':
+        before = conn.execute("SELECT COUNT(*) FROM change_log").fetchone()[0]
+        removed = compact_change_log(conn, args.compact_after, args.retain)
+        after = conn.execute("SELECT COUNT(*) FROM change_log").fetchone()[0]
+        print(f"Expired {removed['expired']:,} and compacted away {removed['superseded']:,} "
+              f"entries; {after:,} of {before:,} remain")
+    else:
+        cursor = args.after
+        try:
+            while True:
+                changes, cursor, has_more = read_changes(conn, cursor)
+                for change in changes:
+                    print(json.dumps(change), flush=True)
+                if not has_more:
+                    time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    conn.close()
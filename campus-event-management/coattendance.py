@@ -0,0 +1,206 @@
+"""
+Co-attendance index for Campus Event Management Platform
+Sparse event x event counts of students who attended both events, stored
+in both directions so an event's neighbours are one index range. Triggers
+(installed by migrations.py) adjust the counts when a check-in is marked or
+undone; the cost of a write is proportional to the number of events the
+student attended, not to the size of the tables.
+
+Usage: python coattendance.py backfill    # rebuild the index from existing rows
+"""
+
+import argparse
+import sqlite3
+from datetime import date
+
+DATABASE = 'campus_events.db'
+
+DEFAULT_RELATED_LIMIT = 10
+MAX_RELATED_LIMIT = 50
+# Neighbours read per attended event when building recommendations
+NEIGHBOURS_PER_EVENT = 50
+
+
+def _adjust(registration_sql, delta):
+    """SQL adding delta to every pair of this registration's event and the
+    other events its student attended"""
+    pairs = f"""
+        FROM registrations r
+        JOIN registrations o ON o.student_id = r.student_id AND o.event_id != r.event_id
+        JOIN attendance oa ON oa.registration_id = o.id AND oa.attended = 1
+        WHERE r.id = {registration_sql}"""
+    statements = []
+    for event_sql, other_sql in [('r.event_id', 'o.event_id'), ('o.event_id', 'r.event_id')]:
+        statements.append(f"""
+            INSERT INTO event_coattendance (event_id, other_event_id, students)
+            SELECT {event_sql}, {other_sql}, {delta}
+            {pairs}
+            ON CONFLICT (event_id, other_event_id) DO UPDATE SET
+                students = students + excluded.students;""")
+    return '\n'.join(statements)
+
+
+COATTENDANCE_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS event_coattendance (
+        event_id INTEGER NOT NULL,
+        other_event_id INTEGER NOT NULL,
+        students INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (event_id, other_event_id)
+    ) WITHOUT ROWID;
+
+    CREATE INDEX IF NOT EXISTS idx_event_coattendance_rank
+        ON event_coattendance (event_id, students DESC, other_event_id);
+
+    CREATE TRIGGER IF NOT EXISTS event_coattendance_check_in AFTER INSERT ON attendance
+    WHEN new.attended = 1 BEGIN
+        {_adjust('new.registration_id', 1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_coattendance_check_in_update AFTER UPDATE OF attended ON attendance
+    WHEN new.attended = 1 AND old.attended IS NOT 1 BEGIN
+        {_adjust('new.registration_id', 1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_coattendance_check_in_undo AFTER UPDATE OF attended ON attendance
+    WHEN old.attended = 1 AND new.attended IS NOT 1 BEGIN
+        {_adjust('old.registration_id', -1)}
+        DELETE FROM event_coattendance
+        WHERE students <= 0
+          AND event_id IN (SELECT event_id FROM registrations WHERE student_id =
+                           (SELECT student_id FROM registrations WHERE id = old.registration_id));
+    END;
+"""
+
+BACKFILL_SQL = """
+    DELETE FROM event_coattendance;
+
+    -- Attended (student, event) pairs, clustered by student for the self-join
+    DROP TABLE IF EXISTS temp.attended_events;
+    CREATE TEMP TABLE attended_events AS
+        SELECT r.student_id, r.event_id
+        FROM registrations r
+        JOIN attendance a ON a.registration_id = r.id AND a.attended = 1;
+    CREATE INDEX temp.idx_attended_events_student ON attended_events (student_id, event_id);
+
+    INSERT INTO event_coattendance (event_id, other_event_id, students)
+        SELECT x.event_id, y.event_id, COUNT(*)
+        FROM attended_events x
+        JOIN attended_events y ON y.student_id = x.student_id AND y.event_id != x.event_id
+        GROUP BY x.event_id, y.event_id;
+
+    DROP TABLE temp.attended_events;
+"""
+
+
+def backfill_coattendance(conn):
+    """Rebuild the whole index from the registrations and attendance tables"""
+    conn.executescript(f"BEGIN;\n{BACKFILL_SQL}\nCOMMIT;")
+
+
+def _event_attendees(conn, event_id):
+    return conn.execute("""
+        SELECT COUNT(*) FROM registrations r
+        JOIN attendance a ON a.registration_id = r.id AND a.attended = 1
+        WHERE r.event_id = ?
+    """, (event_id,)).fetchone()[0]
+
+
+def related_events(conn, event_id, limit=DEFAULT_RELATED_LIMIT):
+    """Events most often attended by this event's attendees
+
+    share_of_attendees is the percentage of this event's attendees who also
+    attended the related event.
+    """
+    attendees = _event_attendees(conn, event_id)
+    rows = conn.execute("""
+        SELECT e.*, c.name as college_name, ec.students as shared_attendees
+        FROM event_coattendance ec
+        JOIN events e ON e.id = ec.other_event_id
+        JOIN colleges c ON e.college_id = c.id
+        WHERE ec.event_id = ?
+        ORDER BY ec.students DESC, ec.other_event_id
+        LIMIT ?
+    """, (event_id, limit)).fetchall()
+
+    related = []
+    for row in rows:
+        row_dict = dict(row)
+        row_dict['share_of_attendees'] = (
+            round(row_dict['shared_attendees'] * 100.0 / attendees, 2) if attendees else 0
+        )
+        related.append(row_dict)
+    return related
+
+
+def recommend_events(conn, student_id, limit=DEFAULT_RELATED_LIMIT, upcoming=False):
+    """Events co-attended with the events this student attended
+
+    Each candidate scores the sum of its co-attendance counts with the
+    student's attended events; only the top NEIGHBOURS_PER_EVENT neighbours
+    of each attended event are considered, so the cost is bounded by the
+    student's history. Events the student registered for are excluded, and
+    upcoming=True drops events dated before today.
+    """
+    cursor = conn.cursor()
+    attended = [row[0] for row in cursor.execute("""
+        SELECT r.event_id FROM registrations r
+        JOIN attendance a ON a.registration_id = r.id AND a.attended = 1
+        WHERE r.student_id = ?
+    """, (student_id,))]
+    registered = {row[0] for row in cursor.execute(
+        "SELECT event_id FROM registrations WHERE student_id = ?", (student_id,))}
+
+    scores = {}
+    reasons = {}
+    for event_id in attended:
+        for other_event_id, students in cursor.execute("""
+            SELECT other_event_id, students FROM event_coattendance
+            WHERE event_id = ?
+            ORDER BY students DESC, other_event_id
+            LIMIT ?
+        """, (event_id, NEIGHBOURS_PER_EVENT)):
+            if other_event_id in registered:
+                continue
+            scores[other_event_id] = scores.get(other_event_id, 0) + students
+            reasons.setdefault(other_event_id, []).append((students, event_id))
+
+    if not scores:
+        return []
+
+    # Rank candidates, then fetch event details for as many as needed
+    ranked = sorted(scores, key=lambda candidate: (-scores[candidate], candidate))
+    recommendations = []
+    today = date.today().isoformat()
+    for start in range(0, len(ranked), 200):
+        chunk = ranked[start:start + 200]
+        placeholders = ','.join('?' * len(chunk))
+        events = {row['id']: row for row in cursor.execute(f"""
+            SELECT e.*, c.name as college_name
+            FROM events e JOIN colleges c ON e.college_id = c.id
+            WHERE e.id IN ({placeholders})
+        """, chunk)}
+        for event_id in chunk:
+            event = events.get(event_id)
+            if event is None or (upcoming and event['event_date'] < today):
+                continue
+            row_dict = dict(event)
+            row_dict['score'] = scores[event_id]
+            row_dict['because_you_attended'] = [
+                attended_id for _, attended_id in sorted(reasons[event_id], reverse=True)[:3]
+            ]
+            recommendations.append(row_dict)
+            if len(recommendations) >= limit:
+                return recommendations
+    return recommendations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the event co-attendance index")
+    parser.add_argument('command', choices=['backfill'])
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DATABASE)
+    backfill_coattendance(conn)
+    pairs = conn.execute("SELECT COUNT(*) FROM event_coattendance").fetchone()[0]
+    conn.close()
+    print(f"Rebuilt co-attendance index: {pairs} event pairs")
@@ -0,0 +1,365 @@
+"""
+Unique student engagement for Campus Event Management Platform
+Counts the distinct students who registered for (or attended) events, per
+hosting college, per event type and per month, for dashboards.
+
+Exact counts need COUNT(DISTINCT student_id) over every registration. The
+approximate counts come from HyperLogLog sketches kept in memory, one per
+(college, month) and one per (event type, month) for each activity, loaded
+from the tables on first use and caught up with new registrations and
+check-ins before each query. Sketches merge without losing accuracy, so any
+range of months, all colleges or all types is answered by merging cells.
+
+Error bound: with 2^12 registers per sketch the relative standard error is
+1.04 / sqrt(4096) = 1.6%. About 95% of estimates fall within 3.3% of the
+exact count and 99.7% within 4.9%; counts below a few hundred are
+practically exact. A sketch uses 4 KB however many students it counts.
+
+Usage: python engagement.py [--by college|event_type|month] [--activity attended]
+       python engagement.py --check    # compare every estimate with the exact count
+"""
+
+import argparse
+import math
+import sqlite3
+import threading
+import time
+
+from changes import expired_through, latest_cursor
+
+DATABASE = 'campus_events.db'
+
+PRECISION = 12
+REGISTERS = 1 << PRECISION
+STANDARD_ERROR = 1.04 / math.sqrt(REGISTERS)
+# Largest register value: leading zeros of the remaining hash bits, plus one
+MAX_RANK = 64 - PRECISION + 1
+
+ACTIVITIES = ('registered', 'attended')
+GROUPINGS = ('college', 'event_type', 'month')
+# The student ids come from one query; the rows are read in chunks
+FETCH_CHUNK = 10_000
+# Registrations can be deleted (archived) and check-ins cleared, which a
+# sketch cannot forget, so the sketches are reloaded this often
+REBUILD_SECONDS = 900
+
+_MASK64 = (1 << 64) - 1
+_RANK_BITS = 64 - PRECISION
+# 0x80 in every register: sign bits for the byte-wise maximum below
+_HIGH_BITS = int.from_bytes(b'\x80' * REGISTERS, 'little')
+
+
+def _hash64(value):
+    """splitmix64 finalizer: a well-mixed 64-bit hash of an integer id,
+    the same in every process"""
+    z = (value + 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def _register_max(a, b):
+    """Byte-wise maximum of two register arrays held as integers
+
+    Registers never exceed 127, so (a | 0x80..) - b cannot borrow across
+    bytes and its 0x80 bits mark the registers where a >= b.
+    """
+    a_wins = ((a | _HIGH_BITS) - b) & _HIGH_BITS
+    mask = (a_wins >> 7) * 0xFF
+    return (a & mask) | (b & ~mask)
+
+
+def _sigma(x):
+    if x == 1:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x):
+    if x == 0 or x == 1:
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+class HyperLogLog:
+    """Distinct-count sketch of integer ids"""
+
+    __slots__ = ('registers',)
+
+    def __init__(self, registers=None):
+        self.registers = bytearray(REGISTERS) if registers is None else registers
+
+    def add(self, value):
+        self.add_hash(_hash64(value))
+
+    def add_hash(self, hashed):
+        index = hashed >> _RANK_BITS
+        rank = _RANK_BITS - (hashed & ((1 << _RANK_BITS) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    @classmethod
+    def merged(cls, sketches):
+        """One sketch counting everything any of sketches counts"""
+        combined = 0
+        for sketch in sketches:
+            combined = _register_max(combined, int.from_bytes(sketch.registers, 'little'))
+        return cls(bytearray(combined.to_bytes(REGISTERS, 'little')))
+
+    def __or__(self, other):
+        return HyperLogLog.merged((self, other))
+
+    def count(self):
+        """Estimated number of distinct ids added
+
+        Ertl's improved estimator (2017): unbiased from empty sketches up to
+        billions of ids without the empirical bias tables of HyperLogLog++.
+        """
+        m = REGISTERS
+        histogram = [self.registers.count(rank) for rank in range(MAX_RANK + 1)]
+        z = m * _tau(1 - histogram[MAX_RANK] / m)
+        for rank in range(MAX_RANK - 1, 0, -1):
+            z = 0.5 * (z + histogram[rank])
+        z += m * _sigma(histogram[0] / m)
+        return round(m * m / (2 * math.log(2)) / z) if z != math.inf else 0
+
+
+class EngagementSketches:
+    """HyperLogLog sketches of registering and attending students, per
+    (college, month) and per (event type, month)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.built_at = None
+        # (activity, grouping, key, month) -> HyperLogLog, where grouping is
+        # 'college' or 'event_type'
+        self.sketches = {}
+        # change_log cursor the sketches are current to (see changes.py)
+        self._last_change = 0
+
+    def _rows(self, conn, query, params=()):
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(FETCH_CHUNK)
+            if not rows:
+                break
+            yield from rows
+
+    def _add(self, activity, rows):
+        """Add (student_id, college_id, event_type, month) rows"""
+        sketches = self.sketches
+        for student_id, college_id, event_type, month in rows:
+            hashed = _hash64(student_id)
+            for key in ((activity, 'college', college_id, month),
+                        (activity, 'event_type', event_type, month)):
+                sketch = sketches.get(key)
+                if sketch is None:
+                    sketch = sketches[key] = HyperLogLog()
+                sketch.add_hash(hashed)
+
+    def build(self, conn):
+        """Load every sketch from the tables"""
+        with self._lock:
+            # High-water marks first: rows written while loading are added
+            # again by the next refresh, which a sketch ignores
+            self._last_change = latest_cursor(conn)
+            self.sketches = {}
+            self._add('registered', self._rows(conn, """
+                SELECT r.student_id, e.college_id, e.event_type, substr(r.registered_at, 1, 7)
+                FROM registrations r JOIN events e ON e.id = r.event_id
+            """))
+            self._add('attended', self._rows(conn, """
+                SELECT r.student_id, e.college_id, e.event_type, substr(a.marked_at, 1, 7)
+                FROM attendance a
+                JOIN registrations r ON r.id = a.registration_id
+                JOIN events e ON e.id = r.event_id
+                WHERE a.attended = 1
+            """))
+            self.built_at = time.monotonic()
+
+    def refresh(self, conn):
+        """Add registrations and check-ins made since the last build or refresh"""
+        if (self.built_at is None or time.monotonic() - self.built_at > REBUILD_SECONDS
+                or expired_through(conn) > self._last_change):
+            self.build(conn)
+            return
+
+        # Follow the change log rather than registration ids or check-in
+        # times: its cursor grows in commit order, while rows written behind
+        # by the hot tier carry older ids and timestamps. A row changed
+        # twice is read twice; adding a student twice changes nothing.
+        with self._lock:
+            cursor = latest_cursor(conn)
+            if cursor == self._last_change:
+                return
+            window = (self._last_change, cursor)
+            self._add('registered', conn.execute("""
+                SELECT r.student_id, e.college_id, e.event_type, substr(r.registered_at, 1, 7)
+                FROM change_log c
+                JOIN registrations r ON r.id = c.row_id
+                JOIN events e ON e.id = r.event_id
+                WHERE c.id > ? AND c.id <= ? AND c.table_name = 'registrations'
+            """, window).fetchall())
+            self._add('attended', conn.execute("""
+                SELECT r.student_id, e.college_id, e.event_type, substr(a.marked_at, 1, 7)
+                FROM change_log c
+                JOIN attendance a ON a.id = c.row_id
+                JOIN registrations r ON r.id = a.registration_id
+                JOIN events e ON e.id = r.event_id
+                WHERE c.id > ? AND c.id <= ? AND c.table_name = 'attendance' AND a.attended = 1
+            """, window).fetchall())
+            self._last_change = cursor
+
+    def estimate(self, activity, by, college_id=None, event_type=None, months=(None, None)):
+        """({group: estimated unique students}, estimated total)
+
+        The total merges every selected sketch, so a student active in
+        several groups is counted once.
+        """
+        family = _family(by, college_id, event_type)
+        wanted = college_id if family == 'college' else event_type
+        first, last = months
+        groups = {}
+        with self._lock:
+            for (cell_activity, grouping, key, month), sketch in self.sketches.items():
+                if cell_activity != activity or grouping != family:
+                    continue
+                if wanted is not None and key != wanted:
+                    continue
+                if (first and (month is None or month < first)) or (last and (month is None or month > last)):
+                    continue
+                groups.setdefault(month if by == 'month' else key, []).append(sketch)
+            sketches = [sketch for cells in groups.values() for sketch in cells]
+        counts = {group: HyperLogLog.merged(cells).count() for group, cells in groups.items()}
+        return counts, HyperLogLog.merged(sketches).count()
+
+    def nbytes(self):
+        return len(self.sketches) * REGISTERS
+
+
+def _family(by, college_id, event_type):
+    """Which sketches answer a query: per-college or per-type ones
+
+    Raises ValueError for combinations the sketches cannot answer.
+    """
+    if by not in GROUPINGS:
+        raise ValueError(f"by must be one of {', '.join(GROUPINGS)}")
+    if college_id is not None and event_type is not None:
+        raise ValueError("approximate counts filter by college or by event type, not both")
+    if by == 'college':
+        if event_type is not None:
+            raise ValueError("approximate counts per college cannot filter by event type")
+        return 'college'
+    if by == 'event_type':
+        if college_id is not None:
+            raise ValueError("approximate counts per event type cannot filter by college")
+        return 'event_type'
+    return 'college' if college_id is not None else 'event_type'
+
+
+def exact_counts(conn, activity, by, college_id=None, event_type=None, months=(None, None)):
+    """({group: unique students}, total) with COUNT(DISTINCT ...)"""
+    if by not in GROUPINGS:
+        raise ValueError(f"by must be one of {', '.join(GROUPINGS)}")
+    if activity == 'attended':
+        joins = "JOIN attendance a ON a.registration_id = r.id AND a.attended = 1"
+        month = "substr(a.marked_at, 1, 7)"
+    else:
+        joins = ""
+        month = "substr(r.registered_at, 1, 7)"
+    group = {'college': "e.college_id", 'event_type': "e.event_type", 'month': month}[by]
+
+    query = f"""
+        FROM registrations r
+        JOIN events e ON e.id = r.event_id
+        {joins}
+        WHERE 1=1
+    """
+    params = []
+    if college_id is not None:
+        query += " AND e.college_id = ?"
+        params.append(college_id)
+    if event_type is not None:
+        query += " AND e.event_type = ?"
+        params.append(event_type)
+    if months[0]:
+        query += f" AND {month} >= ?"
+        params.append(months[0])
+    if months[1]:
+        query += f" AND {month} <= ?"
+        params.append(months[1])
+
+    counts = dict(conn.execute(
+        f"SELECT {group}, COUNT(DISTINCT r.student_id) {query} GROUP BY 1", params).fetchall())
+    total = conn.execute(f"SELECT COUNT(DISTINCT r.student_id) {query}", params).fetchone()[0]
+    return counts, total
+
+
+def sorted_groups(counts):
+    """Group keys in order, rows with no month last"""
+    return sorted(counts, key=lambda group: (group is None, group if group is not None else 0))
+
+
+def relative_errors(exact, approximate):
+    """Relative error of each estimate against its exact count"""
+    return {group: abs(approximate.get(group, 0) - count) / count
+            for group, count in exact.items() if count}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Unique students engaged, exact and approximate")
+    parser.add_argument('--by', choices=GROUPINGS, default='college')
+    parser.add_argument('--activity', choices=ACTIVITIES, default='registered')
+    parser.add_argument('--database', default=DATABASE)
+    parser.add_argument('--check', action='store_true',
+                        help="compare every grouping and activity with the exact counts")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.database)
+    sketches = EngagementSketches()
+    start = time.perf_counter()
+    sketches.build(conn)
+    print(f"Built {len(sketches.sketches):,} sketches ({sketches.nbytes() / 1e6:.1f} MB) "
+          f"in {time.perf_counter() - start:.2f}s; standard error {STANDARD_ERROR:.2%}")
+
+    if not args.check:
+        counts, total = sketches.estimate(args.activity, args.by)
+        exact, exact_total = exact_counts(conn, args.activity, args.by)
+        print(f"\n{args.by:<12} {'approximate':>12} {'exact':>10}")
+        for group in sorted_groups(exact):
+            print(f"{str(group):<12} {counts.get(group, 0):>12,} {exact[group]:>10,}")
+        print(f"{'all':<12} {total:>12,} {exact_total:>10,}")
+        raise SystemExit(0)
+
+    # Estimates beyond four standard errors would point at a broken sketch
+    failures = 0
+    for activity in ACTIVITIES:
+        for by in GROUPINGS:
+            counts, total = sketches.estimate(activity, by)
+            exact, exact_total = exact_counts(conn, activity, by)
+            errors = relative_errors(exact, counts)
+            errors['all'] = abs(total - exact_total) / exact_total if exact_total else 0
+            worst = max(errors.values(), default=0)
+            within = sum(error <= 3 * STANDARD_ERROR for error in errors.values())
+            failed = worst > 4 * STANDARD_ERROR
+            failures += failed
+            print(f"{activity:<10} by {by:<10} {len(errors):>5} counts, worst error {worst:6.2%}, "
+                  f"{within}/{len(errors)} within 3 standard errors{'  FAILED' if failed else ''}")
+    conn.close()
+    raise SystemExit(1 if failures else 0)
@@ -0,0 +1,108 @@
+"""
+Set-based event lookups for Campus Event Management Platform
+Fetch many events, or all of a student's events, with their registration
+counts (and the student's attendance and feedback) in one query each,
+instead of one GET /api/events/<id> per event.
+"""
+
+MAX_IDS = 200
+
+EVENT_COLUMNS = "e.*, c.name as college_name, COALESCE(rc.registration_count, 0) as registration_count"
+
+# The student's registration, check-in and feedback for each event
+STUDENT_COLUMNS = """
+    r.id as registration_id, r.registered_at,
+    a.attended, a.marked_at,
+    f.rating as feedback_rating, f.comments as feedback_comments,
+    f.submitted_at as feedback_submitted_at"""
+
+STUDENT_JOINS = """
+    LEFT JOIN attendance a ON a.registration_id = r.id
+    LEFT JOIN feedback f ON f.registration_id = r.id"""
+
+
+def _registration_counts(event_filter):
+    """Derived table of registration counts, restricted to the events wanted"""
+    return f"""
+        LEFT JOIN (
+            SELECT event_id, COUNT(*) as registration_count
+            FROM registrations
+            WHERE event_id IN ({event_filter})
+            GROUP BY event_id
+        ) rc ON rc.event_id = e.id"""
+
+
+def parse_ids(value):
+    """Parse '1,2,3' into a list of unique ids in order
+
+    Raises ValueError on anything else, or on more than MAX_IDS ids.
+    """
+    ids = []
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdigit():
+            raise ValueError(f"ids must be comma-separated integers, got {part!r}")
+        event_id = int(part)
+        if event_id not in ids:
+            ids.append(event_id)
+    if not ids:
+        raise ValueError("ids must list at least one event id")
+    if len(ids) > MAX_IDS:
+        raise ValueError(f"at most {MAX_IDS} ids per request")
+    return ids
+
+
+def _row_dict(row):
+    row_dict = dict(row)
+    if 'attended' in row_dict and row_dict['attended'] is not None:
+        row_dict['attended'] = bool(row_dict['attended'])
+    return row_dict
+
+
+def events_by_ids(conn, event_ids, student_id=None):
+    """Events with registration counts, in the order of event_ids
+
+    With student_id, each event also carries that student's registration,
+    attendance and feedback (None where the student did not register).
+    Returns (events, missing_ids).
+    """
+    placeholders = ','.join('?' * len(event_ids))
+    columns = EVENT_COLUMNS
+    joins = _registration_counts(placeholders)
+    params = list(event_ids)
+    if student_id is not None:
+        columns += ',' + STUDENT_COLUMNS
+        joins += "\nLEFT JOIN registrations r ON r.event_id = e.id AND r.student_id = ?" + STUDENT_JOINS
+        params.append(student_id)
+    params.extend(event_ids)
+
+    rows = conn.execute(f"""
+        SELECT {columns}
+        FROM events e
+        JOIN colleges c ON e.college_id = c.id
+        {joins}
+        WHERE e.id IN ({placeholders})
+    """, params).fetchall()
+
+    found = {row['id']: _row_dict(row) for row in rows}
+    events = [found[event_id] for event_id in event_ids if event_id in found]
+    missing = [event_id for event_id in event_ids if event_id not in found]
+    return events, missing
+
+
+def student_events(conn, student_id):
+    """Every event the student registered for, newest first, with
+    registration counts and the student's attendance and feedback"""
+    rows = conn.execute(f"""
+        SELECT {EVENT_COLUMNS}, {STUDENT_COLUMNS}
+        FROM registrations r
+        JOIN events e ON e.id = r.event_id
+        JOIN colleges c ON e.college_id = c.id
+        {_registration_counts("SELECT event_id FROM registrations WHERE student_id = ?")}
+        {STUDENT_JOINS}
+        WHERE r.student_id = ?
+        ORDER BY e.event_date DESC, e.id
+    """, (student_id, student_id)).fetchall()
+    return [_row_dict(row) for row in rows]
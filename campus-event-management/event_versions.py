@@ -0,0 +1,172 @@
+"""
+Event version stamps for Campus Event Management Platform
+Every event has a version number and a last-modified time, bumped by
+triggers (installed by migrations.py) whenever the event, its college's
+name, its registrations, attendance or feedback change. The row with
+event_id = CATALOG tracks the event listing itself (events created, edited
+or deleted, colleges renamed).
+
+app.py turns the stamps into ETag headers, so a client polling an unchanged
+event gets 304 Not Modified after a single primary key lookup instead of the
+detail queries. The last-modified time is not sent: at one-second resolution
+it cannot tell two writes in the same second apart.
+
+Usage: python event_versions.py backfill    # stamp events loaded without the triggers
+"""
+
+import argparse
+import hashlib
+import sqlite3
+from datetime import datetime, timezone
+
+DATABASE = 'campus_events.db'
+
+# Event ids start at 1, so 0 is free for the listing's own version
+CATALOG = 0
+
+
+def _bump(event_sql):
+    """SQL bumping the version of the event(s) selected by event_sql"""
+    return f"""
+        INSERT INTO event_versions (event_id, version, modified_at)
+        {event_sql}
+        ON CONFLICT (event_id) DO UPDATE SET
+            version = version + 1,
+            modified_at = excluded.modified_at;"""
+
+
+def _bump_registration(registration_sql):
+    return _bump(f"SELECT event_id, 1, CURRENT_TIMESTAMP FROM registrations WHERE id = {registration_sql}")
+
+
+BUMP_CATALOG = _bump(f"SELECT {CATALOG}, 1, CURRENT_TIMESTAMP WHERE true")
+
+EVENT_VERSIONS_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS event_versions (
+        event_id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 1,
+        modified_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TRIGGER IF NOT EXISTS event_versions_event_insert AFTER INSERT ON events BEGIN
+        {_bump("SELECT new.id, 1, CURRENT_TIMESTAMP WHERE true")}
+        {BUMP_CATALOG}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_versions_event_update AFTER UPDATE ON events BEGIN
+        {_bump("SELECT new.id, 1, CURRENT_TIMESTAMP WHERE true")}
+        {BUMP_CATALOG}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_versions_event_delete AFTER DELETE ON events BEGIN
+        DELETE FROM event_versions WHERE event_id = old.id;
+        {BUMP_CATALOG}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_versions_college_rename AFTER UPDATE OF name ON colleges BEGIN
+        {_bump("SELECT id, 1, CURRENT_TIMESTAMP FROM events WHERE college_id = new.id")}
+        {BUMP_CATALOG}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_versions_registration AFTER INSERT ON registrations BEGIN
+        {_bump_registration('new.id')}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_versions_registration_delete AFTER DELETE ON registrations BEGIN
+        {_bump("SELECT old.event_id, 1, CURRENT_TIMESTAMP WHERE true")}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_versions_attendance AFTER INSERT ON attendance BEGIN
+        {_bump_registration('new.registration_id')}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_versions_attendance_update AFTER UPDATE ON attendance BEGIN
+        {_bump_registration('new.registration_id')}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_versions_feedback AFTER INSERT ON feedback BEGIN
+        {_bump_registration('new.registration_id')}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_versions_feedback_update AFTER UPDATE ON feedback BEGIN
+        {_bump_registration('new.registration_id')}
+    END;
+"""
+
+# Bumps every stamp, so clients holding old ETags refetch after a reload
+BACKFILL_SQL = f"""
+    DELETE FROM event_versions
+    WHERE event_id != {CATALOG} AND event_id NOT IN (SELECT id FROM events);
+    {_bump("SELECT id, 1, CURRENT_TIMESTAMP FROM events WHERE true")}
+    {BUMP_CATALOG}
+"""
+
+
+def backfill_event_versions(conn):
+    """Stamp every event, bumping the versions of those already stamped"""
+    conn.executescript(f"BEGIN;\n{BACKFILL_SQL}\nCOMMIT;")
+
+
+def _stamp(row, tag):
+    if row is None:
+        return None
+    version, modified_at = row
+    last_modified = datetime.strptime(modified_at, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+    return f"{tag}-v{version}", last_modified
+
+
+def event_stamp(conn, event_id):
+    """(etag, last_modified) for one event, or None if it has no stamp"""
+    row = conn.execute("SELECT version, modified_at FROM event_versions WHERE event_id = ?",
+                       (event_id,)).fetchone()
+    return _stamp(row, f"event-{event_id}")
+
+
+def catalog_stamp(conn):
+    """(etag, last_modified) for the event listing, or None"""
+    row = conn.execute("SELECT version, modified_at FROM event_versions WHERE event_id = ?",
+                       (CATALOG,)).fetchone()
+    return _stamp(row, "events")
+
+
+def _combined_stamp(rows, tag):
+    """One stamp for a set of events: a digest of their versions"""
+    if not rows:
+        return None
+    digest = hashlib.sha1(','.join(f"{event_id}:{version}" for event_id, version, _ in rows).encode())
+    latest = max(modified_at for _, _, modified_at in rows)
+    return _stamp((digest.hexdigest()[:16], latest), tag)
+
+
+def events_stamp(conn, event_ids):
+    """(etag, last_modified) covering several events, or None"""
+    placeholders = ','.join('?' * len(event_ids))
+    rows = conn.execute(f"""
+        SELECT event_id, version, modified_at FROM event_versions
+        WHERE event_id IN ({placeholders}) ORDER BY event_id
+    """, list(event_ids)).fetchall()
+    return _combined_stamp(rows, "events")
+
+
+def student_events_stamp(conn, student_id):
+    """(etag, last_modified) covering every event a student registered for"""
+    rows = conn.execute("""
+        SELECT ev.event_id, ev.version, ev.modified_at
+        FROM registrations r JOIN event_versions ev ON ev.event_id = r.event_id
+        WHERE r.student_id = ?
+        ORDER BY ev.event_id
+    """, (student_id,)).fetchall()
+    return _combined_stamp(rows, f"student-{student_id}-events")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain event version stamps")
+    parser.add_argument('command', choices=['backfill'])
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DATABASE)
+    backfill_event_versions(conn)
+    events = conn.execute("SELECT COUNT(*) FROM event_versions WHERE event_id != ?",
+                          (CATALOG,)).fetchone()[0]
+    conn.close()
+    print(f"Stamped {events} events")
@@ -1,540 +1,822 @@
-"""
-Report Generation Script for Campus Event Management Platform
-This script generates JSON and CSV reports and saves them to the reports/ folder
-"""
-
-import sqlite3
-import json
-import csv
-import os
-from datetime import datetime
-
-DATABASE = 'campus_events.db'
-REPORTS_DIR = 'reports'
-
-def get_db_connection():
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def ensure_reports_directory():
-    """Create reports directory if it doesn't exist"""
-    if not os.path.exists(REPORTS_DIR):
-        os.makedirs(REPORTS_DIR)
-        print(f"Created {REPORTS_DIR}/ directory")
-
-def generate_event_popularity_report():
-    """Generate Event Popularity Report"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    results = cursor.execute("""
-        SELECT e.id, e.name, e.event_type, e.event_date, c.name as college_name,
-               COUNT(r.id) as total_registrations,
-               COUNT(CASE WHEN a.attended = 1 THEN 1 END) as total_attendance,
-               CASE 
-                 WHEN COUNT(r.id) > 0 THEN 
-                   ROUND(COUNT(CASE WHEN a.attended = 1 THEN 1 END) * 100.0 / COUNT(r.id), 2)
-                 ELSE 0 
-               END as attendance_percentage,
-               AVG(CASE WHEN f.rating IS NOT NULL THEN f.rating END) as avg_rating,
-               e.max_capacity,
-               ROUND(COUNT(r.id) * 100.0 / e.max_capacity, 2) as capacity_utilization
-        FROM events e
-        JOIN colleges c ON e.college_id = c.id
-        LEFT JOIN registrations r ON e.id = r.event_id
-        LEFT JOIN attendance a ON r.id = a.registration_id
-        LEFT JOIN feedback f ON r.id = f.registration_id
-        GROUP BY e.id
-        ORDER BY total_registrations DESC, total_attendance DESC
-    """).fetchall()
-    
-    conn.close()
-    
-    # Convert to list of dictionaries
-    report_data = []
-    for row in results:
-        row_dict = dict(row)
-        if row_dict['avg_rating']:
-            row_dict['avg_rating'] = round(row_dict['avg_rating'], 2)
-        report_data.append(row_dict)
-    
-    # Generate JSON report
-    json_report = {
-        "report_name": "Event Popularity Report",
-        "generated_at": datetime.now().isoformat(),
-        "total_events": len(report_data),
-        "summary": {
-            "most_popular_event": report_data[0]['name'] if report_data else "N/A",
-            "avg_registrations_per_event": round(sum(r['total_registrations'] for r in report_data) / len(report_data), 2) if report_data else 0,
-            "overall_attendance_rate": round(sum(r['total_attendance'] for r in report_data) / sum(r['total_registrations'] for r in report_data) * 100, 2) if sum(r['total_registrations'] for r in report_data) > 0 else 0
-        },
-        "events": report_data
-    }
-    
-    # Save JSON report
-    with open(f'{REPORTS_DIR}/event_popularity.json', 'w') as f:
-        json.dump(json_report, f, indent=2)
-    
-    # Save CSV report
-    if report_data:
-        with open(f'{REPORTS_DIR}/event_popularity.csv', 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=report_data[0].keys())
-            writer.writeheader()
-            writer.writerows(report_data)
-    
-    return json_report
-
-def generate_student_participation_report():
-    """Generate Student Participation Report"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    results = cursor.execute("""
-        SELECT s.id, s.name, s.email, c.name as college_name,
-               COUNT(r.id) as total_registrations,
-               COUNT(CASE WHEN a.attended = 1 THEN 1 END) as events_attended,
-               AVG(CASE WHEN f.rating IS NOT NULL THEN f.rating END) as avg_feedback_rating,
-               CASE 
-                 WHEN COUNT(r.id) > 0 THEN 
-                   ROUND(COUNT(CASE WHEN a.attended = 1 THEN 1 END) * 100.0 / COUNT(r.id), 2)
-                 ELSE 0 
-               END as personal_attendance_rate,
-               COUNT(f.id) as feedback_given_count
-        FROM students s
-        JOIN colleges c ON s.college_id = c.id
-        LEFT JOIN registrations r ON s.id = r.student_id
-        LEFT JOIN attendance a ON r.id = a.registration_id
-        LEFT JOIN feedback f ON r.id = f.registration_id
-        GROUP BY s.id
-        HAVING COUNT(r.id) > 0
-        ORDER BY events_attended DESC, total_registrations DESC
-    """).fetchall()
-    
-    conn.close()
-    
-    # Convert to list of dictionaries
-    report_data = []
-    for row in results:
-        row_dict = dict(row)
-        if row_dict['avg_feedback_rating']:
-            row_dict['avg_feedback_rating'] = round(row_dict['avg_feedback_rating'], 2)
-        report_data.append(row_dict)
-    
-    # Generate JSON report
-    json_report = {
-        "report_name": "Student Participation Report",
-        "generated_at": datetime.now().isoformat(),
-        "total_active_students": len(report_data),
-        "summary": {
-            "most_active_student": report_data[0]['name'] if report_data else "N/A",
-            "avg_events_per_student": round(sum(r['events_attended'] for r in report_data) / len(report_data), 2) if report_data else 0,
-            "avg_registrations_per_student": round(sum(r['total_registrations'] for r in report_data) / len(report_data), 2) if report_data else 0,
-            "students_with_perfect_attendance": len([r for r in report_data if r['personal_attendance_rate'] == 100.0])
-        },
-        "students": report_data
-    }
-    
-    # Save JSON report
-    with open(f'{REPORTS_DIR}/student_participation.json', 'w') as f:
-        json.dump(json_report, f, indent=2)
-    
-    # Save CSV report
-    if report_data:
-        with open(f'{REPORTS_DIR}/student_participation.csv', 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=report_data[0].keys())
-            writer.writeheader()
-            writer.writerows(report_data)
-    
-    return json_report
-
-def generate_top_students_report():
-    """Generate Top 3 Most Active Students Report"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    results = cursor.execute("""
-        SELECT s.id, s.name, s.email, c.name as college_name,
-               COUNT(r.id) as total_registrations,
-               COUNT(CASE WHEN a.attended = 1 THEN 1 END) as events_attended,
-               AVG(CASE WHEN f.rating IS NOT NULL THEN f.rating END) as avg_feedback_rating,
-               COUNT(f.id) as feedback_submissions,
-               CASE 
-                 WHEN COUNT(r.id) > 0 THEN 
-                   ROUND(COUNT(CASE WHEN a.attended = 1 THEN 1 END) * 100.0 / COUNT(r.id), 2)
-                 ELSE 0 
-               END as attendance_rate
-        FROM students s
-        JOIN colleges c ON s.college_id = c.id
-        LEFT JOIN registrations r ON s.id = r.student_id
-        LEFT JOIN attendance a ON r.id = a.registration_id
-        LEFT JOIN feedback f ON r.id = f.registration_id
-        GROUP BY s.id
-        HAVING COUNT(CASE WHEN a.attended = 1 THEN 1 END) > 0
-        ORDER BY events_attended DESC, total_registrations DESC, feedback_submissions DESC
-        LIMIT 3
-    """).fetchall()
-    
-    conn.close()
-    
-    # Convert to list of dictionaries
-    report_data = []
-    for i, row in enumerate(results, 1):
-        row_dict = dict(row)
-        row_dict['rank'] = i
-        if row_dict['avg_feedback_rating']:
-            row_dict['avg_feedback_rating'] = round(row_dict['avg_feedback_rating'], 2)
-        report_data.append(row_dict)
-    
-    # Generate JSON report
-    json_report = {
-        "report_name": "Top 3 Most Active Students",
-        "generated_at": datetime.now().isoformat(),
-        "criteria": "Ranked by events attended, then registrations, then feedback submissions",
-        "top_students": report_data
-    }
-    
-    # Save JSON report
-    with open(f'{REPORTS_DIR}/top_students.json', 'w') as f:
-        json.dump(json_report, f, indent=2)
-    
-    # Save CSV report
-    if report_data:
-        with open(f'{REPORTS_DIR}/top_students.csv', 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=report_data[0].keys())
-            writer.writeheader()
-            writer.writerows(report_data)
-    
-    return json_report
-
-def generate_event_type_analysis():
-    """Generate Event Type Analysis Report"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    results = cursor.execute("""
-        SELECT e.event_type,
-               COUNT(e.id) as total_events,
-               COUNT(r.id) as total_registrations,
-               COUNT(CASE WHEN a.attended = 1 THEN 1 END) as total_attendance,
-               AVG(CASE WHEN f.rating IS NOT NULL THEN f.rating END) as avg_rating,
-               CASE 
-                 WHEN COUNT(r.id) > 0 THEN 
-                   ROUND(COUNT(CASE WHEN a.attended = 1 THEN 1 END) * 100.0 / COUNT(r.id), 2)
-                 ELSE 0 
-               END as attendance_percentage,
-               ROUND(COUNT(r.id) * 1.0 / COUNT(e.id), 2) as avg_registrations_per_event,
-               MAX(COUNT(r.id)) OVER (PARTITION BY e.event_type) as max_registrations_for_type
-        FROM events e
-        LEFT JOIN registrations r ON e.id = r.event_id
-        LEFT JOIN attendance a ON r.id = a.registration_id
-        LEFT JOIN feedback f ON r.id = f.registration_id
-        GROUP BY e.event_type
-        ORDER BY total_registrations DESC
-    """).fetchall()
-    
-    conn.close()
-    
-    # Convert to list of dictionaries
-    report_data = []
-    for row in results:
-        row_dict = dict(row)
-        if row_dict['avg_rating']:
-            row_dict['avg_rating'] = round(row_dict['avg_rating'], 2)
-        report_data.append(row_dict)
-    
-    # Generate JSON report
-    json_report = {
-        "report_name": "Event Type Analysis",
-        "generated_at": datetime.now().isoformat(),
-        "summary": {
-            "most_popular_type": report_data[0]['event_type'] if report_data else "N/A",
-            "total_event_types": len(report_data),
-            "best_attended_type": max(report_data, key=lambda x: x['attendance_percentage'])['event_type'] if report_data else "N/A",
-            "highest_rated_type": max([r for r in report_data if r['avg_rating']], key=lambda x: x['avg_rating'], default={}).get('event_type', 'N/A')
-        },
-        "event_types": report_data
-    }
-    
-    # Save JSON report
-    with open(f'{REPORTS_DIR}/event_type_analysis.json', 'w') as f:
-        json.dump(json_report, f, indent=2)
-    
-    # Save CSV report
-    if report_data:
-        with open(f'{REPORTS_DIR}/event_type_analysis.csv', 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=report_data[0].keys())
-            writer.writeheader()
-            writer.writerows(report_data)
-    
-    return json_report
-
-def generate_college_statistics():
-    """Generate College Statistics Report"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    results = cursor.execute("""
-        SELECT c.id as college_id, c.name as college_name, c.location,
-               COUNT(DISTINCT s.id) as total_students,
-               COUNT(DISTINCT e.id) as total_events_hosted,
-               COUNT(DISTINCT CASE WHEN r.student_id IN (SELECT id FROM students WHERE college_id = c.id) THEN r.id END) as registrations_by_students,
-               COUNT(DISTINCT CASE WHEN r.event_id IN (SELECT id FROM events WHERE college_id = c.id) THEN r.id END) as registrations_for_events,
-               COUNT(DISTINCT CASE WHEN a.attended = 1 AND r.student_id IN (SELECT id FROM students WHERE college_id = c.id) THEN a.id END) as attendance_by_students,
-               AVG(CASE WHEN f.rating IS NOT NULL AND r.student_id IN (SELECT id FROM students WHERE college_id = c.id) THEN f.rating END) as avg_feedback_by_students
-        FROM colleges c
-        LEFT JOIN students s ON c.id = s.college_id
-        LEFT JOIN events e ON c.id = e.college_id
-        LEFT JOIN registrations r ON (s.id = r.student_id OR e.id = r.event_id)
-        LEFT JOIN attendance a ON r.id = a.registration_id
-        LEFT JOIN feedback f ON r.id = f.registration_id
-        GROUP BY c.id
-        ORDER BY total_students DESC
-    """).fetchall()
-    
-    conn.close()
-    
-    # Convert to list of dictionaries
-    report_data = []
-    for row in results:
-        row_dict = dict(row)
-        if row_dict['avg_feedback_by_students']:
-            row_dict['avg_feedback_by_students'] = round(row_dict['avg_feedback_by_students'], 2)
-        
-        # Calculate engagement metrics
-        if row_dict['total_students'] > 0:
-            row_dict['registrations_per_student'] = round(row_dict['registrations_by_students'] / row_dict['total_students'], 2)
-            row_dict['attendance_rate'] = round(row_dict['attendance_by_students'] / row_dict['registrations_by_students'] * 100, 2) if row_dict['registrations_by_students'] > 0 else 0
-        else:
-            row_dict['registrations_per_student'] = 0
-            row_dict['attendance_rate'] = 0
-        
-        report_data.append(row_dict)
-    
-    # Generate JSON report
-    json_report = {
-        "report_name": "College Statistics",
-        "generated_at": datetime.now().isoformat(),
-        "total_colleges": len(report_data),
-        "summary": {
-            "largest_college": max(report_data, key=lambda x: x['total_students'])['college_name'] if report_data else "N/A",
-            "most_active_college": max(report_data, key=lambda x: x['total_events_hosted'])['college_name'] if report_data else "N/A",
-            "total_students_across_colleges": sum(r['total_students'] for r in report_data),
-            "total_events_across_colleges": sum(r['total_events_hosted'] for r in report_data)
-        },
-        "colleges": report_data
-    }
-    
-    # Save JSON report
-    with open(f'{REPORTS_DIR}/college_statistics.json', 'w') as f:
-        json.dump(json_report, f, indent=2)
-    
-    # Save CSV report
-    if report_data:
-        with open(f'{REPORTS_DIR}/college_statistics.csv', 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=report_data[0].keys())
-            writer.writeheader()
-            writer.writerows(report_data)
-    
-    return json_report
-
-def generate_feedback_analysis():
-    """Generate Feedback Analysis Report"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Overall feedback statistics
-    overall_stats = cursor.execute("""
-        SELECT COUNT(*) as total_feedback,
-               AVG(rating) as avg_rating,
-               COUNT(CASE WHEN rating = 5 THEN 1 END) as five_star,
-               COUNT(CASE WHEN rating = 4 THEN 1 END) as four_star,
-               COUNT(CASE WHEN rating = 3 THEN 1 END) as three_star,
-               COUNT(CASE WHEN rating = 2 THEN 1 END) as two_star,
-               COUNT(CASE WHEN rating = 1 THEN 1 END) as one_star,
-               COUNT(CASE WHEN comments IS NOT NULL AND comments != '' THEN 1 END) as with_comments
-        FROM feedback
-    """).fetchone()
-    
-    # Feedback by event
-    event_feedback = cursor.execute("""
-        SELECT e.name as event_name, e.event_type, c.name as college_name,
-               COUNT(f.id) as feedback_count,
-               AVG(f.rating) as avg_rating,
-               GROUP_CONCAT(f.comments, '; ') as sample_comments
-        FROM events e
-        JOIN colleges c ON e.college_id = c.id
-        LEFT JOIN registrations r ON e.id = r.event_id
-        LEFT JOIN feedback f ON r.id = f.registration_id
-        WHERE f.id IS NOT NULL
-        GROUP BY e.id
-        ORDER BY avg_rating DESC, feedback_count DESC
-    """).fetchall()
-    
-    conn.close()
-    
-    # Convert results
-    overall_dict = dict(overall_stats)
-    if overall_dict['avg_rating']:
-        overall_dict['avg_rating'] = round(overall_dict['avg_rating'], 2)
-    
-    event_feedback_list = []
-    for row in event_feedback:
-        row_dict = dict(row)
-        if row_dict['avg_rating']:
-            row_dict['avg_rating'] = round(row_dict['avg_rating'], 2)
-        # Limit sample comments length
-        if row_dict['sample_comments'] and len(row_dict['sample_comments']) > 200:
-            row_dict['sample_comments'] = row_dict['sample_comments'][:200] + "..."
-        event_feedback_list.append(row_dict)
-    
-    # Generate JSON report
-    json_report = {
-        "report_name": "Feedback Analysis",
-        "generated_at": datetime.now().isoformat(),
-        "overall_statistics": overall_dict,
-        "rating_distribution": {
-            "5_star": overall_dict['five_star'],
-            "4_star": overall_dict['four_star'],
-            "3_star": overall_dict['three_star'],
-            "2_star": overall_dict['two_star'],
-            "1_star": overall_dict['one_star']
-        },
-        "event_feedback": event_feedback_list
-    }
-    
-    # Save JSON report
-    with open(f'{REPORTS_DIR}/feedback_analysis.json', 'w') as f:
-        json.dump(json_report, f, indent=2)
-    
-    # Save CSV report for event feedback
-    if event_feedback_list:
-        with open(f'{REPORTS_DIR}/feedback_by_event.csv', 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=event_feedback_list[0].keys())
-            writer.writeheader()
-            writer.writerows(event_feedback_list)
-    
-    return json_report
-
-def generate_summary_dashboard():
-    """Generate Executive Summary Dashboard"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Key metrics
-    metrics = cursor.execute("""
-        SELECT 
-            (SELECT COUNT(*) FROM colleges) as total_colleges,
-            (SELECT COUNT(*) FROM students) as total_students,
-            (SELECT COUNT(*) FROM events) as total_events,
-            (SELECT COUNT(*) FROM registrations) as total_registrations,
-            (SELECT COUNT(*) FROM attendance WHERE attended = 1) as total_attendance,
-            (SELECT COUNT(*) FROM feedback) as total_feedback,
-            (SELECT AVG(rating) FROM feedback) as avg_rating,
-            (SELECT COUNT(*) FROM registrations) - (SELECT COUNT(*) FROM attendance WHERE attended = 1) as no_shows
-    """).fetchone()
-    
-    conn.close()
-    
-    metrics_dict = dict(metrics)
-    
-    # Calculate derived metrics
-    attendance_rate = round((metrics_dict['total_attendance'] / metrics_dict['total_registrations']) * 100, 2) if metrics_dict['total_registrations'] > 0 else 0
-    feedback_rate = round((metrics_dict['total_feedback'] / metrics_dict['total_attendance']) * 100, 2) if metrics_dict['total_attendance'] > 0 else 0
-    avg_registrations_per_event = round(metrics_dict['total_registrations'] / metrics_dict['total_events'], 2) if metrics_dict['total_events'] > 0 else 0
-    avg_events_per_student = round(metrics_dict['total_registrations'] / metrics_dict['total_students'], 2) if metrics_dict['total_students'] > 0 else 0
-    
-    if metrics_dict['avg_rating']:
-        metrics_dict['avg_rating'] = round(metrics_dict['avg_rating'], 2)
-    
-    # Generate dashboard report
-    dashboard = {
-        "report_name": "Executive Summary Dashboard",
-        "generated_at": datetime.now().isoformat(),
-        "key_metrics": {
-            "platform_overview": {
-                "total_colleges": metrics_dict['total_colleges'],
-                "total_students": metrics_dict['total_students'],
-                "total_events": metrics_dict['total_events']
-            },
-            "engagement_metrics": {
-                "total_registrations": metrics_dict['total_registrations'],
-                "total_attendance": metrics_dict['total_attendance'],
-                "attendance_rate_percentage": attendance_rate,
-                "no_shows": metrics_dict['no_shows']
-            },
-            "feedback_metrics": {
-                "total_feedback_submissions": metrics_dict['total_feedback'],
-                "feedback_rate_percentage": feedback_rate,
-                "average_rating": metrics_dict['avg_rating']
-            },
-            "efficiency_metrics": {
-                "avg_registrations_per_event": avg_registrations_per_event,
-                "avg_events_per_student": avg_events_per_student
-            }
-        },
-        "health_indicators": {
-            "engagement_health": "Good" if attendance_rate > 70 else "Needs Improvement" if attendance_rate > 50 else "Poor",
-            "feedback_health": "Excellent" if feedback_rate > 80 else "Good" if feedback_rate > 60 else "Needs Improvement",
-            "satisfaction_health": "Excellent" if metrics_dict['avg_rating'] and metrics_dict['avg_rating'] >= 4.0 else "Good" if metrics_dict['avg_rating'] and metrics_dict['avg_rating'] >= 3.5 else "Needs Improvement"
-        }
-    }
-    
-    # Save dashboard report
-    with open(f'{REPORTS_DIR}/summary_dashboard.json', 'w') as f:
-        json.dump(dashboard, f, indent=2)
-    
-    return dashboard
-
-def main():
-    """Generate all reports"""
-    print("=" * 60)
-    print(" GENERATING COMPREHENSIVE REPORTS")
-    print("=" * 60)
-    
-    # Ensure reports directory exists
-    ensure_reports_directory()
-    
-    # Generate all reports
-    reports = []
-    
-    print("\n1. Generating Event Popularity Report...")
-    reports.append(generate_event_popularity_report())
-    
-    print("2. Generating Student Participation Report...")
-    reports.append(generate_student_participation_report())
-    
-    print("3. Generating Top Students Report...")
-    reports.append(generate_top_students_report())
-    
-    print("4. Generating Event Type Analysis...")
-    reports.append(generate_event_type_analysis())
-    
-    print("5. Generating College Statistics...")
-    reports.append(generate_college_statistics())
-    
-    print("6. Generating Feedback Analysis...")
-    reports.append(generate_feedback_analysis())
-    
-    print("7. Generating Summary Dashboard...")
-    reports.append(generate_summary_dashboard())
-    
-    print(f"\n{'='*60}")
-    print(" REPORT GENERATION COMPLETED")
-    print(f"{'='*60}")
-    
-    print(f"\nAll reports have been saved to the '{REPORTS_DIR}/' directory:")
-    print("JSON Reports:")
-    for filename in os.listdir(REPORTS_DIR):
-        if filename.endswith('.json'):
-            print(f"  - {filename}")
-    
-    print("\nCSV Reports:")
-    for filename in os.listdir(REPORTS_DIR):
-        if filename.endswith('.csv'):
-            print(f"  - {filename}")
-    
-    print(f"\nTotal files generated: {len(os.listdir(REPORTS_DIR))}")
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+"""
+Report Generation Script for Campus Event Management Platform
+This script generates JSON and CSV reports and saves them to the reports/ folder
+"""
+
+import argparse
+import sqlite3
+import json
+import csv
+import os
+import tempfile
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+
+import analytics
+from archive import archive_path, union_archive
+from leaderboard import DEFAULT_TOP_N, top_students
+from migrations import apply_migrations
+from profiling import profiled
+from report_artifacts import MANIFEST_NAME, atomic_write, data_watermark, publish_manifest
+from report_writer import ReportWriter, RunningTotals, fetch_rows
+from snapshot import Snapshot
+
+DATABASE = 'campus_events.db'
+REPORTS_DIR = 'reports'
+
+# Feedback analysis keeps the most recent comments per event, each cut short
+SAMPLE_COMMENTS_PER_EVENT = 3
+SAMPLE_COMMENT_LENGTH = 200
+
+def get_db_connection():
+    conn = sqlite3.connect(DATABASE)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def report_connection(conn=None):
+    """Return (connection, close); a connection passed in is left open for its owner"""
+    if conn is not None:
+        return conn, lambda: None
+    conn = get_db_connection()
+    return conn, conn.close
+
+@contextmanager
+def consistent_connection(mode):
+    """Connection whose reads all see the database at one point in time
+    
+    'backup' copies the database with the SQLite online backup API into a
+    temporary file and reads the copy, so writers are only held up for the
+    copy itself. 'wal' switches the database to WAL mode and keeps one read
+    transaction open, so readers and writers never block each other.
+    """
+    if mode == 'backup':
+        with tempfile.TemporaryDirectory() as directory:
+            source = sqlite3.connect(DATABASE)
+            conn = sqlite3.connect(os.path.join(directory, 'report_copy.db'))
+            # One step (pages=-1): the source is locked once, briefly, and a
+            # concurrent write cannot force the copy to restart
+            source.backup(conn)
+            source.close()
+            conn.row_factory = sqlite3.Row
+            try:
+                yield conn
+            finally:
+                conn.close()
+    elif mode == 'wal':
+        conn = get_db_connection()
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("BEGIN")
+        # The read snapshot is taken at the first read of the transaction
+        conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+            conn.close()
+    else:
+        raise ValueError(f"Unknown consistency mode: {mode}")
+
+def query_reports(conn, top_n=DEFAULT_TOP_N):
+    """Run every report query on one connection"""
+    overall_dict, event_feedback_list = query_feedback_statistics(conn)
+    return {
+        'event_popularity': query_event_popularity(conn),
+        'student_participation': query_student_participation(conn),
+        'top_students': query_top_students(conn, top_n),
+        'event_type_analysis': query_event_type_analysis(conn),
+        'college_statistics': query_college_statistics(conn),
+        'feedback_overall': overall_dict,
+        'feedback_by_event': event_feedback_list,
+        'sample_comments': query_sample_comments(conn),
+        'summary_metrics': query_summary_metrics(conn),
+    }
+
+def report_file_stats():
+    """(inode, mtime) of each report file, to tell later which ones a run rewrote"""
+    stats = {}
+    for filename in report_files():
+        stat = os.stat(os.path.join(REPORTS_DIR, filename))
+        stats[filename] = (stat.st_ino, stat.st_mtime_ns)
+    return stats
+
+def report_files(before=None):
+    """Report files currently in the reports directory; given report_file_stats()
+    from the start of a run, only the files that run wrote
+    
+    atomic_write() renames a new file into place, so a rewritten file always
+    differs from what was there before. Files a run skipped (such as the CSV
+    of a report with no rows) keep their old stats and are left out.
+    """
+    filenames = [filename for filename in os.listdir(REPORTS_DIR)
+                 if filename.endswith(('.json', '.csv')) and filename != MANIFEST_NAME]
+    if before is None:
+        return filenames
+    written = []
+    for filename in filenames:
+        stat = os.stat(os.path.join(REPORTS_DIR, filename))
+        if before.get(filename) != (stat.st_ino, stat.st_mtime_ns):
+            written.append(filename)
+    return written
+
+def ensure_reports_directory():
+    """Create reports directory if it doesn't exist"""
+    if not os.path.exists(REPORTS_DIR):
+        os.makedirs(REPORTS_DIR)
+        print(f"Created {REPORTS_DIR}/ directory")
+
+def iter_event_popularity(conn=None, event_type=None):
+    """Stream event popularity rows from the database, optionally for one event type"""
+    conn, close_connection = report_connection(conn)
+    cursor = conn.cursor()
+    
+    query = """
+        SELECT e.id, e.name, e.event_type, e.event_date, c.name as college_name,
+               COUNT(r.id) as total_registrations,
+               COUNT(CASE WHEN a.attended = 1 THEN 1 END) as total_attendance,
+               CASE 
+                 WHEN COUNT(r.id) > 0 THEN 
+                   ROUND(COUNT(CASE WHEN a.attended = 1 THEN 1 END) * 100.0 / COUNT(r.id), 2)
+                 ELSE 0 
+               END as attendance_percentage,
+               AVG(CASE WHEN f.rating IS NOT NULL THEN f.rating END) as avg_rating,
+               e.max_capacity,
+               ROUND(COUNT(r.id) * 100.0 / e.max_capacity, 2) as capacity_utilization
+        FROM events e
+        JOIN colleges c ON e.college_id = c.id
+        LEFT JOIN registrations r ON e.id = r.event_id
+        LEFT JOIN attendance a ON r.id = a.registration_id
+        LEFT JOIN feedback f ON r.id = f.registration_id
+        WHERE 1=1
+    """
+    
+    params = []
+    if event_type:
+        query += " AND e.event_type = ?"
+        params.append(event_type)
+    
+    query += """
+        GROUP BY e.id
+        ORDER BY total_registrations DESC, total_attendance DESC
+    """
+    
+    try:
+        for row_dict in fetch_rows(cursor.execute(query, params)):
+            if row_dict['avg_rating']:
+                row_dict['avg_rating'] = round(row_dict['avg_rating'], 2)
+            yield row_dict
+    finally:
+        close_connection()
+
+def query_event_popularity(conn=None, event_type=None):
+    """Event popularity rows from the database, as a list"""
+    return list(iter_event_popularity(conn, event_type))
+
+def generate_event_popularity_report(report_data=None, conn=None):
+    """Generate Event Popularity Report
+    
+    Rows are written to the JSON and CSV files as they are read; the
+    returned report leaves them out.
+    """
+    rows = report_data if report_data is not None else iter_event_popularity(conn)
+    totals = RunningTotals('total_registrations', 'total_attendance')
+    
+    header = {
+        "report_name": "Event Popularity Report",
+        "generated_at": datetime.now().isoformat()
+    }
+    with ReportWriter(f'{REPORTS_DIR}/event_popularity', header, "events") as writer:
+        for row_dict in rows:
+            writer.write(row_dict)
+            totals.add(row_dict)
+        
+        registrations = totals.sums['total_registrations']
+        return writer.finish({
+            "total_events": totals.count,
+            "summary": {
+                "most_popular_event": totals.first['name'] if totals.first else "N/A",
+                "avg_registrations_per_event": totals.mean('total_registrations'),
+                "overall_attendance_rate": round(totals.sums['total_attendance'] / registrations * 100, 2) if registrations > 0 else 0
+            }
+        })
+
+def iter_student_participation(conn=None, college_id=None):
+    """Stream student participation rows from the database, optionally for one college"""
+    conn, close_connection = report_connection(conn)
+    cursor = conn.cursor()
+    
+    query = """
+        SELECT s.id, s.name, s.email, c.name as college_name,
+               COUNT(r.id) as total_registrations,
+               COUNT(CASE WHEN a.attended = 1 THEN 1 END) as events_attended,
+               AVG(CASE WHEN f.rating IS NOT NULL THEN f.rating END) as avg_feedback_rating,
+               CASE 
+                 WHEN COUNT(r.id) > 0 THEN 
+                   ROUND(COUNT(CASE WHEN a.attended = 1 THEN 1 END) * 100.0 / COUNT(r.id), 2)
+                 ELSE 0 
+               END as personal_attendance_rate,
+               COUNT(f.id) as feedback_given_count
+        FROM students s
+        JOIN colleges c ON s.college_id = c.id
+        LEFT JOIN registrations r ON s.id = r.student_id
+        LEFT JOIN attendance a ON r.id = a.registration_id
+        LEFT JOIN feedback f ON r.id = f.registration_id
+        WHERE 1=1
+    """
+    
+    params = []
+    if college_id:
+        query += " AND s.college_id = ?"
+        params.append(college_id)
+    
+    query += """
+        GROUP BY s.id
+        HAVING COUNT(r.id) > 0
+        ORDER BY events_attended DESC, total_registrations DESC
+    """
+    
+    try:
+        for row_dict in fetch_rows(cursor.execute(query, params)):
+            if row_dict['avg_feedback_rating']:
+                row_dict['avg_feedback_rating'] = round(row_dict['avg_feedback_rating'], 2)
+            yield row_dict
+    finally:
+        close_connection()
+
+def query_student_participation(conn=None, college_id=None):
+    """Student participation rows from the database, as a list"""
+    return list(iter_student_participation(conn, college_id))
+
+def generate_student_participation_report(report_data=None, conn=None):
+    """Generate Student Participation Report
+    
+    Rows are written to the JSON and CSV files as they are read; the
+    returned report leaves them out.
+    """
+    rows = report_data if report_data is not None else iter_student_participation(conn)
+    totals = RunningTotals('events_attended', 'total_registrations')
+    perfect_attendance = 0
+    
+    header = {
+        "report_name": "Student Participation Report",
+        "generated_at": datetime.now().isoformat()
+    }
+    with ReportWriter(f'{REPORTS_DIR}/student_participation', header, "students") as writer:
+        for row_dict in rows:
+            writer.write(row_dict)
+            totals.add(row_dict)
+            if row_dict['personal_attendance_rate'] == 100.0:
+                perfect_attendance += 1
+        
+        return writer.finish({
+            "total_active_students": totals.count,
+            "summary": {
+                "most_active_student": totals.first['name'] if totals.first else "N/A",
+                "avg_events_per_student": totals.mean('events_attended'),
+                "avg_registrations_per_student": totals.mean('total_registrations'),
+                "students_with_perfect_attendance": perfect_attendance
+            }
+        })
+
+def query_top_students(conn=None, limit=DEFAULT_TOP_N):
+    """Top student rows, ranked, from the leaderboard counters"""
+    conn, close_connection = report_connection(conn)
+    report_data = top_students(conn, limit)
+    close_connection()
+    
+    return report_data
+
+def generate_top_students_report(report_data=None, limit=DEFAULT_TOP_N, conn=None):
+    """Generate Top N Most Active Students Report"""
+    if report_data is None:
+        report_data = query_top_students(conn, limit)
+    
+    # Generate JSON report
+    json_report = {
+        "report_name": f"Top {limit} Most Active Students",
+        "generated_at": datetime.now().isoformat(),
+        "criteria": "Ranked by events attended, then registrations, then feedback submissions",
+        "top_students": report_data
+    }
+    
+    # Save JSON report
+    with atomic_write(f'{REPORTS_DIR}/top_students.json') as f:
+        json.dump(json_report, f, indent=2)
+    
+    # Save CSV report
+    if report_data:
+        with atomic_write(f'{REPORTS_DIR}/top_students.csv', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=report_data[0].keys())
+            writer.writeheader()
+            writer.writerows(report_data)
+    
+    return json_report
+
+def query_event_type_analysis(conn=None):
+    """Event type rows from the database"""
+    conn, close_connection = report_connection(conn)
+    cursor = conn.cursor()
+    
+    results = cursor.execute("""
+        SELECT e.event_type,
+               COUNT(e.id) as total_events,
+               COUNT(r.id) as total_registrations,
+               COUNT(CASE WHEN a.attended = 1 THEN 1 END) as total_attendance,
+               AVG(CASE WHEN f.rating IS NOT NULL THEN f.rating END) as avg_rating,
+               CASE 
+                 WHEN COUNT(r.id) > 0 THEN 
+                   ROUND(COUNT(CASE WHEN a.attended = 1 THEN 1 END) * 100.0 / COUNT(r.id), 2)
+                 ELSE 0 
+               END as attendance_percentage,
+               ROUND(COUNT(r.id) * 1.0 / COUNT(e.id), 2) as avg_registrations_per_event,
+               MAX(COUNT(r.id)) OVER (PARTITION BY e.event_type) as max_registrations_for_type
+        FROM events e
+        LEFT JOIN registrations r ON e.id = r.event_id
+        LEFT JOIN attendance a ON r.id = a.registration_id
+        LEFT JOIN feedback f ON r.id = f.registration_id
+        GROUP BY e.event_type
+        ORDER BY total_registrations DESC
+    """).fetchall()
+    
+    close_connection()
+    
+    # Convert to list of dictionaries
+    report_data = []
+    for row in results:
+        row_dict = dict(row)
+        if row_dict['avg_rating']:
+            row_dict['avg_rating'] = round(row_dict['avg_rating'], 2)
+        report_data.append(row_dict)
+    
+    return report_data
+
+def generate_event_type_analysis(report_data=None, conn=None):
+    """Generate Event Type Analysis Report"""
+    if report_data is None:
+        report_data = query_event_type_analysis(conn)
+    
+    # Generate JSON report
+    json_report = {
+        "report_name": "Event Type Analysis",
+        "generated_at": datetime.now().isoformat(),
+        "summary": {
+            "most_popular_type": report_data[0]['event_type'] if report_data else "N/A",
+            "total_event_types": len(report_data),
+            "best_attended_type": max(report_data, key=lambda x: x['attendance_percentage'])['event_type'] if report_data else "N/A",
+            "highest_rated_type": max([r for r in report_data if r['avg_rating']], key=lambda x: x['avg_rating'], default={}).get('event_type', 'N/A')
+        },
+        "event_types": report_data
+    }
+    
+    # Save JSON report
+    with atomic_write(f'{REPORTS_DIR}/event_type_analysis.json') as f:
+        json.dump(json_report, f, indent=2)
+    
+    # Save CSV report
+    if report_data:
+        with atomic_write(f'{REPORTS_DIR}/event_type_analysis.csv', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=report_data[0].keys())
+            writer.writeheader()
+            writer.writerows(report_data)
+    
+    return json_report
+
+def query_college_statistics(conn=None):
+    """College statistics rows from the database"""
+    conn, close_connection = report_connection(conn)
+    cursor = conn.cursor()
+    
+    results = cursor.execute("""
+        SELECT c.id as college_id, c.name as college_name, c.location,
+               COUNT(DISTINCT s.id) as total_students,
+               COUNT(DISTINCT e.id) as total_events_hosted,
+               COUNT(DISTINCT CASE WHEN r.student_id IN (SELECT id FROM students WHERE college_id = c.id) THEN r.id END) as registrations_by_students,
+               COUNT(DISTINCT CASE WHEN r.event_id IN (SELECT id FROM events WHERE college_id = c.id) THEN r.id END) as registrations_for_events,
+               COUNT(DISTINCT CASE WHEN a.attended = 1 AND r.student_id IN (SELECT id FROM students WHERE college_id = c.id) THEN a.id END) as attendance_by_students,
+               AVG(CASE WHEN f.rating IS NOT NULL AND r.student_id IN (SELECT id FROM students WHERE college_id = c.id) THEN f.rating END) as avg_feedback_by_students
+        FROM colleges c
+        LEFT JOIN students s ON c.id = s.college_id
+        LEFT JOIN events e ON c.id = e.college_id
+        LEFT JOIN registrations r ON (s.id = r.student_id OR e.id = r.event_id)
+        LEFT JOIN attendance a ON r.id = a.registration_id
+        LEFT JOIN feedback f ON r.id = f.registration_id
+        GROUP BY c.id
+        ORDER BY total_students DESC
+    """).fetchall()
+    
+    close_connection()
+    
+    # Convert to list of dictionaries
+    report_data = []
+    for row in results:
+        row_dict = dict(row)
+        if row_dict['avg_feedback_by_students']:
+            row_dict['avg_feedback_by_students'] = round(row_dict['avg_feedback_by_students'], 2)
+        report_data.append(row_dict)
+    
+    return report_data
+
+def add_engagement_metrics(row_dict):
+    """Add per-student registration and attendance rates to a college row"""
+    if row_dict['total_students'] > 0:
+        row_dict['registrations_per_student'] = round(row_dict['registrations_by_students'] / row_dict['total_students'], 2)
+        row_dict['attendance_rate'] = round(row_dict['attendance_by_students'] / row_dict['registrations_by_students'] * 100, 2) if row_dict['registrations_by_students'] > 0 else 0
+    else:
+        row_dict['registrations_per_student'] = 0
+        row_dict['attendance_rate'] = 0
+    return row_dict
+
+def generate_college_statistics(report_data=None, conn=None):
+    """Generate College Statistics Report"""
+    if report_data is None:
+        report_data = query_college_statistics(conn)
+    
+    # Calculate engagement metrics
+    report_data = [add_engagement_metrics(row_dict) for row_dict in report_data]
+    
+    # Generate JSON report
+    json_report = {
+        "report_name": "College Statistics",
+        "generated_at": datetime.now().isoformat(),
+        "total_colleges": len(report_data),
+        "summary": {
+            "largest_college": max(report_data, key=lambda x: x['total_students'])['college_name'] if report_data else "N/A",
+            "most_active_college": max(report_data, key=lambda x: x['total_events_hosted'])['college_name'] if report_data else "N/A",
+            "total_students_across_colleges": sum(r['total_students'] for r in report_data),
+            "total_events_across_colleges": sum(r['total_events_hosted'] for r in report_data)
+        },
+        "colleges": report_data
+    }
+    
+    # Save JSON report
+    with atomic_write(f'{REPORTS_DIR}/college_statistics.json') as f:
+        json.dump(json_report, f, indent=2)
+    
+    # Save CSV report
+    if report_data:
+        with atomic_write(f'{REPORTS_DIR}/college_statistics.csv', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=report_data[0].keys())
+            writer.writeheader()
+            writer.writerows(report_data)
+    
+    return json_report
+
+def query_feedback_statistics(conn=None):
+    """Overall feedback statistics and per-event feedback rows from the database"""
+    conn, close_connection = report_connection(conn)
+    cursor = conn.cursor()
+    
+    # Overall feedback statistics
+    overall_stats = cursor.execute("""
+        SELECT COUNT(*) as total_feedback,
+               AVG(rating) as avg_rating,
+               COUNT(CASE WHEN rating = 5 THEN 1 END) as five_star,
+               COUNT(CASE WHEN rating = 4 THEN 1 END) as four_star,
+               COUNT(CASE WHEN rating = 3 THEN 1 END) as three_star,
+               COUNT(CASE WHEN rating = 2 THEN 1 END) as two_star,
+               COUNT(CASE WHEN rating = 1 THEN 1 END) as one_star,
+               COUNT(CASE WHEN comments IS NOT NULL AND comments != '' THEN 1 END) as with_comments
+        FROM feedback
+    """).fetchone()
+    
+    # Feedback by event
+    event_feedback = cursor.execute("""
+        SELECT e.id as event_id, e.name as event_name, e.event_type, c.name as college_name,
+               COUNT(f.id) as feedback_count,
+               AVG(f.rating) as avg_rating
+        FROM events e
+        JOIN colleges c ON e.college_id = c.id
+        LEFT JOIN registrations r ON e.id = r.event_id
+        LEFT JOIN feedback f ON r.id = f.registration_id
+        WHERE f.id IS NOT NULL
+        GROUP BY e.id
+        ORDER BY avg_rating DESC, feedback_count DESC
+    """).fetchall()
+    
+    close_connection()
+    
+    # Convert results
+    overall_dict = dict(overall_stats)
+    if overall_dict['avg_rating']:
+        overall_dict['avg_rating'] = round(overall_dict['avg_rating'], 2)
+    
+    event_feedback_list = []
+    for row in event_feedback:
+        row_dict = dict(row)
+        if row_dict['avg_rating']:
+            row_dict['avg_rating'] = round(row_dict['avg_rating'], 2)
+        event_feedback_list.append(row_dict)
+    
+    return overall_dict, event_feedback_list
+
+def query_sample_comments(conn=None):
+    """Most recent comments per event, keyed by event id"""
+    conn, close_connection = report_connection(conn)
+    cursor = conn.cursor()
+    
+    # Ranking only carries feedback ids through the window sort, and only the
+    # selected comments are read back (truncated), so the work does not grow
+    # with the volume of comment text.
+    sample_comments = cursor.execute("""
+        WITH ranked AS (
+            SELECT r.event_id, f.id as feedback_id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY r.event_id
+                       ORDER BY f.submitted_at DESC, f.id DESC
+                   ) as comment_rank
+            FROM feedback f
+            JOIN registrations r ON r.id = f.registration_id
+            WHERE f.comments IS NOT NULL AND f.comments != ''
+        )
+        SELECT ranked.event_id, f.rating,
+               SUBSTR(f.comments, 1, ?) as comment,
+               LENGTH(f.comments) > ? as truncated
+        FROM ranked
+        JOIN feedback f ON f.id = ranked.feedback_id
+        WHERE ranked.comment_rank <= ?
+        ORDER BY ranked.event_id, ranked.comment_rank
+    """, (SAMPLE_COMMENT_LENGTH, SAMPLE_COMMENT_LENGTH, SAMPLE_COMMENTS_PER_EVENT)).fetchall()
+    
+    close_connection()
+    
+    comments_by_event = {}
+    for row in sample_comments:
+        comment = row['comment'] + ("..." if row['truncated'] else "")
+        comments_by_event.setdefault(row['event_id'], []).append(comment)
+    
+    return comments_by_event
+
+def generate_feedback_analysis(overall_dict=None, event_feedback_list=None, comments_by_event=None, conn=None):
+    """Generate Feedback Analysis Report"""
+    if overall_dict is None or event_feedback_list is None:
+        overall_dict, event_feedback_list = query_feedback_statistics(conn)
+    
+    if comments_by_event is None:
+        comments_by_event = query_sample_comments(conn)
+    for row_dict in event_feedback_list:
+        comments = comments_by_event.get(row_dict.pop('event_id'))
+        row_dict['sample_comments'] = '; '.join(comments) if comments else None
+    
+    # Generate JSON report
+    json_report = {
+        "report_name": "Feedback Analysis",
+        "generated_at": datetime.now().isoformat(),
+        "overall_statistics": overall_dict,
+        "rating_distribution": {
+            "5_star": overall_dict['five_star'],
+            "4_star": overall_dict['four_star'],
+            "3_star": overall_dict['three_star'],
+            "2_star": overall_dict['two_star'],
+            "1_star": overall_dict['one_star']
+        },
+        "event_feedback": event_feedback_list
+    }
+    
+    # Save JSON report
+    with atomic_write(f'{REPORTS_DIR}/feedback_analysis.json') as f:
+        json.dump(json_report, f, indent=2)
+    
+    # Save CSV report for event feedback
+    if event_feedback_list:
+        with atomic_write(f'{REPORTS_DIR}/feedback_by_event.csv', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=event_feedback_list[0].keys())
+            writer.writeheader()
+            writer.writerows(event_feedback_list)
+    
+    return json_report
+
+def query_summary_metrics(conn=None):
+    """Platform-wide totals from the database"""
+    conn, close_connection = report_connection(conn)
+    cursor = conn.cursor()
+    
+    # Key metrics
+    metrics = cursor.execute("""
+        SELECT 
+            (SELECT COUNT(*) FROM colleges) as total_colleges,
+            (SELECT COUNT(*) FROM students) as total_students,
+            (SELECT COUNT(*) FROM events) as total_events,
+            (SELECT COUNT(*) FROM registrations) as total_registrations,
+            (SELECT COUNT(*) FROM attendance WHERE attended = 1) as total_attendance,
+            (SELECT COUNT(*) FROM feedback) as total_feedback,
+            (SELECT AVG(rating) FROM feedback) as avg_rating,
+            (SELECT COUNT(*) FROM registrations) - (SELECT COUNT(*) FROM attendance WHERE attended = 1) as no_shows
+    """).fetchone()
+    
+    close_connection()
+    
+    return dict(metrics)
+
+def generate_summary_dashboard(metrics_dict=None, conn=None):
+    """Generate Executive Summary Dashboard"""
+    if metrics_dict is None:
+        metrics_dict = query_summary_metrics(conn)
+    
+    # Calculate derived metrics
+    attendance_rate = round((metrics_dict['total_attendance'] / metrics_dict['total_registrations']) * 100, 2) if metrics_dict['total_registrations'] > 0 else 0
+    feedback_rate = round((metrics_dict['total_feedback'] / metrics_dict['total_attendance']) * 100, 2) if metrics_dict['total_attendance'] > 0 else 0
+    avg_registrations_per_event = round(metrics_dict['total_registrations'] / metrics_dict['total_events'], 2) if metrics_dict['total_events'] > 0 else 0
+    avg_events_per_student = round(metrics_dict['total_registrations'] / metrics_dict['total_students'], 2) if metrics_dict['total_students'] > 0 else 0
+    
+    if metrics_dict['avg_rating']:
+        metrics_dict['avg_rating'] = round(metrics_dict['avg_rating'], 2)
+    
+    # Generate dashboard report
+    dashboard = {
+        "report_name": "Executive Summary Dashboard",
+        "generated_at": datetime.now().isoformat(),
+        "key_metrics": {
+            "platform_overview": {
+                "total_colleges": metrics_dict['total_colleges'],
+                "total_students": metrics_dict['total_students'],
+                "total_events": metrics_dict['total_events']
+            },
+            "engagement_metrics": {
+                "total_registrations": metrics_dict['total_registrations'],
+                "total_attendance": metrics_dict['total_attendance'],
+                "attendance_rate_percentage": attendance_rate,
+                "no_shows": metrics_dict['no_shows']
+            },
+            "feedback_metrics": {
+                "total_feedback_submissions": metrics_dict['total_feedback'],
+                "feedback_rate_percentage": feedback_rate,
+                "average_rating": metrics_dict['avg_rating']
+            },
+            "efficiency_metrics": {
+                "avg_registrations_per_event": avg_registrations_per_event,
+                "avg_events_per_student": avg_events_per_student
+            }
+        },
+        "health_indicators": {
+            "engagement_health": "Good" if attendance_rate > 70 else "Needs Improvement" if attendance_rate > 50 else "Poor",
+            "feedback_health": "Excellent" if feedback_rate > 80 else "Good" if feedback_rate > 60 else "Needs Improvement",
+            "satisfaction_health": "Excellent" if metrics_dict['avg_rating'] and metrics_dict['avg_rating'] >= 4.0 else "Good" if metrics_dict['avg_rating'] and metrics_dict['avg_rating'] >= 3.5 else "Needs Improvement"
+        }
+    }
+    
+    # Save dashboard report
+    with atomic_write(f'{REPORTS_DIR}/summary_dashboard.json') as f:
+        json.dump(dashboard, f, indent=2)
+    
+    return dashboard
+
+def compute_from_snapshot(snapshot_path, top_n=DEFAULT_TOP_N):
+    """Compute every report input from a columnar snapshot file"""
+    snapshot = Snapshot(snapshot_path)
+    print(f"\nReading snapshot {snapshot_path} (created {snapshot.created_at})...")
+    computed = analytics.compute_reports_from_facts(
+        analytics.load_snapshot_facts(snapshot),
+        analytics.load_snapshot_dimensions(snapshot),
+        top_n,
+    )
+    computed['sample_comments'] = analytics.snapshot_sample_comments(
+        snapshot, SAMPLE_COMMENTS_PER_EVENT, SAMPLE_COMMENT_LENGTH)
+    snapshot.close()
+    return computed
+
+def compute_on(conn, engine, top_n=DEFAULT_TOP_N):
+    """Compute every report input on one connection with the chosen engine"""
+    if engine == 'numpy' and analytics.HAVE_NUMPY:
+        computed = analytics.compute_reports(conn, top_n)
+        computed['sample_comments'] = query_sample_comments(conn)
+        return computed
+    return query_reports(conn, top_n)
+
+@contextmanager
+def report_source(consistency=None, include_archive=False):
+    """The connection every report reads from: a point-in-time view with a
+    consistency mode, live and archived events with include_archive, or
+    simply the database
+    
+    Reports are read and written one at a time, so the connection stays
+    open for the whole run.
+    """
+    if consistency:
+        print(f"\nReading a consistent view of the database ({consistency})...")
+        with consistent_connection(consistency) as conn:
+            yield conn
+        return
+    conn = get_db_connection()
+    try:
+        if include_archive:
+            if union_archive(conn, archive_path(DATABASE)):
+                print("\nIncluding archived events (see archive.py)...")
+            else:
+                print("\nNo archive database found; reporting live events only")
+        yield conn
+    finally:
+        conn.close()
+
+def main(engine='sql', snapshot_path=None, consistency=None, top_n=DEFAULT_TOP_N,
+         include_archive=False):
+    """Generate all reports"""
+    print("=" * 60)
+    print(" GENERATING COMPREHENSIVE REPORTS")
+    print("=" * 60)
+    
+    ensure_reports_directory()
+    earlier_files = report_file_stats()
+    
+    # A snapshot replaces the database entirely; otherwise make sure the
+    # schema (indexes) is current. The NumPy engine loads the fact columns
+    # once and computes every report from them; the SQL engine runs one
+    # query per report on a shared connection and streams the per-event and
+    # per-student rows straight into the files. With a consistency mode
+    # every report reads the same point in time.
+    with ExitStack() as stack:
+        computed = {}
+        conn = None
+        if snapshot_path:
+            computed = compute_from_snapshot(snapshot_path, top_n)
+            # Snapshot data cannot be compared with the database; it only dates the run
+            with Snapshot(snapshot_path) as snapshot:
+                watermark = {"as_of": snapshot.created_at}
+        else:
+            conn = get_db_connection()
+            apply_migrations(conn)
+            # Taken before any report is read: changes made during the run make
+            # the published reports stale rather than silently current
+            watermark = data_watermark(conn)
+            conn.close()
+            if engine == 'numpy' and not analytics.HAVE_NUMPY:
+                print("\nNumPy is not installed; falling back to the SQL engine")
+            conn = stack.enter_context(report_source(consistency, include_archive))
+            if engine == 'numpy' and analytics.HAVE_NUMPY:
+                print("\nLoading fact columns for the NumPy analytics engine...")
+                computed = compute_on(conn, engine, top_n)
+        
+        # Generate all reports
+        reports = []
+        
+        print("\n1. Generating Event Popularity Report...")
+        reports.append(generate_event_popularity_report(computed.get('event_popularity'), conn))
+        
+        print("2. Generating Student Participation Report...")
+        reports.append(generate_student_participation_report(computed.get('student_participation'), conn))
+        
+        print(f"3. Generating Top {top_n} Students Report...")
+        reports.append(generate_top_students_report(computed.get('top_students'), top_n, conn))
+        
+        print("4. Generating Event Type Analysis...")
+        reports.append(generate_event_type_analysis(computed.get('event_type_analysis'), conn))
+        
+        print("5. Generating College Statistics...")
+        reports.append(generate_college_statistics(computed.get('college_statistics'), conn))
+        
+        print("6. Generating Feedback Analysis...")
+        reports.append(generate_feedback_analysis(computed.get('feedback_overall'),
+                                                  computed.get('feedback_by_event'),
+                                                  computed.get('sample_comments'), conn))
+        
+        print("7. Generating Summary Dashboard...")
+        reports.append(generate_summary_dashboard(computed.get('summary_metrics'), conn))
+    
+    # Published last: the API only serves files the manifest vouches for,
+    # and leftovers from earlier runs are not among them
+    manifest = publish_manifest(REPORTS_DIR, report_files(earlier_files), watermark,
+                                engine=engine, include_archive=include_archive, top_n=top_n)
+    print(f"8. Published {MANIFEST_NAME} (data as of {watermark['as_of']})")
+    
+    print(f"\n{'='*60}")
+    print(" REPORT GENERATION COMPLETED")
+    print(f"{'='*60}")
+    
+    print(f"\nAll reports have been saved to the '{REPORTS_DIR}/' directory:")
+    print("JSON Reports:")
+    for filename in manifest['files']:
+        if filename.endswith('.json'):
+            print(f"  - {filename}")
+    
+    print("\nCSV Reports:")
+    for filename in manifest['files']:
+        if filename.endswith('.csv'):
+            print(f"  - {filename}")
+    
+    print(f"\nTotal files generated: {len(manifest['files'])}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate JSON and CSV reports")
+    parser.add_argument('--profile', action='store_true',
+                        help="run under cProfile and save stats to profiles/")
+    parser.add_argument('--engine', choices=['sql', 'numpy'], default='sql',
+                        help="compute aggregates with SQL queries or the NumPy engine")
+    parser.add_argument('--snapshot', metavar='PATH',
+                        help="read a columnar snapshot (see snapshot.py) instead of the database")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP_N, metavar='N',
+                        help="number of students in the top students report")
+    parser.add_argument('--consistent', choices=['backup', 'wal'],
+                        help="read every report from one point-in-time view of the database")
+    parser.add_argument('--include-archive', action='store_true',
+                        help="report on archived events too (see archive.py)")
+    args = parser.parse_args()
+    
+    if args.snapshot and not analytics.HAVE_NUMPY:
+        parser.error("--snapshot needs NumPy installed")
+    if args.include_archive and (args.snapshot or args.consistent):
+        parser.error("--include-archive reads the live and archive databases directly; "
+                     "it cannot be combined with --snapshot or --consistent")
+    
+    if args.profile:
+        with profiled('generate_reports'):
+            main(args.engine, args.snapshot, args.consistent, args.top, args.include_archive)
+    else:
+        main(args.engine, args.snapshot, args.consistent, args.top, args.include_archive)
\ No newline at end of file
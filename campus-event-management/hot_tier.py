@@ -0,0 +1,366 @@
+"""
+In-memory hot tier for Campus Event Management Platform
+On Fest day nearly every request is about a handful of events. With
+CAMPUS_HOT_EVENTS set (comma-separated event ids), the API pins those
+events' registrations and check-ins in memory: registering, checking in and
+reading an event's registration count are answered from memory, and the
+changes are written to the database behind the requests, one batch per
+durability window (CAMPUS_HOT_TIER_WINDOW seconds, default 1).
+
+Every accepted change is first appended to a journal file next to the
+database (campus_events_hot.journal), which reaches the operating system
+before the request is answered. If the server dies before a flush, the next
+start replays the journal into the database before loading the tier, so a
+crashed process loses nothing; a power cut loses at most one window, since
+the journal is synced to disk once per window. A batch the database keeps
+refusing (other than for being busy) is applied change by change after
+MAX_FLUSH_ATTEMPTS tries, and the changes that fail are moved to
+campus_events_hot.journal.rejected with their errors.
+
+Registration ids are handed out from blocks reserved in the database's
+AUTOINCREMENT counter, so ids returned to clients are final and never
+collide with registrations written directly.
+
+Only one process may hold the tier: run app.py or serve.py --workers 1.
+Reads the tier does not serve (reports, listings, the change feed, live
+streams) see pinned events' changes once they are flushed, at most one
+window later; the registration list and feedback flush first.
+
+Usage: python hot_tier.py recover    # replay a journal left by a crashed server
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+DATABASE = 'campus_events.db'
+HOT_EVENTS_ENV = 'CAMPUS_HOT_EVENTS'
+HOT_TIER_WINDOW_ENV = 'CAMPUS_HOT_TIER_WINDOW'
+
+DEFAULT_WINDOW_SECONDS = 1.0
+# Registration ids reserved from the database per round trip
+ID_BLOCK = 1000
+BUSY_TIMEOUT_SECONDS = 5
+# A batch that fails this many flushes in a row for a reason other than a
+# busy database is applied one change at a time; changes that still fail
+# are set aside in the rejected file instead of blocking every later change
+MAX_FLUSH_ATTEMPTS = 3
+
+
+def hot_events():
+    """Event ids to pin from the environment, or None (tier disabled)"""
+    value = os.environ.get(HOT_EVENTS_ENV, '')
+    events = [int(part) for part in value.split(',') if part.strip().isdigit()]
+    return events or None
+
+
+def hot_tier_window():
+    """Durability window in seconds from the environment, or the default"""
+    value = os.environ.get(HOT_TIER_WINDOW_ENV)
+    return float(value) if value else DEFAULT_WINDOW_SECONDS
+
+
+def journal_path(database=DATABASE):
+    """Write-behind journal kept next to the database"""
+    return os.path.splitext(database)[0] + '_hot.journal'
+
+
+def _now():
+    # Same format and clock (UTC) as CURRENT_TIMESTAMP
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def apply_changes(conn, changes):
+    """Write journaled changes in one transaction; replaying them again is
+    harmless. Repeated check-ins of one registration keep the last."""
+    registrations = [(change['id'], change['student_id'], change['event_id'], change['at'])
+                     for change in changes if change['op'] == 'register']
+    check_ins = {}
+    for change in changes:
+        if change['op'] == 'attend':
+            check_ins[change['registration_id']] = (change['registration_id'], change['attended'], change['at'])
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany("""
+            INSERT OR IGNORE INTO registrations (id, student_id, event_id, registered_at)
+            VALUES (?, ?, ?, ?)
+        """, registrations)
+        # Upsert, as the attendance endpoint does, so UPDATE triggers fire;
+        # a repeated mark keeps its marked_at (and timeline bucket)
+        conn.executemany("""
+            INSERT INTO attendance (registration_id, attended, marked_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT (registration_id) DO UPDATE SET
+                attended = excluded.attended,
+                marked_at = CASE WHEN attended IS excluded.attended
+                                 THEN marked_at ELSE excluded.marked_at END
+        """, check_ins.values())
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _busy(error):
+    return isinstance(error, sqlite3.OperationalError) and (
+        'locked' in str(error) or 'busy' in str(error))
+
+
+def apply_each(conn, changes, rejected_path):
+    """Apply changes one at a time, appending any that fail to rejected_path
+    with the error; returns how many were rejected. A busy database is
+    raised, since retrying the whole batch later is harmless."""
+    rejected = 0
+    for change in changes:
+        try:
+            apply_changes(conn, [change])
+        except Exception as e:
+            if _busy(e):
+                raise
+            with open(rejected_path, 'a') as f:
+                f.write(json.dumps({"change": change, "error": str(e)}) + '\n')
+            rejected += 1
+    if rejected:
+        print(f"Hot tier rejected {rejected} of {len(changes)} changes; see {rejected_path}")
+    return rejected
+
+
+def read_journal(path):
+    """Changes in a journal file; a torn last line (crash mid-write) is skipped"""
+    changes = []
+    if not os.path.exists(path):
+        return changes
+    with open(path) as f:
+        for line in f:
+            try:
+                changes.append(json.loads(line))
+            except ValueError:
+                break
+    return changes
+
+
+def recover(conn, path):
+    """Replay journals left by a server that stopped before flushing them;
+    returns the number of changes replayed"""
+    replayed = 0
+    for leftover in (path + '.flushing', path):
+        changes = read_journal(leftover)
+        if changes:
+            try:
+                apply_changes(conn, changes)
+            except Exception as e:
+                if _busy(e):
+                    raise
+                apply_each(conn, changes, path + '.rejected')
+            replayed += len(changes)
+        if os.path.exists(leftover):
+            os.remove(leftover)
+    return replayed
+
+
+class _HotEvent:
+    __slots__ = ('event_id', 'max_capacity', 'students', 'attended')
+
+    def __init__(self, event_id, max_capacity):
+        self.event_id = event_id
+        self.max_capacity = max_capacity
+        self.students = {}      # student_id -> registration_id
+        self.attended = {}      # registration_id -> attended
+
+
+class HotTier:
+    """Pinned events in memory, written behind to the database"""
+
+    def __init__(self, database, event_ids, window=DEFAULT_WINDOW_SECONDS, path=None):
+        self.database = database
+        self.window = window
+        self.path = path or journal_path(database)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._conn = sqlite3.connect(database, isolation_level=None, check_same_thread=False,
+                                     timeout=BUSY_TIMEOUT_SECONDS)
+        self.recovered = recover(self._conn, self.path)
+
+        self._events = {}
+        self._registrations = {}    # registration_id -> _HotEvent
+        for event_id in event_ids:
+            self._load(event_id)
+        # Empty until the first registration reserves a block
+        self._next_id, self._block_end = 1, 0
+        self._pending = []
+        self._journal = open(self.path, 'a')
+        self._stop = threading.Event()
+        self._thread = None
+        self.flushes = 0
+        self.flushed_changes = 0
+        self.max_flush_ms = 0.0
+        self.failed_flushes = 0
+        self.rejected_changes = 0
+
+    def _load(self, event_id):
+        row = self._conn.execute("SELECT max_capacity FROM events WHERE id = ?", (event_id,)).fetchone()
+        if row is None:
+            return
+        event = self._events[event_id] = _HotEvent(event_id, row[0])
+        for registration_id, student_id in self._conn.execute(
+                "SELECT id, student_id FROM registrations WHERE event_id = ?", (event_id,)):
+            event.students[student_id] = registration_id
+            self._registrations[registration_id] = event
+        for registration_id, attended in self._conn.execute("""
+                SELECT a.registration_id, a.attended FROM attendance a
+                JOIN registrations r ON r.id = a.registration_id
+                WHERE r.event_id = ?""", (event_id,)):
+            event.attended[registration_id] = bool(attended)
+
+    def _reserve_ids(self):
+        """Move the registrations AUTOINCREMENT counter past a block of ids
+        for this tier to hand out"""
+        conn = sqlite3.connect(self.database, isolation_level=None, timeout=BUSY_TIMEOUT_SECONDS)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'registrations'").fetchone()
+            highest = conn.execute("SELECT COALESCE(MAX(id), 0) FROM registrations").fetchone()[0]
+            start = max(row[0] if row else 0, highest)
+            if row:
+                conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'registrations'",
+                             (start + ID_BLOCK,))
+            else:
+                conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('registrations', ?)",
+                             (start + ID_BLOCK,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        self._next_id, self._block_end = start + 1, start + ID_BLOCK
+
+    def start(self):
+        """Flush every window in a daemon thread"""
+        def loop():
+            while not self._stop.wait(self.window):
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"Hot tier flush failed, will retry: {e}")
+
+        self._thread = threading.Thread(target=loop, name='hot-tier-flush', daemon=True)
+        self._thread.start()
+        return self
+
+    def pins(self, event_id):
+        return event_id in self._events
+
+    def holds(self, registration_id):
+        return registration_id in self._registrations
+
+    def registration_count(self, event_id):
+        return len(self._events[event_id].students)
+
+    def _record(self, change):
+        # Called with self._lock held: journal order is the apply order
+        self._journal.write(json.dumps(change) + '\n')
+        self._journal.flush()
+        self._pending.append(change)
+
+    def register(self, event_id, student_id):
+        """Registration id of a new registration; ValueError when the event
+        is full or the student is already registered"""
+        with self._lock:
+            event = self._events[event_id]
+            if student_id in event.students:
+                raise ValueError("Student already registered for this event")
+            if event.max_capacity is not None and len(event.students) >= event.max_capacity:
+                raise ValueError("Event is at full capacity")
+            if self._next_id > self._block_end:
+                self._reserve_ids()
+            registration_id = self._next_id
+            self._next_id += 1
+            self._record({"op": "register", "id": registration_id, "student_id": student_id,
+                          "event_id": event_id, "at": _now()})
+            event.students[student_id] = registration_id
+            self._registrations[registration_id] = event
+        return registration_id
+
+    def mark_attendance(self, registration_id, attended):
+        with self._lock:
+            event = self._registrations[registration_id]
+            self._record({"op": "attend", "registration_id": registration_id,
+                          "attended": 1 if attended else 0, "at": _now()})
+            event.attended[registration_id] = bool(attended)
+
+    def flush(self):
+        """Write pending changes to the database now; returns how many"""
+        with self._flush_lock:
+            flushing = self.path + '.flushing'
+            if not os.path.exists(flushing):
+                with self._lock:
+                    if not self._pending:
+                        return 0
+                    # Changes arriving from here on go to a fresh journal
+                    journal = self._journal
+                    os.replace(self.path, flushing)
+                    self._journal = open(self.path, 'a')
+                    self._pending = []
+                os.fsync(journal.fileno())
+                journal.close()
+            # A batch whose flush failed last time is retried first
+            changes = read_journal(flushing)
+            start = time.perf_counter()
+            try:
+                apply_changes(self._conn, changes)
+            except Exception as e:
+                if _busy(e):
+                    raise
+                self.failed_flushes += 1
+                if self.failed_flushes < MAX_FLUSH_ATTEMPTS:
+                    raise
+                self.rejected_changes += apply_each(self._conn, changes, self.path + '.rejected')
+            self.failed_flushes = 0
+            os.remove(flushing)
+            self.max_flush_ms = max(self.max_flush_ms, (time.perf_counter() - start) * 1000)
+            self.flushes += 1
+            self.flushed_changes += len(changes)
+            return len(changes)
+
+    def close(self):
+        """Stop the flush thread and write everything still pending"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        self._journal.close()
+        if os.path.exists(self.path) and os.path.getsize(self.path) == 0:
+            os.remove(self.path)
+        self._conn.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "events": sorted(self._events),
+                "registrations": len(self._registrations),
+                "check_ins": sum(sum(event.attended.values()) for event in self._events.values()),
+                "pending_changes": len(self._pending),
+                "window_seconds": self.window,
+                "flushes": self.flushes,
+                "flushed_changes": self.flushed_changes,
+                "max_flush_ms": round(self.max_flush_ms, 2),
+                "rejected_changes": self.rejected_changes,
+                "recovered_changes": self.recovered
+            }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the hot tier's write-behind journal")
+    parser.add_argument('command', choices=['recover'])
+    parser.add_argument('--database', default=DATABASE)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.database, isolation_level=None, timeout=BUSY_TIMEOUT_SECONDS)
+    replayed = recover(conn, journal_path(args.database))
+    conn.close()
+    print(f"Replayed {replayed} journaled changes into {args.database}")
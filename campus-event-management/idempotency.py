@@ -0,0 +1,283 @@
+"""
+Idempotency keys for Campus Event Management Platform
+Clients that may retry a POST (check-in scanners, mobile apps on campus
+Wi-Fi) send an Idempotency-Key header. The first request with a key runs as
+usual and its response is remembered; a retry with the same key and the same
+body gets that response back, marked Idempotent-Replayed: true, without
+reading or writing the registration tables. So a retried registration
+returns its 201 again instead of "already registered".
+
+    409  the first request with this key is still running
+    422  the key was already used for a different request
+
+Responses with status 500 and above (including 503 for a locked database)
+are not remembered, so the retry runs again.
+
+Two stores with the same interface:
+
+    IdempotencyStore        in memory, per process; at most max_entries keys,
+                            each kept for ttl seconds
+    SharedIdempotencyStore  a small SQLite file next to the database, for
+                            serve.py with several worker processes, where a
+                            retry may reach a different worker
+
+Usage: python idempotency.py purge    # drop expired keys from the shared store
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+DATABASE = 'campus_events.db'
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 50_000
+# Larger responses are not remembered; a retry simply runs again
+MAX_RESPONSE_BYTES = 16 * 1024
+# A first request still unfinished after this long is presumed dead (its
+# worker crashed) and a retry may take over the key
+IN_PROGRESS_SECONDS = 30
+# The shared store trims expired and surplus keys every this many new keys
+PURGE_EVERY = 1000
+
+# begin() outcomes
+NEW = 'new'
+REPLAY = 'replay'
+IN_PROGRESS = 'in_progress'
+MISMATCH = 'mismatch'
+
+SavedResponse = namedtuple('SavedResponse', ['status', 'body', 'content_type'])
+
+
+def request_fingerprint(method, path, body):
+    """Digest of what a key was first used for"""
+    digest = hashlib.sha256(f"{method} {path}\n".encode())
+    digest.update(body or b'')
+    return digest.digest()
+
+
+def idempotency_path(database=DATABASE):
+    """Shared key store kept next to the database"""
+    return os.path.splitext(database)[0] + '_idempotency.db'
+
+
+class _Entry:
+    __slots__ = ('fingerprint', 'response', 'started', 'expires_at')
+
+    def __init__(self, fingerprint, started, expires_at):
+        self.fingerprint = fingerprint
+        self.response = None
+        self.started = started
+        self.expires_at = expires_at
+
+
+class IdempotencyStore:
+    """Bounded in-memory key store, oldest keys evicted first
+
+    Every key lives for the same ttl from its first use, so insertion order
+    is also expiry order and eviction only ever looks at the front.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.replays = 0
+        self.evictions = 0
+
+    def _evict(self, now):
+        entries = self._entries
+        while entries:
+            key, entry = next(iter(entries.items()))
+            if entry.expires_at > now and len(entries) < self.max_entries:
+                break
+            del entries[key]
+            self.evictions += 1
+
+    def begin(self, key, fingerprint):
+        """(outcome, SavedResponse or None); NEW reserves the key until
+        complete() or release()"""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._evict(now)
+                self._entries[key] = _Entry(fingerprint, now, now + self.ttl)
+                return NEW, None
+            if entry.fingerprint != fingerprint:
+                return MISMATCH, None
+            if entry.response is not None:
+                self.replays += 1
+                return REPLAY, entry.response
+            if now - entry.started < IN_PROGRESS_SECONDS:
+                return IN_PROGRESS, None
+            entry.started = now
+            return NEW, None
+
+    def complete(self, key, fingerprint, status, body, content_type):
+        """Remember the response to a request begun with key"""
+        if status >= 500 or len(body) > MAX_RESPONSE_BYTES:
+            self.release(key)
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.fingerprint == fingerprint:
+                entry.response = SavedResponse(status, bytes(body), content_type)
+
+    def release(self, key):
+        """Forget a key whose request failed, so a retry runs again"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.response is None:
+                del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            body_bytes = sum(len(entry.response.body) for entry in self._entries.values()
+                             if entry.response is not None)
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "response_bytes": body_bytes,
+                "replays": self.replays,
+                "evictions": self.evictions
+            }
+
+
+IDEMPOTENCY_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS idempotency_keys (
+        key TEXT PRIMARY KEY,
+        fingerprint BLOB NOT NULL,
+        status INTEGER,
+        body BLOB,
+        content_type TEXT,
+        started REAL NOT NULL,
+        expires_at REAL NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at ON idempotency_keys(expires_at);
+"""
+
+
+class SharedIdempotencyStore:
+    """Key store in its own SQLite file, shared by worker processes
+
+    Kept apart from the main database so remembering a response never waits
+    for (or holds) the lock registrations and check-ins write under. Rows
+    with a NULL status are reservations of requests still running.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        self._new_keys = 0
+        conn = self._connection()
+        conn.executescript(IDEMPOTENCY_SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=5)
+            conn.execute("PRAGMA journal_mode = WAL")
+            # Losing the last few keys in a power cut only means a retry runs again
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def begin(self, key, fingerprint):
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("""
+                SELECT fingerprint, status, body, content_type, started, expires_at
+                FROM idempotency_keys WHERE key = ?
+            """, (key,)).fetchone()
+            if row is not None and row[5] <= now:
+                conn.execute("DELETE FROM idempotency_keys WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                conn.execute("""
+                    INSERT INTO idempotency_keys (key, fingerprint, started, expires_at)
+                    VALUES (?, ?, ?, ?)
+                """, (key, fingerprint, now, now + self.ttl))
+                outcome = NEW
+            elif row[0] != fingerprint:
+                outcome = MISMATCH
+            elif row[1] is not None:
+                outcome = REPLAY
+            elif now - row[4] < IN_PROGRESS_SECONDS:
+                outcome = IN_PROGRESS
+            else:
+                conn.execute("UPDATE idempotency_keys SET started = ? WHERE key = ?", (now, key))
+                outcome = NEW
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if outcome == NEW and row is None:
+            self._new_keys += 1
+            if self._new_keys % PURGE_EVERY == 0:
+                self.purge()
+        if outcome == REPLAY:
+            return outcome, SavedResponse(row[1], row[2], row[3])
+        return outcome, None
+
+    def complete(self, key, fingerprint, status, body, content_type):
+        if status >= 500 or len(body) > MAX_RESPONSE_BYTES:
+            self.release(key)
+            return
+        self._connection().execute("""
+            UPDATE idempotency_keys SET status = ?, body = ?, content_type = ?
+            WHERE key = ? AND fingerprint = ?
+        """, (status, bytes(body), content_type, key, fingerprint))
+
+    def release(self, key):
+        self._connection().execute(
+            "DELETE FROM idempotency_keys WHERE key = ? AND status IS NULL", (key,))
+
+    def purge(self):
+        """Drop expired keys, then the oldest beyond max_entries"""
+        conn = self._connection()
+        expired = conn.execute("DELETE FROM idempotency_keys WHERE expires_at <= ?",
+                               (time.time(),)).rowcount
+        surplus = conn.execute("""
+            DELETE FROM idempotency_keys WHERE key IN (
+                SELECT key FROM idempotency_keys ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,)).rowcount
+        return expired + surplus
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM idempotency_keys").fetchone()[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the shared idempotency key store")
+    parser.add_argument('command', choices=['purge'])
+    parser.add_argument('--database', default=DATABASE)
+    args = parser.parse_args()
+
+    store = SharedIdempotencyStore(idempotency_path(args.database))
+    removed = store.purge()
+    print(f"Removed {removed} keys; {len(store)} remain in {store.path}")
@@ -0,0 +1,192 @@
+"""
+Top-students leaderboard for Campus Event Management Platform
+Per-student counters (registrations, events attended, feedback given),
+overall and per event type, kept current by triggers (installed by
+migrations.py) on every registration, attendance and feedback write.
+Indexes in ranking order let a top-N read walk N index entries instead of
+aggregating every registration.
+
+Rows are never deleted by the application; after deleting or bulk-loading
+rows with the triggers absent, rebuild the counters:
+
+Usage: python leaderboard.py backfill
+"""
+
+import argparse
+import sqlite3
+
+DATABASE = 'campus_events.db'
+
+DEFAULT_TOP_N = 3
+MAX_TOP_N = 100
+
+# Ranking: events attended, then registrations, then feedback submissions,
+# then student id for a stable order
+RANK_COLUMNS = "events_attended DESC, registrations DESC, feedback_count DESC, student_id"
+
+COUNTERS = ['registrations', 'events_attended', 'feedback_count', 'rating_sum']
+
+
+def _bump(registration_sql, registrations=0, events_attended=0, feedback_count=0, rating_sum=0):
+    """SQL adding the given amounts to the counters of a registration's student"""
+    values = f"{registrations}, {events_attended}, {feedback_count}, {rating_sum}"
+    updates = ', '.join(f"{name} = {name} + excluded.{name}" for name in COUNTERS)
+    return f"""
+        INSERT INTO student_stats (student_id, college_id, {', '.join(COUNTERS)})
+        SELECT r.student_id, s.college_id, {values}
+        FROM registrations r JOIN students s ON s.id = r.student_id
+        WHERE r.id = {registration_sql}
+        ON CONFLICT (student_id) DO UPDATE SET {updates};
+
+        INSERT INTO student_type_stats (student_id, event_type, college_id, {', '.join(COUNTERS)})
+        SELECT r.student_id, e.event_type, s.college_id, {values}
+        FROM registrations r
+        JOIN students s ON s.id = r.student_id
+        JOIN events e ON e.id = r.event_id
+        WHERE r.id = {registration_sql}
+        ON CONFLICT (student_id, event_type) DO UPDATE SET {updates};"""
+
+
+def _counter_columns():
+    return ',\n'.join(f"        {name} INTEGER NOT NULL DEFAULT 0" for name in COUNTERS)
+
+
+LEADERBOARD_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS student_stats (
+        student_id INTEGER PRIMARY KEY,
+        college_id INTEGER NOT NULL,
+{_counter_columns()}
+    );
+
+    CREATE TABLE IF NOT EXISTS student_type_stats (
+        student_id INTEGER NOT NULL,
+        event_type TEXT NOT NULL,
+        college_id INTEGER NOT NULL,
+{_counter_columns()},
+        PRIMARY KEY (student_id, event_type)
+    ) WITHOUT ROWID;
+
+    CREATE INDEX IF NOT EXISTS idx_student_stats_rank ON student_stats ({RANK_COLUMNS});
+    CREATE INDEX IF NOT EXISTS idx_student_stats_college_rank
+        ON student_stats (college_id, {RANK_COLUMNS});
+    CREATE INDEX IF NOT EXISTS idx_student_type_stats_rank
+        ON student_type_stats (event_type, {RANK_COLUMNS});
+    CREATE INDEX IF NOT EXISTS idx_student_type_stats_college_rank
+        ON student_type_stats (event_type, college_id, {RANK_COLUMNS});
+
+    CREATE TRIGGER IF NOT EXISTS leaderboard_registration AFTER INSERT ON registrations BEGIN
+        {_bump('new.id', registrations=1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS leaderboard_attendance AFTER INSERT ON attendance
+    WHEN new.attended = 1 BEGIN
+        {_bump('new.registration_id', events_attended=1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS leaderboard_attendance_update AFTER UPDATE OF attended ON attendance
+    WHEN new.attended = 1 AND old.attended IS NOT 1 BEGIN
+        {_bump('new.registration_id', events_attended=1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS leaderboard_attendance_undo AFTER UPDATE OF attended ON attendance
+    WHEN old.attended = 1 AND new.attended IS NOT 1 BEGIN
+        {_bump('old.registration_id', events_attended=-1)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS leaderboard_feedback AFTER INSERT ON feedback BEGIN
+        {_bump('new.registration_id', feedback_count=1, rating_sum='new.rating')}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS leaderboard_feedback_update AFTER UPDATE OF rating ON feedback BEGIN
+        {_bump('new.registration_id', rating_sum='new.rating - old.rating')}
+    END;
+"""
+
+
+def _backfill(table, key_columns, key_sql, joins):
+    return f"""
+        INSERT INTO {table} ({key_columns}, college_id, {', '.join(COUNTERS)})
+        SELECT {key_sql}, s.college_id,
+               COUNT(*),
+               COUNT(CASE WHEN a.attended = 1 THEN 1 END),
+               COUNT(f.id),
+               COALESCE(SUM(f.rating), 0)
+        FROM registrations r
+        JOIN students s ON s.id = r.student_id
+        {joins}
+        LEFT JOIN attendance a ON a.registration_id = r.id
+        LEFT JOIN feedback f ON f.registration_id = r.id
+        GROUP BY {key_sql};"""
+
+
+BACKFILL_SQL = '\n'.join([
+    "DELETE FROM student_stats;",
+    "DELETE FROM student_type_stats;",
+    _backfill('student_stats', 'student_id', 'r.student_id', ''),
+    _backfill('student_type_stats', 'student_id, event_type', 'r.student_id, e.event_type',
+              'JOIN events e ON e.id = r.event_id'),
+])
+
+
+def backfill_leaderboard(conn):
+    """Rebuild every counter from the registrations, attendance and feedback tables"""
+    conn.executescript(f"BEGIN;\n{BACKFILL_SQL}\nCOMMIT;")
+
+
+def top_students(conn, limit=DEFAULT_TOP_N, college_id=None, event_type=None):
+    """Return the top limit students who attended at least one event, ranked
+
+    college_id restricts the board to one college's students; event_type
+    ranks by activity in events of that type only.
+    """
+    table = 'student_type_stats' if event_type else 'student_stats'
+    query = f"""
+        SELECT s.id, s.name, s.email, c.name as college_name,
+               st.registrations as total_registrations,
+               st.events_attended,
+               CASE WHEN st.feedback_count > 0
+                    THEN st.rating_sum * 1.0 / st.feedback_count END as avg_feedback_rating,
+               st.feedback_count as feedback_submissions,
+               ROUND(st.events_attended * 100.0 / st.registrations, 2) as attendance_rate
+        FROM {table} st
+        JOIN students s ON s.id = st.student_id
+        JOIN colleges c ON c.id = s.college_id
+        WHERE st.events_attended > 0
+    """
+    params = []
+
+    if event_type:
+        query += " AND st.event_type = ?"
+        params.append(event_type)
+
+    if college_id:
+        query += " AND st.college_id = ?"
+        params.append(college_id)
+
+    query += """
+        ORDER BY st.events_attended DESC, st.registrations DESC,
+                 st.feedback_count DESC, st.student_id
+        LIMIT ?
+    """
+    params.append(limit)
+
+    results = []
+    for rank, row in enumerate(conn.execute(query, params).fetchall(), 1):
+        row_dict = dict(row)
+        if row_dict['avg_feedback_rating']:
+            row_dict['avg_feedback_rating'] = round(row_dict['avg_feedback_rating'], 2)
+        row_dict['rank'] = rank
+        results.append(row_dict)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the top-students leaderboard")
+    parser.add_argument('command', choices=['backfill'])
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DATABASE)
+    backfill_leaderboard(conn)
+    students = conn.execute("SELECT COUNT(*) FROM student_stats").fetchone()[0]
+    conn.close()
+    print(f"Rebuilt leaderboard: {students} students")
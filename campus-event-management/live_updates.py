@@ -0,0 +1,264 @@
+"""
+Live seat counts for Campus Event Management Platform
+GET /api/events/<id>/live is a server-sent-events stream of an event's
+registration count, seats left and check-ins, pushed as they change, so
+open event pages no longer poll GET /api/events/<id>.
+
+One publisher thread per process serves every stream. It polls the version
+stamps of the events someone is watching (event_versions.py bumps them in
+the same transaction as every registration and check-in, from any process)
+with a single query per interval, recounts only the events whose version
+moved, and hands the new counts to that event's subscribers. A burst of
+registrations between two polls becomes one update, and an event is pushed
+at most once per MIN_PUSH_INTERVAL however fast it fills up. A subscriber
+that falls behind just gets the latest counts next; nothing queues up.
+
+The number of open streams per process is capped (CAMPUS_LIVE_MAX_SUBSCRIBERS,
+default 1000); past it the endpoint answers 503 and pages keep polling.
+
+Usage: python live_updates.py 1    # print event 1's updates as they happen
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DATABASE = 'campus_events.db'
+MAX_SUBSCRIBERS_ENV = 'CAMPUS_LIVE_MAX_SUBSCRIBERS'
+
+DEFAULT_MAX_SUBSCRIBERS = 1000
+POLL_INTERVAL = 0.25
+MIN_PUSH_INTERVAL = 0.5
+# Comment lines sent on idle streams, so proxies keep them open and
+# closed tabs are noticed
+HEARTBEAT_SECONDS = 15
+# Reconnect delay suggested to browsers (EventSource retry field)
+RETRY_MS = 3000
+
+
+def seat_counts(conn, event_ids):
+    """{event_id: counts} for the given events; missing events are left out"""
+    placeholders = ','.join('?' * len(event_ids))
+    rows = conn.execute(f"""
+        SELECT e.id, e.max_capacity,
+               (SELECT COUNT(*) FROM registrations r WHERE r.event_id = e.id),
+               (SELECT COUNT(*) FROM registrations r
+                JOIN attendance a ON a.registration_id = r.id
+                WHERE r.event_id = e.id AND a.attended = 1),
+               COALESCE((SELECT version FROM event_versions v WHERE v.event_id = e.id), 0)
+        FROM events e
+        WHERE e.id IN ({placeholders})
+    """, list(event_ids)).fetchall()
+    return {
+        event_id: {
+            "event_id": event_id,
+            "registration_count": registrations,
+            "max_capacity": max_capacity,
+            "seats_left": max(0, max_capacity - registrations) if max_capacity is not None else None,
+            "attended_count": attended,
+            "version": version
+        }
+        for event_id, max_capacity, registrations, attended, version in rows
+    }
+
+
+def format_message(counts):
+    """One server-sent event; the id lets a reconnecting browser resume"""
+    if counts.get('deleted'):
+        return f"event: deleted\ndata: {json.dumps(counts)}\n\n"
+    return f"id: {counts['version']}\nevent: seats\ndata: {json.dumps(counts)}\n\n"
+
+
+def max_subscribers():
+    """Stream cap from the environment, or the default"""
+    value = os.environ.get(MAX_SUBSCRIBERS_ENV, '')
+    return int(value) if value.isdigit() else DEFAULT_MAX_SUBSCRIBERS
+
+
+class _Channel:
+    """Latest counts of one event and the streams watching it"""
+
+    def __init__(self, event_id):
+        self.event_id = event_id
+        self.changed = threading.Condition()
+        self.counts = None
+        self.version = -1
+        self.pushed_at = 0.0
+        self.subscribers = 0
+
+
+class Subscription:
+    """One open stream; next() blocks until there is something newer to send"""
+
+    def __init__(self, publisher, channel, last_version):
+        self._publisher = publisher
+        self._channel = channel
+        self.last_version = last_version
+        self.closed = False
+
+    def next(self, timeout=HEARTBEAT_SECONDS):
+        """The event's latest counts once they are newer than the last sent,
+        or None after timeout"""
+        channel = self._channel
+        with channel.changed:
+            channel.changed.wait_for(lambda: channel.version > self.last_version, timeout)
+            if channel.version <= self.last_version:
+                return None
+            self.last_version = channel.version
+            return channel.counts
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._publisher._unsubscribe(self._channel)
+
+
+class LivePublisher:
+    """Fans event count changes out from one polling thread to many streams"""
+
+    def __init__(self, database=DATABASE, max_subscribers=DEFAULT_MAX_SUBSCRIBERS,
+                 poll_interval=POLL_INTERVAL, min_push_interval=MIN_PUSH_INTERVAL):
+        self.database = database
+        self.max_subscribers = max_subscribers
+        self.poll_interval = poll_interval
+        self.min_push_interval = min_push_interval
+        self._lock = threading.Lock()
+        self._channels = {}
+        self._subscribers = 0
+        self._wake = threading.Event()
+        self._thread = None
+        self.polls = 0
+        self.poll_seconds = 0.0
+        self.failed_polls = 0
+        self.pushes = 0
+
+    def full(self):
+        """True while the subscriber cap is reached"""
+        with self._lock:
+            return self._subscribers >= self.max_subscribers
+
+    def subscribe(self, event_id, counts, last_version=-1):
+        """Open a stream on an event, starting from counts just read by the
+        caller; None when the subscriber cap is reached"""
+        with self._lock:
+            if self._subscribers >= self.max_subscribers:
+                return None
+            self._subscribers += 1
+            channel = self._channels.get(event_id)
+            if channel is None:
+                channel = self._channels[event_id] = _Channel(event_id)
+            channel.subscribers += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='live-publisher', daemon=True)
+                self._thread.start()
+        self._publish(channel, counts)
+        return Subscription(self, channel, last_version)
+
+    def _unsubscribe(self, channel):
+        with self._lock:
+            self._subscribers -= 1
+            channel.subscribers -= 1
+            if channel.subscribers == 0 and self._channels.get(channel.event_id) is channel:
+                del self._channels[channel.event_id]
+
+    def notify(self):
+        """A write just committed in this process: poll now rather than at
+        the next interval"""
+        if self._subscribers:
+            self._wake.set()
+
+    def _publish(self, channel, counts):
+        with channel.changed:
+            if counts['version'] <= channel.version:
+                return
+            channel.counts = counts
+            channel.version = counts['version']
+            channel.pushed_at = time.monotonic()
+            channel.changed.notify_all()
+        self.pushes += 1
+
+    def poll(self, conn):
+        """Check every watched event once; returns the number pushed"""
+        with self._lock:
+            channels = list(self._channels.values())
+        if not channels:
+            return 0
+        self.polls += 1
+        placeholders = ','.join('?' * len(channels))
+        versions = dict(conn.execute(f"""
+            SELECT event_id, version FROM event_versions WHERE event_id IN ({placeholders})
+        """, [channel.event_id for channel in channels]).fetchall())
+
+        now = time.monotonic()
+        due = [channel for channel in channels
+               if versions.get(channel.event_id, 0) != channel.version
+               and now - channel.pushed_at >= self.min_push_interval]
+        if not due:
+            return 0
+        counts = seat_counts(conn, [channel.event_id for channel in due])
+        for channel in due:
+            if channel.event_id in counts:
+                self._publish(channel, counts[channel.event_id])
+            else:
+                # Deleted: one last message, after which the streams end
+                self._publish(channel, {"event_id": channel.event_id, "deleted": True,
+                                        "version": channel.version + 1})
+        return len(due)
+
+    def _run(self):
+        conn = None
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            start = time.perf_counter()
+            # Whatever goes wrong, keep polling: this thread ending would
+            # silently freeze every stream in the process
+            try:
+                if conn is None:
+                    conn = sqlite3.connect(self.database)
+                self.poll(conn)
+            except Exception as e:
+                self.failed_polls += 1
+                print(f"Live publisher poll failed, will retry: {e!r}")
+            self.poll_seconds += time.perf_counter() - start
+
+    def stats(self):
+        with self._lock:
+            return {
+                "subscribers": self._subscribers,
+                "max_subscribers": self.max_subscribers,
+                "events_watched": len(self._channels),
+                "polls": self.polls,
+                "poll_seconds": round(self.poll_seconds, 3),
+                "failed_polls": self.failed_polls,
+                "pushes": self.pushes
+            }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Follow an event's live seat counts")
+    parser.add_argument('event_id', type=int)
+    parser.add_argument('--database', default=DATABASE)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.database)
+    counts = seat_counts(conn, [args.event_id]).get(args.event_id)
+    conn.close()
+    if counts is None:
+        print(f"Event {args.event_id} not found")
+        raise SystemExit(1)
+
+    publisher = LivePublisher(args.database)
+    subscription = publisher.subscribe(args.event_id, counts)
+    try:
+        while True:
+            counts = subscription.next()
+            if counts is not None:
+                print(format_message(counts), end='', flush=True)
+                if counts.get('deleted'):
+                    break
+    except KeyboardInterrupt:
+        pass
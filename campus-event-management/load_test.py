@@ -0,0 +1,349 @@
+"""
+Load generator for Campus Event Management Platform
+Replays traffic scenarios with a pool of concurrent workers, either against
+the app in-process (on a temporary copy of the database by default) or
+against a running server over HTTP:
+
+    registration-storm   registrations opening for a few popular events
+    check-in-burst       a door check-in rush for one event
+    dashboard-polling    organisers refreshing event pages and reports
+
+Each scenario reports throughput, p50/p95/p99 latency, error rates and
+database-lock errors (503 responses). --json prints the results as one JSON
+document and --output appends it as a line to a history file.
+
+Usage: python load_test.py [scenario ...] [--workers 16] [--duration 10]
+       python load_test.py --url http://localhost:8000 --workers 32
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from benchmarks import percentile
+
+DATABASE = 'campus_events.db'
+
+DEFAULT_WORKERS = 8
+DEFAULT_DURATION_SECONDS = 10
+DEFAULT_STUDENTS = 2000
+STORM_EVENTS = 5
+REQUEST_TIMEOUT_SECONDS = 30
+
+
+class InProcessClient:
+    """Requests through Flask's test client"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None, content_type=None):
+        if content_type:
+            response = self.client.open(path, method=method, data=body, content_type=content_type)
+        else:
+            response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpClient:
+    """Requests over one keep-alive HTTP connection"""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.connection = None
+
+    def request(self, method, path, body=None, content_type=None):
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.host, self.port,
+                                                         timeout=REQUEST_TIMEOUT_SECONDS)
+        headers = {}
+        if body is not None:
+            if content_type is None:
+                body, content_type = json.dumps(body), 'application/json'
+            headers['Content-Type'] = content_type
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = None
+            # Status 0: no response (connection refused, reset, timeout)
+            return 0, None
+        try:
+            return response.status, json.loads(data)
+        except ValueError:
+            return response.status, None
+
+
+class Plan:
+    """Thread-safe source of requests; finite plans end a scenario early"""
+
+    def __init__(self, requests=None, generator=None):
+        self._requests = iter(requests) if requests is not None else None
+        self._generator = generator
+        self._lock = threading.Lock()
+
+    def next(self, rng):
+        if self._generator is not None:
+            return self._generator(rng)
+        with self._lock:
+            return next(self._requests, None)
+
+
+def _students(client, rng, count):
+    """count existing student ids, importing synthetic students if needed"""
+    status, result = client.request('GET', f'/api/audience?expr=all&ids=true&limit={count}')
+    if status != 200:
+        raise RuntimeError(f"Could not list students (HTTP {status})")
+    student_ids = result['student_ids']
+    if len(student_ids) < count:
+        tag = f"{int(time.time())}{rng.randrange(10**6)}"
+        rows = ''.join(f"Load Student {i},load{tag}.{i}@example.edu,1\n"
+                       for i in range(count - len(student_ids)))
+        client.request('POST', '/api/import/students', 'name,email,college_id\n' + rows, 'text/csv')
+        status, result = client.request('GET', f'/api/audience?expr=all&ids=true&limit={count}')
+        student_ids = result['student_ids']
+    return student_ids
+
+
+def _create_event(client, name, capacity):
+    status, result = client.request('POST', '/api/events', {
+        "name": name,
+        "description": "Created by load_test.py",
+        "event_type": "Fest",
+        "college_id": 1,
+        "event_date": "2030-01-01",
+        "max_capacity": capacity
+    })
+    if status != 201:
+        raise RuntimeError(f"Could not create event (HTTP {status})")
+    return result['event_id']
+
+
+def setup_registration_storm(client, rng, students):
+    """Every student registers for each of a few new events, in random order"""
+    student_ids = _students(client, rng, students)
+    event_ids = [_create_event(client, f"Load Storm {i + 1}", len(student_ids))
+                 for i in range(STORM_EVENTS)]
+    pairs = [(event_id, student_id) for event_id in event_ids for student_id in student_ids]
+    rng.shuffle(pairs)
+    return Plan(('POST', f'/api/events/{event_id}/register', {"student_id": student_id})
+                for event_id, student_id in pairs)
+
+
+def setup_check_in_burst(client, rng, students):
+    """Every registered student checks in once, in random order"""
+    student_ids = _students(client, rng, students)
+    event_id = _create_event(client, "Load Check-in", len(student_ids))
+    registration_ids = []
+    for student_id in student_ids:
+        status, result = client.request('POST', f'/api/events/{event_id}/register',
+                                        {"student_id": student_id})
+        if status == 201:
+            registration_ids.append(result['registration_id'])
+    rng.shuffle(registration_ids)
+    return Plan(('POST', f'/api/registrations/{registration_id}/attendance', {"attended": True})
+                for registration_id in registration_ids)
+
+
+def setup_dashboard_polling(client, rng, students):
+    """Organisers refreshing event pages and reports, until the time is up"""
+    status, result = client.request('GET', '/api/events')
+    event_ids = [event['id'] for event in (result or {}).get('events', [])] or [1]
+    # (weight, path template)
+    pages = [
+        (30, '/api/events/{}'),
+        (25, '/api/events/{}/timeline?bucket=hour'),
+        (15, '/api/events/{}/registrations'),
+        (15, '/api/reports/top-students?limit=10'),
+        (10, '/api/events'),
+        (5, '/api/reports/event-popularity'),
+    ]
+    paths = [path for _, path in pages]
+    weights = [weight for weight, _ in pages]
+
+    def next_request(rng):
+        path = rng.choices(paths, weights)[0]
+        return ('GET', path.format(rng.choice(event_ids)), None)
+
+    return Plan(generator=next_request)
+
+
+SCENARIOS = {
+    'registration-storm': setup_registration_storm,
+    'check-in-burst': setup_check_in_burst,
+    'dashboard-polling': setup_dashboard_polling,
+}
+
+
+def run_scenario(make_client, plan, workers, duration, seed):
+    """Drive plan with workers threads until it ends or duration passes"""
+    deadline = time.perf_counter() + duration
+    samples = []
+    samples_lock = threading.Lock()
+
+    def worker(index):
+        client = make_client()
+        rng = random.Random(seed + index)
+        local = []
+        while time.perf_counter() < deadline:
+            request = plan.next(rng)
+            if request is None:
+                break
+            method, path, body = request
+            start = time.perf_counter()
+            status, _ = client.request(method, path, body)
+            local.append(((time.perf_counter() - start) * 1000, status))
+        with samples_lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return summarize(samples, elapsed)
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(latency for latency, _ in samples)
+    status_counts = {}
+    for _, status in samples:
+        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+
+    total = len(samples)
+    # 4xx responses are rejections the scenario can expect (duplicate
+    # registration, full event); 5xx and dropped connections are errors
+    errors = sum(count for status, count in status_counts.items()
+                 if status == '0' or status.startswith('5'))
+    rejected = sum(count for status, count in status_counts.items() if status.startswith('4'))
+    return {
+        "requests": total,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 3),
+            "p95": round(percentile(latencies, 0.95), 3),
+            "p99": round(percentile(latencies, 0.99), 3),
+            "max": round(latencies[-1], 3)
+        } if latencies else None,
+        "rejected": rejected,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0,
+        "db_lock_errors": status_counts.get('503', 0),
+        "status_counts": dict(sorted(status_counts.items()))
+    }
+
+
+def temporary_database(source, directory):
+    """Copy the database with the backup API so load never touches it"""
+    path = os.path.join(directory, 'load_test.db')
+    if os.path.exists(source) and os.path.getsize(source) > 0:
+        with sqlite3.connect(source) as src, sqlite3.connect(path) as dst:
+            src.backup(dst)
+    return path
+
+
+def print_results(results):
+    print("=" * 60)
+    print("CAMPUS EVENT MANAGEMENT - LOAD TEST")
+    print("=" * 60)
+    print(f"Target: {results['target']}, {results['workers']} workers, "
+          f"up to {results['duration_seconds']}s per scenario")
+    for name, result in results['scenarios'].items():
+        print(f"\n{name}:")
+        print(f"  {result['requests']:,} requests in {result['seconds']:.1f}s "
+              f"= {result['throughput_rps']:,.1f} req/s")
+        latency = result['latency_ms']
+        if latency:
+            print(f"  latency  p50 {latency['p50']:.2f} ms   p95 {latency['p95']:.2f} ms   "
+                  f"p99 {latency['p99']:.2f} ms   max {latency['max']:.2f} ms")
+        print(f"  errors {result['errors']} ({result['error_rate'] * 100:.2f}%), "
+              f"database locked {result['db_lock_errors']}, rejected (4xx) {result['rejected']}")
+        print(f"  status codes: {result['status_counts']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate concurrent load against the API")
+    parser.add_argument('scenarios', nargs='*', metavar='scenario',
+                        help=f"one or more of {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="concurrent clients")
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION_SECONDS,
+                        help="maximum seconds per scenario")
+    parser.add_argument('--students', type=int, default=DEFAULT_STUDENTS,
+                        help="students taking part in the registration and check-in scenarios")
+    parser.add_argument('--url', help="target a running server instead of the app in-process")
+    parser.add_argument('--database', help="in-process only: database to load "
+                                           "(default: a temporary copy of campus_events.db)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    parser.add_argument('--output', help="append the JSON results as one line to this file")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+    scenarios = args.scenarios or list(SCENARIOS)
+    scratch = None
+    if args.url:
+        target = args.url
+        make_client = lambda: HttpClient(args.url)
+    else:
+        from app import create_app
+        database = args.database
+        if database is None:
+            scratch = tempfile.mkdtemp(prefix='campus-load-')
+            database = temporary_database(DATABASE, scratch)
+        app = create_app(database)
+        target = f"in-process ({database})"
+        make_client = lambda: InProcessClient(app)
+
+    results = {
+        "generated_at": datetime.now().isoformat(timespec='seconds'),
+        "target": target,
+        "workers": args.workers,
+        "duration_seconds": args.duration,
+        "students": args.students,
+        "python": platform.python_version(),
+        "scenarios": {}
+    }
+    try:
+        for offset, name in enumerate(scenarios):
+            rng = random.Random(args.seed + offset)
+            plan = SCENARIOS[name](make_client(), rng, args.students)
+            results['scenarios'][name] = run_scenario(
+                make_client, plan, args.workers, args.duration, args.seed + offset * 1000)
+    finally:
+        if scratch:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        print_results(results)
+    if args.output:
+        with open(args.output, 'a') as f:
+            f.write(json.dumps(results) + '\n')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Validation lookup cache for Campus Event Management Platform
+Registering, checking in and reading an event first look up the event, the
+student or the registration, mostly to check that it exists (and read the
+event's max_capacity). Those rows are inserted once and practically never
+change, so each process keeps the ones it has read in a bounded LRU cache
+and answers repeat lookups without a database round trip.
+
+Only rows that exist are cached: an id that is not found is looked up again
+next time, so rows created by another worker are seen at once. Writes made
+through this process drop the records they affect; changes made elsewhere
+(archive.py moving past events out, another worker) are seen once the entry
+expires, after at most ttl seconds.
+
+The size bound (CAMPUS_LOOKUP_CACHE_SIZE records, default 50,000; 0 turns
+the cache off) covers all kinds together. stats() reports the hit rate.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+LOOKUP_CACHE_SIZE_ENV = 'CAMPUS_LOOKUP_CACHE_SIZE'
+
+DEFAULT_MAX_ENTRIES = 50_000
+DEFAULT_TTL_SECONDS = 5 * 60
+
+# kind: query loading one record by id. Events carry their college's name
+# for the event detail page; it is NULL when the college does not exist.
+LOOKUP_QUERIES = {
+    'events': """
+        SELECT e.*, c.name as college_name
+        FROM events e
+        LEFT JOIN colleges c ON e.college_id = c.id
+        WHERE e.id = ?""",
+    'students': "SELECT * FROM students WHERE id = ?",
+    'registrations': "SELECT * FROM registrations WHERE id = ?",
+}
+
+
+def lookup_cache_size():
+    """Cache size bound from the environment, or the default"""
+    value = os.environ.get(LOOKUP_CACHE_SIZE_ENV, '')
+    return int(value) if value.isdigit() else DEFAULT_MAX_ENTRIES
+
+
+class LookupCache:
+    """Read-through LRU cache of event, student and registration records
+
+    Records are returned as dicts shared with later callers; copy one
+    before changing it.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()   # (kind, id) -> (record, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, conn, kind, record_id):
+        """The record as a dict, or None if there is no such row"""
+        key = (kind, record_id)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Read outside the lock; two threads missing the same key both read
+        row = conn.execute(LOOKUP_QUERIES[kind], (record_id,)).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        if self.max_entries:
+            with self._lock:
+                self._entries[key] = (record, now + self.ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return record
+
+    def invalidate(self, kind, record_id=None):
+        """Drop one record, or every record of a kind when record_id is None"""
+        with self._lock:
+            if record_id is not None:
+                self._entries.pop((kind, record_id), None)
+                return
+            for key in [key for key in self._entries if key[0] == kind]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            kinds = {kind: 0 for kind in LOOKUP_QUERIES}
+            for kind, _ in self._entries:
+                kinds[kind] += 1
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "entries_by_kind": kinds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions
+            }
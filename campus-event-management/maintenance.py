@@ -0,0 +1,302 @@
+"""
+Database maintenance for Campus Event Management Platform
+Refreshes planner statistics, returns free pages to the filesystem and
+checkpoints the write-ahead log, each within a time budget so maintenance
+never holds up registrations for long. Every run reports the file size and
+the query plans of the report joins before and after. Old change log
+entries are compacted and expired first (see changes.py), so the space they
+free is released in the same run.
+
+Usage:
+    python maintenance.py                       # one run with the default budget
+    python maintenance.py --budget 2 --every 3600
+    python maintenance.py --enable-incremental-vacuum   # one-off full VACUUM
+
+The API server runs the same maintenance in a background thread when
+CAMPUS_MAINTENANCE_INTERVAL (seconds) is set.
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from changes import compact_change_log
+
+DATABASE = 'campus_events.db'
+MAINTENANCE_INTERVAL_ENV = 'CAMPUS_MAINTENANCE_INTERVAL'
+
+DEFAULT_BUDGET_SECONDS = 5.0
+# Rows sampled per index by PRAGMA optimize/ANALYZE; bounds its run time
+ANALYSIS_LIMIT = 1000
+# Free pages released per incremental_vacuum step between budget checks
+VACUUM_STEP_PAGES = 256
+# A WAL larger than this is truncated after checkpointing, not just reset
+WAL_TRUNCATE_BYTES = 64 * 1024 * 1024
+# Maintenance gives way to application writers instead of waiting on them
+BUSY_TIMEOUT_MS = 100
+
+# The joins the reports and dashboards depend on; their plans are compared
+# before and after statistics are refreshed
+PLAN_QUERIES = {
+    'event_popularity': """
+        SELECT e.id, COUNT(r.id), COUNT(a.id), AVG(f.rating)
+        FROM events e
+        JOIN colleges c ON e.college_id = c.id
+        LEFT JOIN registrations r ON e.id = r.event_id
+        LEFT JOIN attendance a ON r.id = a.registration_id
+        LEFT JOIN feedback f ON r.id = f.registration_id
+        GROUP BY e.id
+    """,
+    'student_participation': """
+        SELECT s.id, COUNT(r.id), COUNT(a.id)
+        FROM students s
+        JOIN colleges c ON s.college_id = c.id
+        LEFT JOIN registrations r ON s.id = r.student_id
+        LEFT JOIN attendance a ON r.id = a.registration_id
+        GROUP BY s.id
+    """,
+    'event_registrations': """
+        SELECT r.id, s.name, a.attended
+        FROM registrations r
+        JOIN students s ON r.student_id = s.id
+        LEFT JOIN attendance a ON r.id = a.registration_id
+        WHERE r.event_id = 1
+    """,
+    'feedback_by_event': """
+        SELECT e.id, COUNT(f.id), AVG(f.rating)
+        FROM events e
+        LEFT JOIN registrations r ON e.id = r.event_id
+        LEFT JOIN feedback f ON r.id = f.registration_id
+        WHERE f.id IS NOT NULL
+        GROUP BY e.id
+    """,
+}
+
+
+def connect(database=DATABASE):
+    conn = sqlite3.connect(database, timeout=BUSY_TIMEOUT_MS / 1000)
+    # Autocommit: VACUUM and checkpoints cannot run inside a transaction
+    conn.isolation_level = None
+    return conn
+
+
+def _pragma(conn, name):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def database_stats(conn, database=DATABASE):
+    """File and page statistics for the database"""
+    wal_path = database + '-wal'
+    return {
+        "file_bytes": os.path.getsize(database),
+        "wal_bytes": os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+        "page_size": _pragma(conn, 'page_size'),
+        "page_count": _pragma(conn, 'page_count'),
+        "freelist_pages": _pragma(conn, 'freelist_count'),
+        "auto_vacuum": {0: 'none', 1: 'full', 2: 'incremental'}[_pragma(conn, 'auto_vacuum')],
+        "journal_mode": _pragma(conn, 'journal_mode'),
+    }
+
+
+def query_plans(conn):
+    """EXPLAIN QUERY PLAN output for each of PLAN_QUERIES"""
+    return {
+        name: [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+        for name, sql in PLAN_QUERIES.items()
+    }
+
+
+def optimize(conn, full=False):
+    """Refresh planner statistics
+
+    PRAGMA optimize only analyzes tables whose statistics are missing or
+    stale, sampling ANALYSIS_LIMIT rows per index. full=True runs a complete
+    ANALYZE instead.
+    """
+    if full:
+        conn.execute("ANALYZE")
+        return "analyze"
+    conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+    conn.execute("PRAGMA optimize")
+    return "optimize"
+
+
+def incremental_vacuum(conn, deadline):
+    """Release free pages in steps until none are left or the deadline passes
+
+    Needs auto_vacuum = INCREMENTAL (schema.sql sets it for new databases;
+    older ones are converted once with enable_incremental_vacuum()).
+    Returns the number of pages released.
+    """
+    if _pragma(conn, 'auto_vacuum') != 2:
+        return 0
+    released = 0
+    while time.monotonic() < deadline:
+        free = _pragma(conn, 'freelist_count')
+        if not free:
+            break
+        step = min(free, VACUUM_STEP_PAGES)
+        conn.execute(f"PRAGMA incremental_vacuum({step})").fetchall()
+        released += free - _pragma(conn, 'freelist_count')
+    return released
+
+
+def enable_incremental_vacuum(conn):
+    """Convert the database to auto_vacuum = INCREMENTAL (rewrites the file)"""
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+
+
+def checkpoint(conn, truncate_above=WAL_TRUNCATE_BYTES, database=DATABASE):
+    """Copy the WAL back into the database without waiting for readers
+
+    A PASSIVE checkpoint never blocks; the WAL file is truncated only when
+    it has grown past truncate_above and the checkpoint completed.
+    Returns a dict with the checkpoint outcome, or None outside WAL mode.
+    """
+    if _pragma(conn, 'journal_mode') != 'wal':
+        return None
+    busy, log_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+    mode = 'passive'
+    wal_path = database + '-wal'
+    if (not busy and log_frames == checkpointed and os.path.exists(wal_path)
+            and os.path.getsize(wal_path) > truncate_above):
+        busy, log_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        mode = 'truncate'
+    return {"mode": mode, "busy": bool(busy), "log_frames": log_frames,
+            "checkpointed_frames": checkpointed}
+
+
+def run_maintenance(database=DATABASE, budget=DEFAULT_BUDGET_SECONDS, full_analyze=False):
+    """Run every maintenance task within budget seconds and report the changes
+
+    Tasks run in order (statistics, change log, vacuum, checkpoint); a task
+    that would start after the budget is spent is skipped. A locked database
+    skips the task rather than failing the run.
+    """
+    started = time.monotonic()
+    deadline = started + budget
+    conn = connect(database)
+
+    before = database_stats(conn, database)
+    plans_before = query_plans(conn)
+    tasks = {}
+
+    def run(name, task):
+        if time.monotonic() >= deadline:
+            tasks[name] = {"skipped": "time budget spent"}
+            return
+        task_start = time.monotonic()
+        try:
+            result = task()
+        except sqlite3.OperationalError as e:
+            tasks[name] = {"skipped": str(e)}
+            return
+        tasks[name] = {"result": result,
+                       "seconds": round(time.monotonic() - task_start, 3)}
+
+    run('statistics', lambda: optimize(conn, full_analyze))
+    run('change_log', lambda: compact_change_log(conn, deadline=deadline))
+    run('incremental_vacuum', lambda: {"pages_released": incremental_vacuum(conn, deadline)})
+    run('checkpoint', lambda: checkpoint(conn, database=database))
+
+    after = database_stats(conn, database)
+    plans_after = query_plans(conn)
+    conn.close()
+
+    return {
+        "database": database,
+        "ran_at": datetime.now().isoformat(),
+        "seconds": round(time.monotonic() - started, 3),
+        "budget_seconds": budget,
+        "before": before,
+        "after": after,
+        "tasks": tasks,
+        "plan_changes": {
+            name: {"before": plans_before[name], "after": plans_after[name]}
+            for name in PLAN_QUERIES
+            if plans_before[name] != plans_after[name]
+        },
+    }
+
+
+def print_report(report):
+    before, after = report['before'], report['after']
+    print(f"\n{'='*60}")
+    print(f" DATABASE MAINTENANCE ({report['ran_at']})")
+    print(f"{'='*60}")
+    print(f"Finished in {report['seconds']:.2f}s of a {report['budget_seconds']:.1f}s budget")
+    for name, task in report['tasks'].items():
+        if 'skipped' in task:
+            print(f"  {name:<20} skipped: {task['skipped']}")
+        else:
+            print(f"  {name:<20} {task['seconds']:.3f}s  {task['result']}")
+
+    print(f"\n{'':<16} {'before':>14} {'after':>14}")
+    for key in ('file_bytes', 'wal_bytes', 'page_count', 'freelist_pages'):
+        print(f"{key:<16} {before[key]:>14,} {after[key]:>14,}")
+
+    if report['plan_changes']:
+        print("\nQuery plan changes:")
+        for name, change in report['plan_changes'].items():
+            print(f"  {name}:")
+            for line in change['before']:
+                print(f"    - {line}")
+            for line in change['after']:
+                print(f"    + {line}")
+    else:
+        print("\nNo query plan changes")
+
+
+def start_background_maintenance(interval, database=DATABASE, budget=DEFAULT_BUDGET_SECONDS):
+    """Run maintenance every interval seconds in a daemon thread"""
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                report = run_maintenance(database, budget)
+            except sqlite3.Error as e:
+                print(f"Maintenance failed: {e}")
+                continue
+            released = report['before']['file_bytes'] - report['after']['file_bytes']
+            print(f"Maintenance finished in {report['seconds']:.2f}s; "
+                  f"released {released:,} bytes, {len(report['plan_changes'])} plan changes")
+
+    thread = threading.Thread(target=loop, name='database-maintenance', daemon=True)
+    thread.start()
+    return thread
+
+
+def maintenance_interval():
+    """Background maintenance interval in seconds from the environment, or None"""
+    value = os.environ.get(MAINTENANCE_INTERVAL_ENV)
+    return float(value) if value else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run database maintenance")
+    parser.add_argument('--database', default=DATABASE)
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_SECONDS,
+                        help="seconds the run may take")
+    parser.add_argument('--full-analyze', action='store_true',
+                        help="run a complete ANALYZE instead of PRAGMA optimize")
+    parser.add_argument('--enable-incremental-vacuum', action='store_true',
+                        help="convert an existing database to incremental vacuum (full VACUUM)")
+    parser.add_argument('--every', type=float, metavar='SECONDS',
+                        help="keep running on this interval")
+    args = parser.parse_args()
+
+    if args.enable_incremental_vacuum:
+        conn = connect(args.database)
+        enable_incremental_vacuum(conn)
+        conn.close()
+        print("Converted database to incremental vacuum")
+
+    while True:
+        print_report(run_maintenance(args.database, args.budget, args.full_analyze))
+        if not args.every:
+            break
+        time.sleep(args.every)
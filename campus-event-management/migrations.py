@@ -0,0 +1,115 @@
+"""
+Schema migrations for Campus Event Management Platform
+schema.sql creates the core tables; the numbered migrations below add the
+structures built on top of them. The applied version is stored in
+PRAGMA user_version so every migration runs once per database.
+"""
+
+import sqlite3
+
+from changes import CHANGE_LOG_SCHEMA
+from coattendance import BACKFILL_SQL as COATTENDANCE_BACKFILL_SQL, COATTENDANCE_SCHEMA
+from event_versions import BACKFILL_SQL as EVENT_VERSIONS_BACKFILL_SQL, EVENT_VERSIONS_SCHEMA
+from leaderboard import BACKFILL_SQL as LEADERBOARD_BACKFILL_SQL, LEADERBOARD_SCHEMA
+from timeline import BACKFILL_SQL as TIMELINE_BACKFILL_SQL, TIMELINE_SCHEMA
+
+DATABASE = 'campus_events.db'
+
+# (version, description, SQL script). Scripts use IF NOT EXISTS so that a
+# migration interrupted half-way can simply be re-run.
+MIGRATIONS = [
+    (1, "Full-text search index over event names and descriptions", """
+        CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+            name,
+            description,
+            content='events',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+            INSERT INTO events_fts (rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+            INSERT INTO events_fts (events_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE OF name, description ON events BEGIN
+            INSERT INTO events_fts (events_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO events_fts (rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END;
+
+        INSERT INTO events_fts (events_fts) VALUES ('rebuild');
+    """),
+    # Retired: it indexed feedback(registration_id, submitted_at), which the
+    # UNIQUE(registration_id) index already covers and the sample-comments
+    # window (partitioned by the registration's event) cannot use. Migration
+    # 9 drops it where it was created.
+    (2, "Index feedback by registration and submission time (retired)", ""),
+    (3, "Per-event registration and check-in timeline rollups",
+     TIMELINE_SCHEMA + TIMELINE_BACKFILL_SQL),
+    (4, "Top-students leaderboard counters",
+     LEADERBOARD_SCHEMA + LEADERBOARD_BACKFILL_SQL),
+    (5, "Event co-attendance index for recommendations",
+     COATTENDANCE_SCHEMA + COATTENDANCE_BACKFILL_SQL),
+    (6, "Index attendance by marking time for audience index refreshes", """
+        CREATE INDEX IF NOT EXISTS idx_attendance_marked_at ON attendance(marked_at);
+    """),
+    (7, "Per-event version stamps for conditional GETs",
+     EVENT_VERSIONS_SCHEMA + EVENT_VERSIONS_BACKFILL_SQL),
+    (8, "Change log of event, registration, attendance and feedback writes",
+     CHANGE_LOG_SCHEMA),
+    (9, "Drop the unused feedback registration and submission time index", """
+        DROP INDEX IF EXISTS idx_feedback_registration_submitted;
+    """),
+    # Repeated check-ins used to move marked_at without moving the check-in
+    # between timeline buckets, so an undo could come off the wrong bucket
+    (10, "Rebuild timeline rollups skewed by repeated check-ins",
+     TIMELINE_BACKFILL_SQL),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn):
+    """Return the migration version the database is at"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn):
+    """Apply all pending migrations, returning the versions applied"""
+    applied = []
+    current = schema_version(conn)
+
+    for version, description, script in MIGRATIONS:
+        if version <= current:
+            continue
+        # user_version lives in the database header and is transactional, so
+        # the migration and its version bump commit together
+        conn.executescript(f"""
+            BEGIN;
+            {script}
+            PRAGMA user_version = {version};
+            COMMIT;
+        """)
+        applied.append(version)
+
+    return applied
+
+
+if __name__ == "__main__":
+    conn = sqlite3.connect(DATABASE)
+    before = schema_version(conn)
+    applied = apply_migrations(conn)
+    conn.close()
+
+    if applied:
+        print(f"Migrated {DATABASE} from version {before} to {applied[-1]}")
+    else:
+        print(f"{DATABASE} is up to date (version {before})")
@@ -0,0 +1,117 @@
+"""
+Profiling helpers for Campus Event Management Platform
+Runs code under cProfile and writes pstats dumps plus collapsed-stack files
+(the input format for flamegraph.pl / speedscope) to the profiles/ folder
+"""
+
+import cProfile
+import os
+import pstats
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILES_DIR = 'profiles'
+
+# Header that asks the API to profile a request, and the environment variable
+# holding the token it must match. Profiling stays disabled when no token is set.
+PROFILE_HEADER = 'X-Profile-Token'
+PROFILE_TOKEN_ENV = 'CAMPUS_PROFILE_TOKEN'
+
+# Collapsed stacks are written in microseconds
+MIN_STACK_SECONDS = 1e-6
+
+
+def ensure_profiles_directory():
+    """Create profiles directory if it doesn't exist"""
+    if not os.path.exists(PROFILES_DIR):
+        os.makedirs(PROFILES_DIR)
+
+
+def profile_filename(label):
+    """Build a unique, filesystem-safe base name for a profile"""
+    safe_label = re.sub(r'[^A-Za-z0-9_.-]+', '_', label).strip('_') or 'profile'
+    timestamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    return os.path.join(PROFILES_DIR, f"{timestamp}-{safe_label}")
+
+
+def _frame_name(func):
+    filename, line, name = func
+    if filename == '~':
+        # Built-in functions have no source file
+        return name
+    return f"{os.path.basename(filename)}:{line}:{name}"
+
+
+def collapsed_stacks(stats):
+    """Convert pstats data into collapsed stacks ("a;b;c <microseconds>")
+
+    cProfile only records caller/callee pairs, so the time of a function with
+    several callers is split between them in proportion to each edge's
+    cumulative time (the same approximation gprof2dot and flameprof use).
+    """
+    children = {}
+    roots = []
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((func, edge[3]))
+
+    lines = {}
+
+    def walk(func, path, seen, budget):
+        cumulative = stats.stats[func][3]
+        if cumulative <= 0 or budget < MIN_STACK_SECONDS:
+            # Prune paths too small to show up in a flame graph
+            return
+        scale = min(budget / cumulative, 1.0)
+        stack = path + [_frame_name(func)]
+        key = ';'.join(stack)
+        lines[key] = lines.get(key, 0) + stats.stats[func][2] * scale
+        for child, edge_time in children.get(func, []):
+            if child in seen:
+                # Recursion: already accounted for in the parent frame
+                continue
+            walk(child, stack, seen | {child}, edge_time * scale)
+
+    for root in roots:
+        walk(root, [], {root}, stats.stats[root][3])
+
+    return [
+        f"{stack} {int(seconds * 1_000_000)}"
+        for stack, seconds in sorted(lines.items())
+        if int(seconds * 1_000_000) > 0
+    ]
+
+
+def save_profile(profiler, label):
+    """Write <name>.prof and <name>.collapsed for a finished profiler"""
+    ensure_profiles_directory()
+    base = profile_filename(label)
+    profiler.dump_stats(f"{base}.prof")
+
+    stats = pstats.Stats(profiler)
+    with open(f"{base}.collapsed", 'w') as f:
+        f.write('\n'.join(collapsed_stacks(stats)))
+        f.write('\n')
+
+    return base
+
+
+@contextmanager
+def profiled(label):
+    """Run the enclosed block under cProfile and save the results"""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        base = save_profile(profiler, label)
+        print(f"Profile saved to {base}.prof and {base}.collapsed")
+
+
+def profiling_token():
+    """Return the configured profiling token, or None when profiling is off"""
+    return os.environ.get(PROFILE_TOKEN_ENV) or None
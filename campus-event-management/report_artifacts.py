@@ -0,0 +1,249 @@
+"""
+Published report artifacts for Campus Event Management Platform
+generate_reports.py writes every report file with atomic_write() (a
+temporary file renamed over the old one, so readers never see half a file)
+and finishes each run by publishing reports/manifest.json: when the run
+happened, the data watermark it read and a SHA-256 checksum per file.
+
+With CAMPUS_REPORT_MAX_AGE set (seconds), the API serves the event
+popularity and student participation reports from the published files
+instead of querying the database, as long as the watermark is younger than
+that, or the database has not changed since it was taken. Otherwise, or when
+a file does not match its checksum (a newer run is being published), the
+endpoint computes the report live.
+
+Usage: python report_artifacts.py    # check the published files against the database
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+DATABASE = 'campus_events.db'
+REPORTS_DIR = 'reports'
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+REPORT_MAX_AGE_ENV = 'CAMPUS_REPORT_MAX_AGE'
+
+# Watermark fields that identify the data a run read; 'as_of' only dates it
+WATERMARK_KEYS = ('event_versions', 'last_modified', 'students', 'colleges')
+
+
+@contextmanager
+def atomic_write(path, newline=None):
+    """Open a temporary file next to path for writing; on success it is
+    flushed to disk and renamed over path, otherwise removed"""
+    directory = os.path.dirname(path) or '.'
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.')
+    try:
+        with os.fdopen(fd, 'w', newline=newline) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def data_watermark(conn):
+    """What the report inputs look like right now
+
+    Every registration, check-in, feedback and event change bumps a version
+    in event_versions (see event_versions.py), so their sum only stays the
+    same while no report input changes. College renames bump the versions of
+    the college's events too; the highest student and college ids cover new
+    sign-ups and new colleges.
+
+    Edits to existing student rows (a new name, email or college) are not
+    tracked: the API never makes them. After changing students by hand,
+    rerun generate_reports.py.
+    """
+    event_versions, last_modified, students, colleges = conn.execute("""
+        SELECT (SELECT COALESCE(SUM(version), 0) FROM event_versions),
+               (SELECT MAX(modified_at) FROM event_versions),
+               (SELECT COALESCE(MAX(id), 0) FROM students),
+               (SELECT COALESCE(MAX(id), 0) FROM colleges)
+    """).fetchone()
+    return {
+        "as_of": datetime.now().isoformat(timespec='seconds'),
+        "event_versions": event_versions,
+        "last_modified": last_modified,
+        "students": students,
+        "colleges": colleges
+    }
+
+
+def same_data(watermark, other):
+    """True when two watermarks were taken with no report input changed in between"""
+    if not watermark or not other:
+        return False
+    return all(watermark.get(key) is not None and watermark.get(key) == other.get(key)
+               for key in WATERMARK_KEYS)
+
+
+def file_checksum(path):
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def publish_manifest(directory, filenames, watermark, **details):
+    """Checksum the report files and atomically replace the manifest
+
+    The manifest is written last, so it only ever describes files that are
+    already in place.
+    """
+    manifest = {
+        "manifest_version": MANIFEST_VERSION,
+        "generated_at": datetime.now().isoformat(timespec='seconds'),
+        "watermark": watermark,
+        **details,
+        "files": {
+            filename: {
+                "sha256": file_checksum(os.path.join(directory, filename)),
+                "bytes": os.path.getsize(os.path.join(directory, filename))
+            }
+            for filename in sorted(filenames)
+        }
+    }
+    with atomic_write(os.path.join(directory, MANIFEST_NAME)) as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_manifest(directory):
+    """The published manifest, or None if there is none (or it is unreadable)"""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def watermark_age(manifest):
+    """Seconds since the manifest's watermark was taken"""
+    as_of = datetime.fromisoformat(manifest['watermark']['as_of'])
+    return (datetime.now() - as_of).total_seconds()
+
+
+def report_max_age():
+    """Staleness bound in seconds from the environment, or None (serve live only)"""
+    value = os.environ.get(REPORT_MAX_AGE_ENV)
+    return float(value) if value else None
+
+
+class ReportArtifacts:
+    """Published reports in one directory, for the API
+
+    The manifest is re-read whenever it changes on disk; report files are
+    checked against it and parsed once per manifest.
+    """
+
+    def __init__(self, directory=REPORTS_DIR, max_age=None):
+        self.directory = directory
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._manifest_key = None
+        self._manifest = None
+        self._reports = {}
+
+    def manifest(self):
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key != self._manifest_key:
+                self._manifest = read_manifest(self.directory)
+                self._manifest_key = key
+                self._reports = {}
+            return self._manifest
+
+    def _load(self, manifest, filename):
+        """Parsed report file, or None if it does not match the manifest"""
+        with self._lock:
+            if filename in self._reports:
+                return self._reports[filename]
+        expected = manifest.get('files', {}).get(filename)
+        path = os.path.join(self.directory, filename)
+        report = None
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            if expected and hashlib.sha256(data).hexdigest() == expected['sha256']:
+                report = json.loads(data)
+        except (OSError, ValueError):
+            report = None
+        with self._lock:
+            if manifest is self._manifest:
+                self._reports[filename] = report
+        return report
+
+    def fresh_report(self, filename, include_archive, connect):
+        """(report, manifest) when the published file may be served, else None
+
+        connect() opens a database connection; it is only called to compare
+        watermarks once the staleness bound has passed.
+        """
+        if not self.max_age:
+            return None
+        manifest = self.manifest()
+        if (manifest is None or manifest.get('manifest_version') != MANIFEST_VERSION
+                or bool(manifest.get('include_archive')) != include_archive
+                or not manifest.get('watermark')):
+            return None
+        if watermark_age(manifest) > self.max_age:
+            conn = connect()
+            try:
+                current = data_watermark(conn)
+            finally:
+                conn.close()
+            if not same_data(manifest['watermark'], current):
+                return None
+        report = self._load(manifest, filename)
+        return (report, manifest) if report is not None else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check published reports against their manifest")
+    parser.add_argument('--reports-dir', default=REPORTS_DIR)
+    parser.add_argument('--database', default=DATABASE)
+    args = parser.parse_args()
+
+    manifest = read_manifest(args.reports_dir)
+    if manifest is None:
+        print(f"No manifest in {args.reports_dir}/; run generate_reports.py")
+        raise SystemExit(1)
+
+    print("=" * 60)
+    print("PUBLISHED REPORTS")
+    print("=" * 60)
+    print(f"Generated at: {manifest['generated_at']}")
+    if manifest.get('watermark'):
+        print(f"Data as of:   {manifest['watermark']['as_of']} "
+              f"({watermark_age(manifest):.0f}s ago)")
+        conn = sqlite3.connect(args.database)
+        current = same_data(manifest['watermark'], data_watermark(conn))
+        conn.close()
+        print(f"Database changed since: {'no' if current else 'yes'}")
+
+    damaged = 0
+    for filename, expected in manifest['files'].items():
+        path = os.path.join(args.reports_dir, filename)
+        ok = os.path.exists(path) and file_checksum(path) == expected['sha256']
+        damaged += not ok
+        print(f"  {'ok      ' if ok else 'MISMATCH'} {filename}")
+    raise SystemExit(1 if damaged else 0)
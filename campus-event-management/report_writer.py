@@ -0,0 +1,108 @@
+"""
+Streaming report writers for Campus Event Management Platform
+Row-per-entity reports (one row per event or per student) are written while
+the rows come off the cursor: fetch_rows() reads them with fetchmany(),
+ReportWriter appends each row to the JSON and the CSV file at once, and
+RunningTotals keeps the sums the summary needs. Only one batch of rows is
+ever held in memory, however many students there are.
+
+The JSON files keep the layout json.dump(indent=2) gives them, except that
+the summary comes after the rows, since it is only known at the end.
+"""
+
+import csv
+import json
+from contextlib import ExitStack
+
+from report_artifacts import atomic_write
+
+FETCH_ROWS = 1000
+
+
+def fetch_rows(cursor, size=FETCH_ROWS):
+    """Yield the rows of an executed cursor as dicts, size rows per fetch"""
+    while True:
+        batch = cursor.fetchmany(size)
+        if not batch:
+            return
+        for row in batch:
+            yield dict(row)
+
+
+def _member(key, value):
+    """One top-level '"key": value' line of an indent=2 JSON object"""
+    return f'  {json.dumps(key)}: ' + json.dumps(value, indent=2).replace('\n', '\n  ')
+
+
+class RunningTotals:
+    """Count, first row and per-field sums of a row stream, in one pass"""
+
+    def __init__(self, *fields):
+        self.count = 0
+        self.first = None
+        self.sums = dict.fromkeys(fields, 0)
+
+    def add(self, row):
+        if self.first is None:
+            self.first = row
+        self.count += 1
+        for field in self.sums:
+            self.sums[field] += row[field] or 0
+
+    def mean(self, field):
+        return round(self.sums[field] / self.count, 2) if self.count else 0
+
+
+class ReportWriter:
+    """Write one report's rows to <base>.json and <base>.csv as they arrive
+
+        with ReportWriter('reports/x', {"report_name": ...}, 'rows') as writer:
+            for row in rows:
+                writer.write(row)
+            report = writer.finish({"summary": ...})
+
+    Both files are replaced atomically when the block ends without an error.
+    The CSV, like before, is only written if there is at least one row.
+    finish() returns the report without its rows.
+    """
+
+    def __init__(self, base_path, header, rows_key):
+        self.base_path = base_path
+        self.header = header
+        self.rows_key = rows_key
+        self.rows = 0
+        self._stack = ExitStack()
+        self._json = None
+        self._csv = None
+        self._finished = False
+
+    def __enter__(self):
+        self._json = self._stack.enter_context(atomic_write(f'{self.base_path}.json'))
+        self._json.write('{\n')
+        for key, value in self.header.items():
+            self._json.write(_member(key, value) + ',\n')
+        self._json.write(f'  {json.dumps(self.rows_key)}: [')
+        return self
+
+    def write(self, row):
+        if self._csv is None:
+            csv_file = self._stack.enter_context(atomic_write(f'{self.base_path}.csv', newline=''))
+            self._csv = csv.DictWriter(csv_file, fieldnames=row.keys())
+            self._csv.writeheader()
+        self._csv.writerow(row)
+        self._json.write(',\n    ' if self.rows else '\n    ')
+        self._json.write(json.dumps(row, indent=2).replace('\n', '\n    '))
+        self.rows += 1
+
+    def finish(self, trailer):
+        self._json.write('\n  ]' if self.rows else ']')
+        for key, value in trailer.items():
+            self._json.write(',\n' + _member(key, value))
+        self._json.write('\n}')
+        self._finished = True
+        return {**self.header, **trailer}
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None and not self._finished:
+            self.finish({})
+        return self._stack.__exit__(exc_type, exc, traceback)
@@ -0,0 +1,66 @@
+"""
+Full-text event search for Campus Event Management Platform
+Queries the events_fts index (see migrations.py) with prefix matching and
+BM25 ranking, combined with the regular event filters
+"""
+
+import re
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Matches in the event name count ten times as much as the description
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def build_match_expression(query):
+    """Turn free text into an FTS5 MATCH expression
+
+    Every word becomes a quoted prefix term ("reac"* matches React), and the
+    terms are ANDed together. Quoting keeps user input from being parsed as
+    FTS5 operators. Returns None when the query contains no words.
+    """
+    terms = TOKEN_PATTERN.findall(query or '')
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_events(conn, query, event_type=None, college_id=None,
+                  limit=DEFAULT_SEARCH_LIMIT, offset=0):
+    """Return events matching query, best matches first"""
+    match = build_match_expression(query)
+    if match is None:
+        return []
+
+    sql = f"""
+        SELECT e.*, c.name as college_name,
+               bm25(events_fts, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT}) as rank
+        FROM events_fts
+        JOIN events e ON e.id = events_fts.rowid
+        JOIN colleges c ON e.college_id = c.id
+        WHERE events_fts MATCH ?
+    """
+    params = [match]
+
+    if event_type:
+        sql += " AND e.event_type = ?"
+        params.append(event_type)
+
+    if college_id:
+        sql += " AND e.college_id = ?"
+        params.append(college_id)
+
+    sql += " ORDER BY rank LIMIT ? OFFSET ?"
+    params.extend([limit, offset])
+
+    results = []
+    for row in conn.execute(sql, params).fetchall():
+        row_dict = dict(row)
+        # bm25() is negative with better matches lower; expose a positive score
+        row_dict['relevance'] = round(-row_dict.pop('rank'), 4)
+        results.append(row_dict)
+    return results
@@ -0,0 +1,294 @@
+"""
+Production launcher for Campus Event Management Platform
+The master process prepares the database once (schema, migrations), opens
+the listening socket and forks the worker processes. Each worker builds the
+app with create_app(prepare=False), which only checks the schema version,
+warms its caches and then accepts connections on the shared socket.
+
+The master reports the cold-start time (launch until every worker is warm
+and listening) and the time to first request (launch until a probe request
+is answered), restarts workers that exit unexpectedly (backing off when
+they keep failing to start) and stops them all on SIGINT or SIGTERM.
+
+Usage: python serve.py --workers 4 --port 8000
+"""
+
+import time
+
+LAUNCHED = time.perf_counter()
+
+import argparse
+import json
+import os
+import select
+import signal
+import socket
+import sys
+import urllib.request
+
+from werkzeug.serving import make_server
+
+from app import DATABASE, create_app, prepare_database, warm_up
+from hot_tier import HOT_EVENTS_ENV, hot_events
+from maintenance import maintenance_interval, start_background_maintenance
+
+DEFAULT_HOST = '0.0.0.0'
+DEFAULT_PORT = 8000
+LISTEN_BACKLOG = 1024
+PROBE_TIMEOUT_SECONDS = 10
+# How often the master checks on starting and exited workers
+POLL_SECONDS = 0.5
+# Replacing workers that exit: a worker that ran this long is healthy and is
+# replaced at once; failed starts back off from 1s up to 30s
+MIN_UPTIME_SECONDS = 10
+RESTART_BACKOFF_SECONDS = 1.0
+MAX_RESTART_BACKOFF_SECONDS = 30.0
+
+
+def default_workers():
+    """Worker count from CAMPUS_WORKERS, or one per CPU"""
+    value = os.environ.get('CAMPUS_WORKERS', '')
+    return int(value) if value.isdigit() and int(value) > 0 else (os.cpu_count() or 1)
+
+
+def run_worker(sock, database, warm, ready_file):
+    """Body of a worker process; never returns"""
+    started = time.perf_counter()
+    status = 0
+    try:
+        # Retries may reach another worker, so Idempotency-Key responses
+        # are kept where every worker can see them
+        app = create_app(database, prepare=False, shared_idempotency=True)
+        warm_up_seconds = warm_up(app) if warm else 0.0
+        host, port = sock.getsockname()[:2]
+        server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+        ready_file.write(json.dumps({
+            "pid": os.getpid(),
+            "startup_seconds": round(time.perf_counter() - started, 3),
+            "warm_up_seconds": round(warm_up_seconds, 3)
+        }) + '\n')
+        ready_file.flush()
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"Worker {os.getpid()} failed: {e}", file=sys.stderr)
+        status = 1
+    # Skip the master's interpreter cleanup inherited through fork
+    os._exit(status)
+
+
+class Master:
+    """Forks, supervises and stops the worker processes
+
+    Each worker reports ready over its own pipe, whose write end only the
+    worker holds, so a worker that dies before reporting shows up as end of
+    file. Waits poll with a timeout, so signals and exits are noticed within
+    POLL_SECONDS.
+    """
+
+    def __init__(self, sock, database, warm):
+        self.sock = sock
+        self.database = database
+        self.warm = warm
+        self.workers = set()
+        self.starting = {}      # pid -> read end of its ready pipe
+        self.ready_at = {}      # pid -> time.monotonic() it reported ready
+        self.failures = 0
+        self.stopping = False
+
+    def spawn(self):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            run_worker(self.sock, self.database, self.warm, os.fdopen(write_fd, 'w'))
+        os.close(write_fd)
+        self.workers.add(pid)
+        self.starting[pid] = read_fd
+        return pid
+
+    def _collect(self, timeout):
+        """Wait up to timeout for ready reports and reap exited workers
+
+        Returns (reports, exits); exits are (pid, exit code, whether the
+        worker had reported ready).
+        """
+        reports, exits = [], []
+        pipes = {fd: pid for pid, fd in self.starting.items()}
+        if pipes:
+            readable = select.select(list(pipes), [], [], timeout)[0]
+        else:
+            readable = []
+            time.sleep(timeout)
+        for fd in readable:
+            pid = pipes[fd]
+            # One short line written at once; empty means it died first
+            data = os.read(fd, 4096)
+            os.close(fd)
+            del self.starting[pid]
+            if data:
+                reports.append(json.loads(data.decode().splitlines()[0]))
+                self.ready_at[pid] = time.monotonic()
+
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            self.workers.discard(pid)
+            fd = self.starting.pop(pid, None)
+            if fd is not None:
+                os.close(fd)
+            ready_at = self.ready_at.pop(pid, None)
+            exits.append((pid, os.waitstatus_to_exitcode(status), ready_at))
+        return reports, exits
+
+    def wait_ready(self, count):
+        """Block until count workers have reported in; returns their reports
+
+        Raises RuntimeError if a worker exits first (e.g. create_app()
+        failed the schema check): at launch that will not fix itself.
+        """
+        reports = []
+        while len(reports) < count and not self.stopping:
+            new_reports, exits = self._collect(POLL_SECONDS)
+            reports.extend(new_reports)
+            for pid, code, ready_at in exits:
+                if not self.stopping:
+                    raise RuntimeError(f"Worker {pid} exited with status {code} during startup")
+        return reports
+
+    def stop(self, signum=None, frame=None):
+        self.stopping = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def restart_delay(self, ready_at):
+        """Seconds to wait before replacing a worker that exited
+
+        Workers that never started, or crashed soon after, count as failed
+        starts; each one in a row doubles the delay, so a worker that keeps
+        crashing is retried ever more slowly instead of in a fork loop.
+        """
+        if ready_at is not None and time.monotonic() - ready_at >= MIN_UPTIME_SECONDS:
+            self.failures = 0
+            return 0.0
+        self.failures += 1
+        return min(RESTART_BACKOFF_SECONDS * 2 ** (self.failures - 1), MAX_RESTART_BACKOFF_SECONDS)
+
+    def supervise(self):
+        """Reap workers until stopped, replacing any that exit on their own"""
+        restarts = []   # time.monotonic() at which to spawn a replacement
+        while self.workers or (restarts and not self.stopping):
+            reports, exits = self._collect(POLL_SECONDS)
+            for report in reports:
+                print(f"Worker {report['pid']} ready in {report['startup_seconds']:.2f}s")
+            for pid, code, ready_at in exits:
+                if self.stopping:
+                    continue
+                delay = self.restart_delay(ready_at)
+                started = '' if ready_at is not None else ' before starting'
+                print(f"Worker {pid} exited with status {code}{started}; restarting in {delay:.0f}s")
+                restarts.append(time.monotonic() + delay)
+            if self.stopping:
+                continue
+            now = time.monotonic()
+            for due in [due for due in restarts if due <= now]:
+                restarts.remove(due)
+                self.spawn()
+
+
+def probe(host, port):
+    """Seconds from launch until the server answers GET /"""
+    probe_host = '127.0.0.1' if host in ('0.0.0.0', '') else host
+    with urllib.request.urlopen(f"http://{probe_host}:{port}/", timeout=PROBE_TIMEOUT_SECONDS) as response:
+        response.read()
+    return time.perf_counter() - LAUNCHED
+
+
+def serve_single(args):
+    """Fallback without fork (e.g. Windows): one threaded process"""
+    app = create_app(args.database, prepare=False)
+    if not args.no_warm_up:
+        warm_up(app)
+    server = make_server(args.host, args.port, app, threaded=True)
+    print(f"Cold start: {time.perf_counter() - LAUNCHED:.2f}s (1 process)")
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with multiple worker processes")
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help="worker processes (default: CAMPUS_WORKERS or one per CPU)")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--database', default=DATABASE)
+    parser.add_argument('--no-warm-up', action='store_true',
+                        help="accept traffic without pre-loading caches")
+    args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if hot_events() and args.workers > 1:
+        parser.error(f"{HOT_EVENTS_ENV} pins events in one process's memory; use --workers 1")
+
+    print("=" * 60)
+    print("CAMPUS EVENT MANAGEMENT - SERVER STARTUP")
+    print("=" * 60)
+
+    imported = time.perf_counter() - LAUNCHED
+    start = time.perf_counter()
+    prepare_database(args.database)
+    prepared = time.perf_counter() - start
+    print(f"Imports: {imported:.2f}s, schema check and migrations: {prepared:.2f}s")
+
+    if not hasattr(os, 'fork'):
+        serve_single(args)
+        return
+
+    sock = socket.create_server((args.host, args.port), backlog=LISTEN_BACKLOG)
+    sock.set_inheritable(True)
+
+    master = Master(sock, args.database, warm=not args.no_warm_up)
+    for _ in range(args.workers):
+        master.spawn()
+    signal.signal(signal.SIGTERM, master.stop)
+    signal.signal(signal.SIGINT, master.stop)
+
+    try:
+        reports = master.wait_ready(args.workers)
+    except RuntimeError as e:
+        print(f"Startup failed: {e}", file=sys.stderr)
+        master.stop()
+        master.supervise()
+        sys.exit(1)
+    if master.stopping:
+        master.supervise()
+        return
+
+    for report in sorted(reports, key=lambda report: report['pid']):
+        print(f"  worker {report['pid']}: ready in {report['startup_seconds']:.2f}s "
+              f"(warm-up {report['warm_up_seconds']:.2f}s)")
+    cold_start = time.perf_counter() - LAUNCHED
+    first_request = probe(args.host, args.port)
+    print(f"Cold start: {cold_start:.2f}s ({args.workers} workers)")
+    print(f"Time to first request: {first_request:.2f}s")
+    print(f"Listening on http://{args.host}:{args.port}")
+
+    # Started after forking: threads do not survive fork()
+    if maintenance_interval():
+        start_background_maintenance(maintenance_interval(), args.database)
+
+    master.supervise()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""
+Columnar snapshot files for Campus Event Management Platform
+Exports colleges, students, events, registrations, attendance and feedback
+into one read-only binary file that analytics readers memory-map instead of
+querying the live database.
+
+File layout (all integers little-endian):
+
+    magic "CESNAP\\0\\0" | format version (uint32) | reserved (uint32)
+    column blocks, each aligned to 64 bytes
+    JSON directory (tables -> columns -> type, offset, length)
+    directory length (uint64) | magic
+
+Fixed-width columns are stored as int8/int32/int64 arrays. String columns
+are dictionary-encoded: an int32 code per row (-1 for NULL) plus the
+distinct values as concatenated UTF-8 with int64 offsets. Timestamps are
+int64 Unix seconds (0 when missing).
+
+Usage:
+    python snapshot.py export [--output PATH]
+    python snapshot.py info PATH
+"""
+
+import argparse
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+from array import array
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DATABASE = 'campus_events.db'
+SNAPSHOTS_DIR = 'snapshots'
+DEFAULT_SNAPSHOT = os.path.join(SNAPSHOTS_DIR, 'campus_events.snap')
+
+MAGIC = b'CESNAP\0\0'
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct('<8sII')
+TRAILER = struct.Struct('<Q8s')
+ALIGNMENT = 64
+FETCH_CHUNK = 50_000
+
+# Column type -> (array typecode, NumPy dtype). array('i') is 4 bytes on
+# every platform CPython supports.
+FIXED_TYPES = {
+    'int8': ('b', '<i1'),
+    'int32': ('i', '<i4'),
+    'int64': ('q', '<i8'),
+}
+
+
+def _timestamp(column):
+    return f"COALESCE(CAST(strftime('%s', {column}) AS INTEGER), 0)"
+
+
+# table -> (query, [(column, type)]). Query columns are in the same order.
+SNAPSHOT_TABLES = {
+    'colleges': ("SELECT id, name, location FROM colleges ORDER BY id", [
+        ('id', 'int32'), ('name', 'string'), ('location', 'string'),
+    ]),
+    'students': ("SELECT id, name, email, college_id FROM students ORDER BY id", [
+        ('id', 'int32'), ('name', 'string'), ('email', 'string'), ('college_id', 'int32'),
+    ]),
+    'events': ("""
+        SELECT id, name, event_type, college_id, event_date, COALESCE(max_capacity, 0)
+        FROM events ORDER BY id
+    """, [
+        ('id', 'int32'), ('name', 'string'), ('event_type', 'string'),
+        ('college_id', 'int32'), ('event_date', 'string'), ('max_capacity', 'int32'),
+    ]),
+    'registrations': (f"""
+        SELECT id, student_id, event_id, {_timestamp('registered_at')}
+        FROM registrations ORDER BY id
+    """, [
+        ('id', 'int32'), ('student_id', 'int32'), ('event_id', 'int32'),
+        ('registered_at', 'int64'),
+    ]),
+    'attendance': (f"""
+        SELECT registration_id, COALESCE(attended, 0), {_timestamp('marked_at')}
+        FROM attendance ORDER BY registration_id
+    """, [
+        ('registration_id', 'int32'), ('attended', 'int8'), ('marked_at', 'int64'),
+    ]),
+    'feedback': (f"""
+        SELECT id, registration_id, rating, comments, {_timestamp('submitted_at')}
+        FROM feedback ORDER BY id
+    """, [
+        ('id', 'int32'), ('registration_id', 'int32'), ('rating', 'int8'),
+        ('comments', 'string'), ('submitted_at', 'int64'),
+    ]),
+}
+
+
+class _StringEncoder:
+    """Builds the dictionary and per-row codes for one string column"""
+
+    def __init__(self):
+        self.codes = array('i')
+        self.lookup = {}
+        self.values = []
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(-1)
+            return
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self.lookup[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def dictionary(self):
+        offsets = array('q', [0])
+        data = bytearray()
+        for value in self.values:
+            data += str(value).encode('utf-8')
+            offsets.append(len(data))
+        return offsets, bytes(data)
+
+
+class _Writer:
+    def __init__(self, f):
+        self.f = f
+        self.f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0))
+
+    def block(self, payload):
+        """Write payload at the next aligned offset, returning (offset, length)"""
+        position = self.f.tell()
+        padding = (-position) % ALIGNMENT
+        self.f.write(b'\0' * padding)
+        offset = position + padding
+        if isinstance(payload, array):
+            if sys.byteorder != 'little':
+                payload = array(payload.typecode, payload)
+                payload.byteswap()
+            payload = payload.tobytes()
+        self.f.write(payload)
+        return offset, len(payload)
+
+
+def export_snapshot(conn, path=DEFAULT_SNAPSHOT):
+    """Write a snapshot of the database to path and return its directory
+
+    All tables are read inside one transaction, so the snapshot is
+    consistent. The file is written under a temporary name and renamed into
+    place, so readers never see a partial snapshot.
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    tables = {}
+
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute("BEGIN")
+    try:
+        with open(temp_path, 'wb') as f:
+            writer = _Writer(f)
+            for table, (query, columns) in SNAPSHOT_TABLES.items():
+                buffers = [
+                    _StringEncoder() if kind == 'string' else array(FIXED_TYPES[kind][0])
+                    for _, kind in columns
+                ]
+                rows = 0
+                cursor.execute(query)
+                while True:
+                    chunk = cursor.fetchmany(FETCH_CHUNK)
+                    if not chunk:
+                        break
+                    rows += len(chunk)
+                    for row in chunk:
+                        for value, buffer in zip(row, buffers):
+                            buffer.append(value if value is not None or isinstance(buffer, _StringEncoder) else 0)
+
+                column_directory = {}
+                for (name, kind), buffer in zip(columns, buffers):
+                    if kind == 'string':
+                        offsets, data = buffer.dictionary()
+                        codes_offset, codes_length = writer.block(buffer.codes)
+                        offsets_offset, offsets_length = writer.block(offsets)
+                        data_offset, data_length = writer.block(data)
+                        column_directory[name] = {
+                            "type": "string",
+                            "offset": codes_offset, "length": codes_length,
+                            "dictionary_size": len(buffer.values),
+                            "offsets_offset": offsets_offset, "offsets_length": offsets_length,
+                            "data_offset": data_offset, "data_length": data_length,
+                        }
+                    else:
+                        offset, length = writer.block(buffer)
+                        column_directory[name] = {"type": kind, "offset": offset, "length": length}
+                tables[table] = {"rows": rows, "columns": column_directory}
+
+            snapshot_directory = {
+                "format_version": FORMAT_VERSION,
+                "created_at": datetime.now().isoformat(),
+                "source": os.path.abspath(DATABASE),
+                "tables": tables,
+            }
+            encoded = json.dumps(snapshot_directory).encode('utf-8')
+            f.write(encoded)
+            f.write(TRAILER.pack(len(encoded), MAGIC))
+            f.flush()
+            os.fsync(f.fileno())
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        conn.rollback()
+
+    os.replace(temp_path, path)
+    return snapshot_directory
+
+
+class StringColumn:
+    """Dictionary-encoded string column backed by the memory map
+
+    codes holds one int32 per row (-1 for NULL). Values are decoded from the
+    mapped dictionary on access; nothing is copied up front.
+    """
+
+    def __init__(self, codes, offsets, data):
+        self.codes = codes
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, row):
+        return self.value(int(self.codes[row]))
+
+    @property
+    def dictionary_size(self):
+        return len(self._offsets) - 1
+
+    def value(self, code):
+        """Decode one dictionary entry (None for code -1)"""
+        if code < 0:
+            return None
+        start, end = int(self._offsets[code]), int(self._offsets[code + 1])
+        return bytes(self._data[start:end]).decode('utf-8')
+
+    def values(self):
+        """Decode the whole dictionary, in code order"""
+        return [self.value(code) for code in range(self.dictionary_size)]
+
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot file
+
+    column() returns NumPy arrays when NumPy is installed and memoryviews
+    otherwise; both point straight into the mapped file.
+    """
+
+    def __init__(self, path=DEFAULT_SNAPSHOT):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic, version, _ = PREAMBLE.unpack_from(self._map, 0)
+        length, trailer_magic = TRAILER.unpack_from(self._map, len(self._map) - TRAILER.size)
+        if magic != MAGIC or trailer_magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a campus events snapshot")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} has snapshot format {version}; "
+                             f"this reader supports {FORMAT_VERSION}")
+
+        start = len(self._map) - TRAILER.size - length
+        self.directory = json.loads(bytes(self._view[start:start + length]).decode('utf-8'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the mapping (views handed out must be dropped first)"""
+        try:
+            self._view.release()
+            self._map.close()
+        except (BufferError, ValueError):
+            # Arrays still reference the map; it is freed when they are
+            pass
+        self._file.close()
+
+    @property
+    def created_at(self):
+        return self.directory['created_at']
+
+    @property
+    def tables(self):
+        return list(self.directory['tables'])
+
+    def row_count(self, table):
+        return self.directory['tables'][table]['rows']
+
+    def _fixed(self, kind, offset, length):
+        typecode, dtype = FIXED_TYPES[kind]
+        if np is not None:
+            return np.frombuffer(self._map, dtype=dtype,
+                                 count=length // np.dtype(dtype).itemsize, offset=offset)
+        if sys.byteorder != 'little':
+            raise RuntimeError("Reading snapshots without NumPy needs a little-endian machine")
+        return self._view[offset:offset + length].cast(typecode)
+
+    def column(self, table, name):
+        """Zero-copy view of a column"""
+        spec = self.directory['tables'][table]['columns'][name]
+        if spec['type'] == 'string':
+            return self.strings(table, name)
+        return self._fixed(spec['type'], spec['offset'], spec['length'])
+
+    def strings(self, table, name):
+        """Dictionary-encoded string column"""
+        spec = self.directory['tables'][table]['columns'][name]
+        return StringColumn(
+            self._fixed('int32', spec['offset'], spec['length']),
+            self._fixed('int64', spec['offsets_offset'], spec['offsets_length']),
+            self._view[spec['data_offset']:spec['data_offset'] + spec['data_length']],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or inspect columnar snapshots")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export_parser = subparsers.add_parser('export', help="snapshot the live database")
+    export_parser.add_argument('--output', default=DEFAULT_SNAPSHOT)
+    info_parser = subparsers.add_parser('info', help="describe a snapshot file")
+    info_parser.add_argument('path', nargs='?', default=DEFAULT_SNAPSHOT)
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        conn = sqlite3.connect(DATABASE)
+        snapshot_directory = export_snapshot(conn, args.output)
+        conn.close()
+        size = os.path.getsize(args.output)
+        print(f"Wrote {args.output} ({size:,} bytes)")
+        for table, spec in snapshot_directory['tables'].items():
+            print(f"  {table}: {spec['rows']:,} rows")
+    else:
+        with Snapshot(args.path) as snapshot:
+            print(f"{args.path}: format {FORMAT_VERSION}, created {snapshot.created_at}")
+            for table in snapshot.tables:
+                columns = snapshot.directory['tables'][table]['columns']
+                described = ', '.join(f"{name} {spec['type']}" for name, spec in columns.items())
+                print(f"  {table}: {snapshot.row_count(table):,} rows ({described})")
+
+
+if __name__ == "__main__":
+    main()
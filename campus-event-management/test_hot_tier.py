@@ -0,0 +1,134 @@
+"""
+Hot tier journal tests for Campus Event Management Platform
+Checks that changes journaled by a server that died before flushing are
+replayed on the next start, and that a batch the database keeps refusing is
+set aside instead of blocking later changes. Uses a throwaway database; no
+server needed.
+
+Usage: python -m unittest test_hot_tier
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from hot_tier import HotTier, MAX_FLUSH_ATTEMPTS, apply_changes, journal_path, recover
+from migrations import apply_migrations
+from timeline import backfill_timeline
+
+SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema.sql')
+
+
+class HotTierJournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.directory.name, 'campus_events.db')
+        conn = sqlite3.connect(self.database)
+        with open(SCHEMA) as f:
+            conn.executescript(f.read())
+        apply_migrations(conn)
+        conn.close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def query(self, sql, params=()):
+        conn = sqlite3.connect(self.database)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def crash(self, tier):
+        """Drop a tier the way a killed process would: nothing flushed"""
+        tier._journal.close()
+        tier._conn.close()
+
+    def test_recover_replays_unflushed_changes(self):
+        tier = HotTier(self.database, [2])
+        first = tier.register(2, 3)
+        second = tier.register(2, 4)
+        tier.mark_attendance(first, True)
+        self.crash(tier)
+        self.assertEqual(self.query("SELECT COUNT(*) FROM registrations WHERE event_id = 2"), [(1,)])
+
+        restarted = HotTier(self.database, [2])
+        self.assertEqual(restarted.recovered, 3)
+        self.assertEqual(restarted.registration_count(2), 3)
+        self.assertEqual(
+            self.query("SELECT id, student_id FROM registrations WHERE id IN (?, ?) ORDER BY id", (first, second)),
+            [(first, 3), (second, 4)])
+        self.assertEqual(self.query("SELECT attended FROM attendance WHERE registration_id = ?", (first,)), [(1,)])
+        # Ids reserved after the restart do not collide with replayed ones
+        self.assertGreater(restarted.register(2, 5), second)
+        restarted.close()
+        self.assertFalse(os.path.exists(journal_path(self.database)))
+
+    def test_recover_skips_torn_last_line(self):
+        path = journal_path(self.database)
+        change = {"op": "register", "id": 500, "student_id": 6, "event_id": 2, "at": "2025-09-19 10:00:00"}
+        with open(path, 'w') as f:
+            f.write(json.dumps(change) + '\n{"op": "reg')
+
+        conn = sqlite3.connect(self.database, isolation_level=None)
+        self.assertEqual(recover(conn, path), 1)
+        conn.close()
+        self.assertEqual(self.query("SELECT student_id FROM registrations WHERE id = 500"), [(6,)])
+        self.assertFalse(os.path.exists(path))
+
+    def test_refused_change_is_set_aside(self):
+        conn = sqlite3.connect(self.database)
+        conn.execute("""
+            CREATE TRIGGER refuse_student_5 BEFORE INSERT ON registrations
+            WHEN new.student_id = 5 BEGIN SELECT RAISE(ABORT, 'refused'); END
+        """)
+        conn.commit()
+        conn.close()
+
+        tier = HotTier(self.database, [2])
+        tier.register(2, 5)
+        accepted = tier.register(2, 6)
+        for _ in range(MAX_FLUSH_ATTEMPTS - 1):
+            with self.assertRaises(sqlite3.IntegrityError):
+                tier.flush()
+        self.assertEqual(tier.flush(), 2)
+        self.assertEqual(tier.stats()["rejected_changes"], 1)
+        self.assertEqual(self.query("SELECT student_id FROM registrations WHERE id = ?", (accepted,)), [(6,)])
+        with open(journal_path(self.database) + '.rejected') as f:
+            rejected = [json.loads(line) for line in f]
+        self.assertEqual([entry["change"]["student_id"] for entry in rejected], [5])
+
+        # Later changes reach the database again
+        later = tier.register(2, 7)
+        self.assertEqual(tier.flush(), 1)
+        self.assertEqual(self.query("SELECT student_id FROM registrations WHERE id = ?", (later,)), [(7,)])
+        tier.close()
+
+    def test_repeated_check_in_keeps_timeline_bucket(self):
+        register = {"op": "register", "id": 500, "student_id": 6, "event_id": 2, "at": "2020-01-06 09:00:00"}
+        conn = sqlite3.connect(self.database, isolation_level=None)
+        # One flush per change, so each mark reaches the database as an upsert
+        for change in [register,
+                       {"op": "attend", "registration_id": 500, "attended": 1, "at": "2020-01-06 10:00:00"},
+                       {"op": "attend", "registration_id": 500, "attended": 1, "at": "2020-01-06 12:00:00"},
+                       {"op": "attend", "registration_id": 500, "attended": 0, "at": "2020-01-06 13:00:00"}]:
+            apply_changes(conn, [change])
+        conn.close()
+
+        self.assertEqual(self.query("""
+            SELECT bucket_start, check_ins FROM event_timeline
+            WHERE event_id = 2 AND granularity = 'hour' AND bucket_start LIKE '2020-01-06%'
+            ORDER BY bucket_start
+        """), [("2020-01-06 09:00:00", 0), ("2020-01-06 10:00:00", 0)])
+        maintained = self.query("SELECT * FROM event_timeline WHERE registrations != 0 OR check_ins != 0")
+        conn = sqlite3.connect(self.database)
+        backfill_timeline(conn)
+        conn.close()
+        self.assertEqual(sorted(maintained), sorted(self.query("SELECT * FROM event_timeline")))
+
+
+if __name__ == '__main__':
+    unittest.main()
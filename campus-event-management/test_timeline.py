@@ -0,0 +1,104 @@
+"""
+Timeline rollup tests for Campus Event Management Platform
+Checks that the rollups the triggers keep up to date match a rebuild from
+the registrations and attendance tables (timeline.py backfill) after
+check-ins are marked, repeated and undone through the API. Uses a
+throwaway database; no server needed.
+
+Usage: python -m unittest test_timeline
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from app import create_app
+from timeline import backfill_timeline
+
+EARLIER = '2020-01-06 10:00:00'
+
+
+class TimelineTriggersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = os.path.join(self.directory.name, 'campus_events.db')
+        self.client = create_app(self.database).test_client()
+        response = self.client.post('/api/events/1/register', json={"student_id": 8})
+        self.assertEqual(response.status_code, 201)
+        self.registration_id = response.get_json()["registration_id"]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def query(self, sql, params=()):
+        conn = sqlite3.connect(self.database)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def mark(self, attended):
+        response = self.client.post(f'/api/registrations/{self.registration_id}/attendance',
+                                    json={"attended": attended})
+        self.assertEqual(response.status_code, 200)
+
+    def rollups(self):
+        return self.query("""
+            SELECT event_id, granularity, bucket_start, registrations, check_ins
+            FROM event_timeline WHERE registrations != 0 OR check_ins != 0
+            ORDER BY 1, 2, 3
+        """)
+
+    def assertMatchesBackfill(self):
+        maintained = self.rollups()
+        conn = sqlite3.connect(self.database)
+        backfill_timeline(conn)
+        conn.close()
+        self.assertEqual(maintained, self.rollups())
+
+    def check_in_earlier(self):
+        """Check in, then date the check-in back to EARLIER, rollups included,
+        so a later mark lands in a different bucket"""
+        self.mark(True)
+        conn = sqlite3.connect(self.database)
+        conn.execute("UPDATE attendance SET marked_at = ? WHERE registration_id = ?",
+                     (EARLIER, self.registration_id))
+        conn.commit()
+        backfill_timeline(conn)
+        conn.close()
+
+    def test_check_in_and_undo(self):
+        self.mark(True)
+        self.assertMatchesBackfill()
+        self.mark(False)
+        self.assertMatchesBackfill()
+
+    def test_repeated_check_in_then_undo(self):
+        self.check_in_earlier()
+        self.mark(True)
+        self.assertEqual(self.query("SELECT marked_at FROM attendance WHERE registration_id = ?",
+                                    (self.registration_id,)), [(EARLIER,)])
+        self.assertMatchesBackfill()
+
+        self.mark(False)
+        # The undo comes off the bucket the check-in was counted in
+        self.assertEqual(self.query("""
+            SELECT check_ins FROM event_timeline
+            WHERE event_id = 1 AND granularity = 'hour' AND bucket_start = ?
+        """, (EARLIER,)), [(0,)])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM event_timeline WHERE check_ins < 0"), [(0,)])
+        self.assertMatchesBackfill()
+
+    def test_limit_must_be_a_positive_integer(self):
+        for limit in ('0', '-1', 'abc', '1.5'):
+            response = self.client.get(f'/api/events/1/timeline?limit={limit}')
+            self.assertEqual(response.status_code, 400, limit)
+        response = self.client.get('/api/events/1/timeline?bucket=minute&limit=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["timeline"]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
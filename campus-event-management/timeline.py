@@ -0,0 +1,126 @@
+"""
+Registration and check-in timeline for Campus Event Management Platform
+Per-event rollups of registrations and check-ins by minute, hour and day.
+Triggers (installed by migrations.py) keep the rollups current as rows
+arrive, so a timeline read costs one row per bucket regardless of how many
+students registered.
+
+Usage: python timeline.py backfill    # rebuild rollups from existing rows
+"""
+
+import argparse
+import sqlite3
+
+DATABASE = 'campus_events.db'
+
+# strftime() formats that truncate a timestamp to the start of its bucket
+GRANULARITIES = {
+    'minute': '%Y-%m-%d %H:%M:00',
+    'hour': '%Y-%m-%d %H:00:00',
+    'day': '%Y-%m-%d',
+}
+DEFAULT_GRANULARITY = 'hour'
+
+
+def _upsert(event_id_sql, timestamp_sql, registrations, check_ins, source=''):
+    """SQL adding (registrations, check_ins) to every granularity's bucket"""
+    statements = []
+    for granularity, fmt in GRANULARITIES.items():
+        statements.append(f"""
+            INSERT INTO event_timeline (event_id, granularity, bucket_start, registrations, check_ins)
+            SELECT {event_id_sql}, '{granularity}', strftime('{fmt}', {timestamp_sql}),
+                   {registrations}, {check_ins}
+            {source}
+            ON CONFLICT (event_id, granularity, bucket_start) DO UPDATE SET
+                registrations = registrations + excluded.registrations,
+                check_ins = check_ins + excluded.check_ins;""")
+    return '\n'.join(statements)
+
+
+def _check_in_source(registration_sql):
+    return f"FROM registrations r WHERE r.id = {registration_sql}"
+
+
+TIMELINE_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS event_timeline (
+        event_id INTEGER NOT NULL,
+        granularity TEXT NOT NULL CHECK (granularity IN ('minute', 'hour', 'day')),
+        bucket_start TEXT NOT NULL,
+        registrations INTEGER NOT NULL DEFAULT 0,
+        check_ins INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (event_id, granularity, bucket_start)
+    ) WITHOUT ROWID;
+
+    CREATE TRIGGER IF NOT EXISTS event_timeline_registration AFTER INSERT ON registrations BEGIN
+        {_upsert('new.event_id', 'new.registered_at', 1, 0, 'WHERE true')}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_timeline_check_in AFTER INSERT ON attendance
+    WHEN new.attended = 1 BEGIN
+        {_upsert('r.event_id', 'new.marked_at', 0, 1, _check_in_source('new.registration_id'))}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_timeline_check_in_update AFTER UPDATE OF attended ON attendance
+    WHEN new.attended = 1 AND old.attended IS NOT 1 BEGIN
+        {_upsert('r.event_id', 'new.marked_at', 0, 1, _check_in_source('new.registration_id'))}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS event_timeline_check_in_undo AFTER UPDATE OF attended ON attendance
+    WHEN old.attended = 1 AND new.attended IS NOT 1 BEGIN
+        {_upsert('r.event_id', 'old.marked_at', 0, -1, _check_in_source('old.registration_id'))}
+    END;
+"""
+
+BACKFILL_SQL = '\n'.join([
+    "DELETE FROM event_timeline;",
+    _upsert('event_id', 'registered_at', 'COUNT(*)', 0,
+            "FROM registrations WHERE true GROUP BY 1, 2, 3"),
+    _upsert('r.event_id', 'a.marked_at', 0, 'COUNT(*)',
+            "FROM attendance a JOIN registrations r ON r.id = a.registration_id "
+            "WHERE a.attended = 1 GROUP BY 1, 2, 3"),
+])
+
+
+def backfill_timeline(conn):
+    """Rebuild every rollup from the registrations and attendance tables"""
+    conn.executescript(f"BEGIN;\n{BACKFILL_SQL}\nCOMMIT;")
+
+
+def event_timeline(conn, event_id, granularity=DEFAULT_GRANULARITY, limit=None):
+    """Return buckets for one event, oldest first, with running totals
+
+    When limit is given only the most recent limit buckets are returned; the
+    running totals still count everything before them.
+    """
+    if limit is not None and limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}")
+    query = """
+        SELECT bucket_start, registrations, check_ins,
+               SUM(registrations) OVER (ORDER BY bucket_start) as total_registrations,
+               SUM(check_ins) OVER (ORDER BY bucket_start) as total_check_ins
+        FROM event_timeline
+        WHERE event_id = ? AND granularity = ?
+        ORDER BY bucket_start
+    """
+    params = [event_id, granularity]
+
+    if limit is not None:
+        query = f"SELECT * FROM ({query}) ORDER BY bucket_start DESC LIMIT ?"
+        params.append(limit)
+        rows = conn.execute(query, params).fetchall()[::-1]
+    else:
+        rows = conn.execute(query, params).fetchall()
+
+    return [dict(row) for row in rows]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain event timeline rollups")
+    parser.add_argument('command', choices=['backfill'])
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DATABASE)
+    backfill_timeline(conn)
+    buckets = conn.execute("SELECT COUNT(*) FROM event_timeline").fetchone()[0]
+    conn.close()
+    print(f"Rebuilt event timeline: {buckets} buckets")